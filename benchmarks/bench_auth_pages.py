@@ -0,0 +1,102 @@
+"""
+Cost of the session and user lookup on a @login_required page.
+
+Logs a user in through the test client in a throwaway test database (a
+temporary file for SQLite) and requests --page --requests times, first with
+database sessions and Django's AuthenticationMiddleware, then with
+myapp.auth_cache on its own and in front of a shared cache, reporting
+requests per second and SQL queries per request.
+The template is rendered either way, so the difference is the auth path.
+
+Usage:
+    python benchmarks/bench_auth_pages.py [--requests 2000] [--page /crops/]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from myapp import auth_cache  # noqa: E402
+
+
+STOCK = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'MIDDLEWARE': [
+        'django.contrib.auth.middleware.AuthenticationMiddleware' if name == 'myapp.auth_cache.CachedAuthenticationMiddleware' else name
+        for name in settings.MIDDLEWARE
+    ],
+}
+# Without REDIS_URL: per-process copies only.
+AUTH_CACHE = {'SHARED_CACHE': False, 'AUTH_CACHE_LOCAL_TTL': 5}
+# With REDIS_URL; a single process is fine with LocMem.
+AUTH_CACHE_SHARED = {'SHARED_CACHE': True, 'AUTH_CACHE_LOCAL_TTL': 300}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(page, requests):
+    client = Client()
+    client.login(username='bench', password='bench-password')
+    client.get(page)
+    statements = StatementCounter()
+    with connection.execute_wrapper(statements):
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = client.get(page)
+            assert response.status_code == 200, response.status_code
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, statements.count / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--page', default='/crops/')
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        User.objects.create_user('bench', password='bench-password')
+        print(f'{args.requests} requests of {args.page}, {connection.vendor}, cache {settings.CACHES["default"]["BACKEND"]}')
+        with override_settings(**STOCK):
+            rate, queries = measure(args.page, args.requests)
+        print(f'  db sessions + AuthenticationMiddleware: {rate:7.0f} requests/s  {queries:.1f} queries/request')
+        for label, overrides in (('myapp.auth_cache', AUTH_CACHE), ('myapp.auth_cache, shared cache', AUTH_CACHE_SHARED)):
+            cache.clear()
+            auth_cache.clear()
+            with override_settings(**overrides):
+                rate, queries = measure(args.page, args.requests)
+            print(f'  {label + ":":40} {rate:7.0f} requests/s  {queries:.1f} queries/request')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
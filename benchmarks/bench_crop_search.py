@@ -0,0 +1,59 @@
+"""
+Server-side latency of the crop search index.
+
+Runs a fixed query mix against the real catalog and against a synthetic
+catalog scaled up to --crops entries (the real crops copied under new slugs),
+so the per-query cost can be checked as the catalog grows.
+
+Usage:
+    python benchmarks/bench_crop_search.py [--crops N] [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from myapp.crop_catalog import CATALOG, build_entry  # noqa: E402
+from myapp.crop_search import CropSearchIndex  # noqa: E402
+
+QUERIES = ['wheat', 'aphids wheat', 'stem borer', 'tomto blight', 'punjab rice', 'neem oil spray', 'ptato']
+
+
+def scaled_catalog(size):
+    crops = list(CATALOG.values())
+    scaled = {}
+    for i in range(size):
+        entry = crops[i % len(crops)]
+        slug = f'{entry.slug}-{i}'
+        scaled[slug] = build_entry(slug, dict(entry.details))
+    return MappingProxyType(scaled)
+
+
+def report(label, index, iterations):
+    print(f'{label} ({len(index.entries)} crops, {len(index.postings)} tokens)')
+    for query in QUERIES:
+        best = min(timeit.repeat(lambda: index.search(query), number=iterations, repeat=5))
+        print(f'  {query!r:20} {best / iterations * 1e6:8.1f} us/query')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--crops', type=int, default=500)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    report('catalog', CropSearchIndex(CATALOG), args.iterations)
+    report('synthetic', CropSearchIndex(scaled_catalog(args.crops)), args.iterations)
+
+
+if __name__ == '__main__':
+    main()
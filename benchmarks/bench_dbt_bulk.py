@@ -0,0 +1,126 @@
+"""
+Bulk DBT check throughput and memory by upload size.
+
+Loads --registry linked numbers into a throwaway test database (a temporary
+file for SQLite) with the matching Bloom filter, writes uploads of each of
+--rows sizes (a --linked fraction of them registered) to temporary files,
+and streams each through dbt_bulk as /api/check-dbt/bulk/ does, recording
+rows per second, queries run and peak traced memory. The same upload is
+also resolved one registry.lookup per row, as the single-check form does,
+for comparison.
+
+Usage:
+    python benchmarks/bench_dbt_bulk.py [--rows 10000,100000] [--registry 50000] [--linked 0.3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from myapp import dbt, dbt_bulk, streaming  # noqa: E402
+from myapp.models import DBTLinkage  # noqa: E402
+
+
+def aadhaar_number(n):
+    digits = f'{2 + n % 8}{n:010d}'
+    return digits + dbt.check_digit(digits)
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def write_upload(path, rows, registry_size, linked_fraction, rng):
+    with open(path, 'w', newline='') as upload:
+        upload.write('aadhaar,account\n')
+        for _ in range(rows):
+            if rng.random() < linked_fraction:
+                number = aadhaar_number(rng.randrange(registry_size))
+            else:
+                number = aadhaar_number(10**9 + rng.randrange(10**9))
+            upload.write(f'{number},1111{rng.randrange(10**8):08d}\n')
+
+
+def run(label, rows, work):
+    statements = StatementCounter()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with connection.execute_wrapper(statements):
+        work()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{rows:>8} rows, {label:<9} {rows / elapsed:9.0f} rows/s  {statements.count:7} queries  peak {peak / 1024 / 1024:6.2f} MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', default='10000,100000')
+    parser.add_argument('--registry', type=int, default=50000)
+    parser.add_argument('--linked', type=float, default=0.3)
+    args = parser.parse_args()
+
+    # DEBUG off: its query log would hold on to SQL text and skew the memory figures.
+    setup_test_environment(debug=False)
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rng = random.Random(42)
+        digests = [dbt.aadhaar_digest(aadhaar_number(n)) for n in range(args.registry)]
+        now = timezone.now()
+        DBTLinkage.objects.bulk_create(
+            (DBTLinkage(aadhaar_hash=digest.hex(), bank_name='Canara Bank', account_suffix='1234', updated_at=now) for digest in digests),
+            batch_size=5000,
+        )
+        bloom_path = os.path.join(tempfile.mkdtemp(), 'linkage.bloom')
+        bloom = dbt.BloomFilter.with_capacity(len(digests), settings.DBT_BLOOM_ERROR_RATE, dbt.key_id())
+        bloom.add_many(digests)
+        bloom.save(bloom_path)
+        dbt.registry = dbt.LinkageRegistry(bloom_path)
+        print(f'{args.registry} registry entries, {args.linked:.0%} of uploaded rows linked, {connection.vendor}')
+
+        for rows in [int(rows) for rows in args.rows.split(',')]:
+            path = os.path.join(tempfile.mkdtemp(), 'upload.csv')
+            write_upload(path, rows, args.registry, args.linked, rng)
+
+            def bulk():
+                with open(path, 'rb') as upload:
+                    for _ in streaming.batched(dbt_bulk.encode_csv(dbt_bulk.read_pairs(upload))):
+                        pass
+
+            def one_by_one():
+                with open(path, 'rb') as upload:
+                    for _, aadhaar, _ in dbt_bulk.read_pairs(upload):
+                        dbt.registry.lookup(dbt.clean_aadhaar(aadhaar))
+
+            run('bulk', rows, bulk)
+            run('per row', rows, one_by_one)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+DBT linkage lookup latency as the registry grows.
+
+Grows the DBTLinkage table of a throwaway test database (a temporary file
+for SQLite) to each of --sizes entries of synthetic hashes, plus 1000 real
+linked numbers, builds the Bloom filter the importer would, and times
+dbt.registry lookups of linked and unlinked numbers with and without the
+filter. Then times filter probes alone at --filter-sizes entries, beyond
+what is quick to load into a test database.
+
+Usage:
+    python benchmarks/bench_dbt_lookup.py [--sizes 10000,100000,1000000] [--filter-sizes 10000000] [--lookups 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from myapp import dbt  # noqa: E402
+from myapp.models import DBTLinkage  # noqa: E402
+
+
+LINKED = 1000
+
+
+def aadhaar_number(n):
+    digits = f'{2 + n % 8}{n:010d}'
+    return digits + dbt.check_digit(digits)
+
+
+def grow(rng, digests, size):
+    now = timezone.now()
+    while len(digests) < size:
+        batch = [rng.randbytes(32) for _ in range(min(10000, size - len(digests)))]
+        DBTLinkage.objects.bulk_create(
+            DBTLinkage(aadhaar_hash=digest.hex(), bank_name='Synthetic Bank', account_suffix='0000', updated_at=now)
+            for digest in batch
+        )
+        digests.extend(batch)
+
+
+def timed(registry, numbers):
+    latencies = []
+    for number in numbers:
+        started = time.perf_counter()
+        registry.lookup(number)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return f'p50 {statistics.median(latencies) * 1e6:7.1f} us  p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--filter-sizes', default='10000000')
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rng = random.Random(42)
+        linked = [aadhaar_number(n) for n in range(LINKED)]
+        digests = [dbt.aadhaar_digest(number) for number in linked]
+        DBTLinkage.objects.bulk_create(
+            DBTLinkage(aadhaar_hash=digest.hex(), bank_name='Canara Bank', account_suffix='1234', updated_at=timezone.now())
+            for digest in digests
+        )
+        unlinked = [aadhaar_number(n) for n in range(10**9, 10**9 + args.lookups)]
+        bloom_path = os.path.join(tempfile.mkdtemp(), 'linkage.bloom')
+        print(f'{args.lookups} lookups per row, {connection.vendor}, filter error rate {settings.DBT_BLOOM_ERROR_RATE}')
+
+        for size in [int(size) for size in args.sizes.split(',')]:
+            grow(rng, digests, size)
+            bloom = dbt.BloomFilter.with_capacity(len(digests), settings.DBT_BLOOM_ERROR_RATE, dbt.key_id())
+            for start in range(0, len(digests), 100000):
+                bloom.add_many(digests[start:start + 100000])
+            bloom.save(bloom_path)
+            filtered = dbt.LinkageRegistry(bloom_path)
+            unfiltered = dbt.LinkageRegistry(None)
+            print(f'{len(digests):>10} entries')
+            print(f'    unlinked, filter     {timed(filtered, unlinked)}')
+            print(f'    unlinked, no filter  {timed(unfiltered, unlinked)}')
+            print(f'    linked, filter       {timed(filtered, linked[:args.lookups])}')
+            print(f'    answered by filter   {filtered.stats()["filtered"] / len(unlinked):.1%} of unlinked')
+
+        for size in [int(size) for size in args.filter_sizes.split(',') if size]:
+            bloom = dbt.BloomFilter.with_capacity(size, settings.DBT_BLOOM_ERROR_RATE, dbt.key_id())
+            remaining = size
+            while remaining:
+                count = min(remaining, 1000000)
+                chunk = rng.randbytes(32 * count)
+                bloom.add_many([chunk[i:i + 32] for i in range(0, len(chunk), 32)])
+                remaining -= count
+            bloom.save(bloom_path)
+            mapped = dbt.BloomFilter.open(bloom_path)
+            probes = [rng.randbytes(32) for _ in range(args.lookups)]
+            started = time.perf_counter()
+            hits = sum(probe in mapped for probe in probes)
+            elapsed = time.perf_counter() - started
+            print(
+                f'{size:>10} entries, filter only: {elapsed / len(probes) * 1e6:.1f} us per probe, '
+                f'{hits / len(probes):.2%} false positives, {bloom.bits // 8 / 1024 / 1024:.0f} MB'
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Memory cost of idle market price stream subscribers.
+
+Starts the ASGI app under uvicorn in a child process, opens --subscribers
+SSE connections to /api/market-prices/stream/, waits until each has received
+its initial snapshot, and reports the server's resident memory growth per
+open connection (read from /proc, so Linux only).
+
+Usage:
+    python benchmarks/bench_price_stream.py [--subscribers N]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REQUEST = b'GET /api/market-prices/stream/ HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n'
+
+
+def rss_kib(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    raise RuntimeError('VmRSS not found')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'myproject.asgi:application', '--port', str(port),
+         '--log-level', 'warning', '--backlog', '4096'],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('uvicorn did not start')
+
+
+async def subscribe(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(REQUEST)
+    await writer.drain()
+    buffer = b''
+    while b'event: snapshot' not in buffer:
+        chunk = await reader.read(65536)
+        if not chunk:
+            raise RuntimeError('stream closed before the snapshot arrived')
+        buffer += chunk
+    return writer
+
+
+async def open_subscribers(port, count, concurrency=200):
+    writers = []
+    for start in range(0, count, concurrency):
+        batch = min(concurrency, count - start)
+        writers += await asyncio.gather(*(subscribe(port) for _ in range(batch)))
+    return writers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=3000)
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port)
+    try:
+        # One subscriber first so the broadcaster, poller and DB connection exist in the baseline.
+        loop = asyncio.new_event_loop()
+        warmup = loop.run_until_complete(open_subscribers(port, 1))
+        time.sleep(0.5)
+        baseline = rss_kib(server.pid)
+
+        started = time.monotonic()
+        writers = loop.run_until_complete(open_subscribers(port, args.subscribers))
+        elapsed = time.monotonic() - started
+        time.sleep(1)
+        loaded = rss_kib(server.pid)
+
+        print(f'subscribers:    {len(writers)} (connected in {elapsed:.1f}s)')
+        print(f'server RSS:     {baseline / 1024:.1f} MiB -> {loaded / 1024:.1f} MiB')
+        print(f'per connection: {(loaded - baseline) / len(writers):.1f} KiB')
+
+        for writer in writers + warmup:
+            writer.close()
+        loop.run_until_complete(asyncio.sleep(0.5))
+        loop.close()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
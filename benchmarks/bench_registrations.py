@@ -0,0 +1,127 @@
+"""
+Registration throughput: one INSERT per request against the write-behind buffer.
+
+Feeds --count registrations (a --repeat fraction of them from phones that
+already registered) through each strategy in a throwaway test database (a
+temporary file for SQLite, so every commit reaches the disk as it would in
+production) and reports registrations per second, per-request latency and the
+number of SQL statements run:
+
+- insert: what a view writing each registration straight away costs, an
+  upsert and commit per request;
+- buffer: registrations.RegistrationBuffer as the view uses it, spool fsync
+  on and off, flushed at --batch-size. The flush runs inline here, inside
+  the request that fills the batch, where the view's buffer would leave it to
+  its background thread; that request sets the p99.
+
+Usage:
+    python benchmarks/bench_registrations.py [--count N] [--repeat 0.1] [--batch-size 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from myapp import registrations  # noqa: E402
+from myapp.models import FarmerRegistration  # noqa: E402
+
+
+def sample(count, repeat):
+    rng = random.Random(42)
+    phones = []
+    for n in range(count):
+        if phones and rng.random() < repeat:
+            phones.append(rng.choice(phones))
+        else:
+            phones.append(f'9{n:09d}')
+    return [(phone, f'farmer{n}@example.com') for n, phone in enumerate(phones)]
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def one_insert_per_request(sample):
+    latencies = []
+    for phone, email in sample:
+        started = time.perf_counter()
+        registrations.write({phone: (email, timezone.now())})
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def buffered(sample, batch_size, fsync):
+    buffer = registrations.RegistrationBuffer(tempfile.mkdtemp(), batch_size, flush_interval=None, fsync=fsync).start()
+    latencies = []
+    for phone, email in sample:
+        started = time.perf_counter()
+        buffer.add(phone, email)
+        latencies.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    buffer.stop()
+    latencies[-1] += time.perf_counter() - started
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--repeat', type=float, default=0.1)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        registrations_sample = sample(args.count, args.repeat)
+        distinct = len({phone for phone, _ in registrations_sample})
+        print(f'{args.count} registrations ({distinct} distinct phones), {connection.vendor}')
+        runs = [
+            ('insert', one_insert_per_request, ()),
+            ('buffer, fsync', buffered, (args.batch_size, True)),
+            ('buffer, no fsync', buffered, (args.batch_size, False)),
+        ]
+        for name, strategy, extra in runs:
+            FarmerRegistration.objects.all().delete()
+            statements = StatementCounter()
+            with connection.execute_wrapper(statements):
+                started = time.perf_counter()
+                latencies = strategy(registrations_sample, *extra)
+                elapsed = time.perf_counter() - started
+            assert FarmerRegistration.objects.count() == distinct
+            latencies.sort()
+            print(
+                f'{name:>17}: {args.count / elapsed:9.0f} registrations/s  '
+                f'p50 {statistics.median(latencies) * 1e3:6.3f} ms  '
+                f'p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.3f} ms  '
+                f'{statements.count} statements'
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
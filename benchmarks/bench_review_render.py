@@ -0,0 +1,103 @@
+"""
+Render cost of the feedback dashboard with 10k reviews, with and without the
+versioned review caches.
+
+Runs against a throwaway test database (created and destroyed by the script),
+so it never touches real reviews. Timings are per call, best of --repeat:
+
+    all cards    every review rendered in one response, as the list was
+                 before it was paged (select_related, no cache)
+    page, cold   a later page of the feed with every card rendered
+    page, warm   the same page with every card fetched from the cache
+    first page   the whole first page of the feed served from the cache
+    view         GET /reviews/all/ end to end with the first page cached
+
+Usage:
+    python benchmarks/bench_review_render.py [--reviews N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.template import engines  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from myapp import reviews  # noqa: E402
+from myapp.models import Review  # noqa: E402
+
+
+ALL_CARDS = engines['django'].from_string(
+    "{% for review in reviews %}{% include 'myapp/includes/_review_card.html' %}{% endfor %}"
+)
+
+
+def populate(count):
+    users = User.objects.bulk_create([User(username=f'farmer{i:06d}') for i in range(count)], batch_size=2000)
+    Review.objects.bulk_create([
+        Review(user=user, rating=i % 5 + 1, review_text=f'Feedback number {i} about the crop advisory.' * 3)
+        for i, user in enumerate(users)
+    ], batch_size=2000)
+    reviews.rebuild_stats()
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--reviews', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.reviews)
+        page, cursor = reviews.review_page()
+        client = Client()
+
+        def all_cards():
+            ALL_CARDS.render({'reviews': Review.objects.select_related('user').order_by('-submission_date', '-id')})
+
+        def page_cold():
+            cache.clear()
+            reviews.render_feed(cursor)
+
+        reviews.render_feed(cursor)
+        results = [
+            ('all cards', best_of(max(1, args.repeat // 2), all_cards)),
+            ('page, cold', best_of(args.repeat, page_cold)),
+            ('page, warm', best_of(args.repeat, lambda: reviews.render_feed(cursor))),
+        ]
+        reviews.render_feed()
+        results.append(('first page', best_of(args.repeat, reviews.render_feed)))
+        results.append(('view', best_of(args.repeat, lambda: client.get('/reviews/all/'))))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f'{args.reviews} reviews, {len(page)} per page')
+    for label, seconds in results:
+        print(f'{label:12} {seconds * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
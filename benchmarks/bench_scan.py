@@ -0,0 +1,82 @@
+"""
+Throughput of the plant disease scanner on one core: synthetic leaf photos
+(JPEG, --width x --height) pushed through each stage of scanner.diagnose.
+
+    decode       Pillow decode with JPEG draft mode + downscale to SCAN_IMAGE_SIZE
+    fingerprint  dHash for the result cache (a repeat upload stops here)
+    features     vectorized colour, histogram and texture features
+    classify     the configured engine's predict()
+    total        all four, for an upload the result cache has not seen
+
+Usage:
+    python benchmarks/bench_scan.py [--images N] [--width W] [--height H]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from myapp import scanner  # noqa: E402
+
+
+def synthetic_leaf(rng, width, height):
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[:] = (60, 140, 50)
+    pixels = (pixels + rng.integers(-15, 15, pixels.shape)).clip(0, 255).astype(np.uint8)
+    rows, cols = np.ogrid[:height, :width]
+    for _ in range(20):
+        y, x, r = rng.integers(0, height), rng.integers(0, width), rng.integers(10, min(width, height) // 20)
+        pixels[(rows - y) ** 2 + (cols - x) ** 2 < r * r] = (120, 75, 30)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--images', type=int, default=50)
+    parser.add_argument('--width', type=int, default=3000)
+    parser.add_argument('--height', type=int, default=4000)
+    args = parser.parse_args()
+
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    rng = np.random.default_rng(0)
+    photos = [synthetic_leaf(rng, args.width, args.height) for _ in range(min(args.images, 5))]
+    engine = scanner.get_engine()
+
+    timings = {'decode': 0.0, 'fingerprint': 0.0, 'features': 0.0, 'classify': 0.0}
+    for i in range(args.images):
+        started = time.perf_counter()
+        pixels = scanner.load_image(io.BytesIO(photos[i % len(photos)]))
+        decoded = time.perf_counter()
+        scanner.fingerprint(pixels)
+        hashed = time.perf_counter()
+        features = scanner.extract_features(pixels)
+        extracted = time.perf_counter()
+        engine.predict(features)
+        timings['decode'] += decoded - started
+        timings['fingerprint'] += hashed - decoded
+        timings['features'] += extracted - hashed
+        timings['classify'] += time.perf_counter() - extracted
+    timings['total'] = sum(timings.values())
+
+    print(f'{args.images} images of {args.width}x{args.height} ({len(photos[0]) // 1024} KB JPEG), one core')
+    for label, seconds in timings.items():
+        print(f'{label:12} {seconds / args.images * 1000:8.2f} ms/image {args.images / seconds:9.1f} images/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Throughput of the scan job queue by number of worker processes.
+
+Queues --jobs distinct synthetic leaf photos in a throwaway test database
+(a temporary file for SQLite, so forked workers share it), then for each
+worker count forks that many scan_jobs.work() loops, as run_scan_workers
+does, and times how long they take to finish the queue. The result cache is
+emptied between runs so every job runs the model.
+
+Usage:
+    python benchmarks/bench_scan_jobs.py [--jobs N] [--workers 1,2,4] [--width W] [--height H]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import numpy as np  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from myapp import scan_jobs, scanner  # noqa: E402
+from myapp.models import ScanJob, ScanResult  # noqa: E402
+
+from bench_scan import synthetic_leaf  # noqa: E402
+
+
+def worker(name, stop):
+    scan_jobs.work(name, stop)
+
+
+def drain(workers):
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    stop = context.Event()
+    processes = [context.Process(target=worker, args=(f'bench-{i}', stop)) for i in range(workers)]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    while ScanJob.objects.filter(status__in=[ScanJob.QUEUED, ScanJob.RUNNING]).exists():
+        time.sleep(0.02)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for process in processes:
+        process.join()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=40)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--width', type=int, default=1600)
+    parser.add_argument('--height', type=int, default=1200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        photos = [synthetic_leaf(np.random.default_rng(seed), args.width, args.height) for seed in range(args.jobs)]
+        scanner.get_engine()
+        print(f'{args.jobs} jobs of {args.width}x{args.height}, {os.cpu_count()} CPU(s), {connection.vendor}')
+        for workers in [int(count) for count in args.workers.split(',')]:
+            ScanJob.objects.all().delete()
+            ScanResult.objects.all().delete()
+            ScanJob.objects.bulk_create([ScanJob(image=photo) for photo in photos])
+            elapsed = drain(workers)
+            done = ScanJob.objects.filter(status=ScanJob.DONE).count()
+            print(f'{workers} worker(s): {args.jobs / elapsed:6.1f} jobs/s ({done} done in {elapsed:.2f} s)')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Static content pages rendered per request against served from page_cache.
+
+Logs a user in through the test client in a throwaway test database (a
+temporary file for SQLite) and requests each of --pages --requests times,
+first with the views rendering their templates as before (render_page
+swapped for django.shortcuts.render) and then from myapp.page_cache
+skeletons, reporting requests per second and the time spent in the view.
+
+Usage:
+    python benchmarks/bench_static_pages.py [--requests 1000] [--pages crops,dbt,connect_companies]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.shortcuts import render  # noqa: E402
+from django.test import Client, RequestFactory  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from myapp import page_cache  # noqa: E402
+
+
+# URL name -> template of the pages it makes sense to compare.
+PAGES = {
+    'crops': 'myapp/pages/crops_page.html',
+    'market': 'myapp/pages/market_page.html',
+    'dbt': 'myapp/pages/dbt_page.html',
+    'connect_companies': 'myapp/pages/ctoc_page.html',
+    'organic_pest': 'myapp/pages/organic_pest_page.html',
+}
+
+
+def measure(client, page, requests):
+    client.get(page)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(page)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - started)
+
+
+def view_time(request, template_name, requests, respond):
+    respond(request, template_name)
+    started = time.perf_counter()
+    for _ in range(requests):
+        respond(request, template_name)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--pages', default='crops,dbt,connect_companies')
+    args = parser.parse_args()
+
+    setup_test_environment(debug=False)
+    database = connection.settings_dict
+    if database['ENGINE'].endswith('sqlite3'):
+        database.setdefault('TEST', {})['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        User.objects.create_user('bench', password='bench-password')
+        client = Client()
+        client.login(username='bench', password='bench-password')
+        print(f'{args.requests} requests per page, {connection.vendor}')
+        for name in args.pages.split(','):
+            page, template_name = reverse(name), PAGES[name]
+            request = client.get(page).wsgi_request
+            factory_request = RequestFactory().get(page)
+            factory_request.user, factory_request.session = request.user, request.session
+            with mock.patch.object(page_cache, 'render_page', render):
+                rendered = measure(client, page, args.requests)
+            rendered_view = view_time(factory_request, template_name, args.requests, render)
+            cached = measure(client, page, args.requests)
+            cached_view = view_time(factory_request, template_name, args.requests, page_cache.render_page)
+            print(f'  {page:<20} rendered {rendered:6.0f} requests/s ({rendered_view:6.0f} us in the view)'
+                  f'  page_cache {cached:6.0f} requests/s ({cached_view:5.0f} us in the view)')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,49 @@
 from django.contrib import admin
-from .models import Review
+from . import review_export, review_search
+from .admin_changelist import EstimatedCountPaginator, ReviewChangeList
+from .models import Commodity, Mandi, Review
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     # Correctly uses 'submission_date'
     list_display = ('user', 'rating', 'review_text', 'submission_date') 
     list_filter = ('rating', 'submission_date') 
-    search_fields = ['user__username', 'review_text']
\ No newline at end of file
+    search_fields = ['user__username', 'review_text']
+
+    # Large-table mode: one joined query per page, no full COUNT(*), keyset pages
+    # and an indexed date drill-down (see myapp.admin_changelist)
+    list_select_related = ('user',)
+    date_hierarchy = 'submission_date'
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    actions = ['export_csv', 'export_ndjson']
+
+    def get_changelist(self, request, **kwargs):
+        return ReviewChangeList
+
+    @admin.action(description='Export selected reviews as CSV')
+    def export_csv(self, request, queryset):
+        return review_export.export_response(queryset, 'csv')
+
+    @admin.action(description='Export selected reviews as NDJSON')
+    def export_ndjson(self, request, queryset):
+        return review_export.export_response(queryset, 'ndjson')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Username prefix or full-text match on review_text, instead of LIKE '%term%' scans
+        return review_search.filter_reviews(queryset, search_term), False
+
+@admin.register(Commodity)
+class CommodityAdmin(admin.ModelAdmin):
+    # Ingested commodities start in 'other'; pick the market page section here
+    list_display = ('name', 'category', 'unit')
+    list_editable = ('category', 'unit')
+    list_filter = ('category',)
+    search_fields = ['name']
+
+@admin.register(Mandi)
+class MandiAdmin(admin.ModelAdmin):
+    list_display = ('name', 'district', 'state')
+    list_filter = ('state',)
+    search_fields = ['name', 'district']
@@ -0,0 +1,157 @@
+"""
+Admin changelist pieces for tables too large to count or scan per request.
+
+- EstimatedCountPaginator reports the database's own row estimate for an
+  unfiltered table (information_schema on MySQL) and counts filtered results
+  only up to a cap, instead of running COUNT(*) on every page view.
+- ReviewChangeList pages the default newest-first listing with the same
+  (submission_date, id) keyset cursor as the public feedback list, so the
+  thousandth page costs what the first one does. Sorting by another column
+  falls back to the stock numbered pages.
+- DateProbe feeds the date hierarchy from indexed range probes instead of
+  the SELECT DISTINCT over every row that Django's drill-down runs.
+"""
+
+import datetime
+from functools import cached_property
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from . import reviews
+
+
+# Below this many rows an exact COUNT(*) is cheap and an estimate would look wrong.
+EXACT_COUNT_LIMIT = 10000
+
+CURSOR_VAR = 'after'
+
+KEYSET_ORDERING = ('-submission_date', '-pk')
+
+
+def estimated_row_count(model):
+    """The database's row estimate for the model's table, or None if it keeps none we can read."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [table],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    estimated = False
+    capped = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                self.estimated = True
+                return estimate
+        # COUNT over a LIMITed subquery stops reading once it reaches the cap.
+        count = queryset[:EXACT_COUNT_LIMIT + 1].count()
+        if count > EXACT_COUNT_LIMIT:
+            self.capped = True
+            return EXACT_COUNT_LIMIT
+        return count
+
+
+class ReviewChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.keyset = False
+        self.next_cursor = None
+        super().__init__(request, *args, **kwargs)
+        # Filter, search and sort links start again from the newest review.
+        self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+        self.first_page_url = self.get_query_string()
+        self.next_page_url = self.get_query_string({CURSOR_VAR: self.next_cursor}) if self.next_cursor else None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        if self.show_all or tuple(self.queryset.query.order_by) != KEYSET_ORDERING:
+            return super().get_results(request)
+        queryset = self.queryset
+        if self.cursor:
+            try:
+                queryset = reviews.after_cursor(queryset, self.cursor)
+            except reviews.InvalidCursor:
+                queryset = self.queryset
+        self.keyset = True
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        # One extra row tells us whether another page follows, as in reviews.review_page.
+        page = list(queryset[:self.list_per_page + 1])
+        if len(page) > self.list_per_page:
+            page = page[:self.list_per_page]
+            self.next_cursor = reviews.encode_cursor(page[-1])
+        self.result_list = page
+        self.result_count = self.paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = bool(self.cursor or self.next_cursor)
+
+
+class DateProbe:
+    """
+    Stands in for the changelist queryset in the date hierarchy tag. Which
+    years, months or days have rows is found with one EXISTS range probe per
+    candidate period (an index seek each) between the first and last dates.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def aggregate(self, *args, **kwargs):
+        return self.queryset.aggregate(*args, **kwargs)
+
+    def datetimes(self, field_name, kind):
+        bounds = self.queryset.aggregate(first=Min(field_name), last=Max(field_name))
+        if bounds['first'] is None:
+            return []
+        first, last = timezone.localtime(bounds['first']).date(), timezone.localtime(bounds['last']).date()
+        found = []
+        for start, end in periods(first, last, kind):
+            start = timezone.make_aware(datetime.datetime.combine(start, datetime.time()))
+            end = timezone.make_aware(datetime.datetime.combine(end, datetime.time()))
+            if self.queryset.filter(**{f'{field_name}__gte': start, f'{field_name}__lt': end}).exists():
+                found.append(start)
+        return found
+
+
+def periods(first, last, kind):
+    """(start, end) dates of each year, month or day from ``first`` to ``last``."""
+    if kind == 'year':
+        start = first.replace(month=1, day=1)
+    elif kind == 'month':
+        start = first.replace(day=1)
+    else:
+        start = first
+    while start <= last:
+        if kind == 'year':
+            end = start.replace(year=start.year + 1)
+        elif kind == 'month':
+            end = (start + datetime.timedelta(days=32)).replace(day=1)
+        else:
+            end = start + datetime.timedelta(days=1)
+        yield start, end
+        start = end
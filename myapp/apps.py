@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        # Registers the signal handlers: Review (stats, render cache, search fallback index)
+        # and User (auth cache versions, also needed when changepassword runs).
+        from . import auth_cache, review_search, reviews  # noqa: F401
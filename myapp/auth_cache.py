@@ -0,0 +1,287 @@
+"""
+Session and user resolution without SQL on every @login_required page.
+
+With database sessions and the stock AuthenticationMiddleware, every page
+view read its django_session row and then its auth_user row. Both now come
+from two tiers of cache:
+
+- an in-process LRU of decoded sessions and users, ``AUTH_CACHE_SIZE``
+  entries each;
+- the default cache, shared by every process. Sessions use Django's
+  cached_db layout (the database stays the source of truth), and users are
+  stored under ``auth:user:<id>:<version>``.
+
+An in-process entry is only used while the version it was loaded under is
+still the current one. Versions live in the shared cache, one per session and
+one per user, and a request reads the pair in a single ``get_many``. Saving
+or deleting a session (login, logout, key rotation) bumps the session's
+version; saving or deleting a user (password change, deactivation, last
+login) bumps the user's. The bump happens at once and again when the
+transaction commits, so a request that read the old row in between cannot
+leave it cached under the new version. As with the review cache, a version
+lost to eviction restarts from the clock and never matches an old entry.
+
+The session auth hash is still checked on every request, against the hash
+cached with the user, so a session from before a password change is refused
+as before. Anything the cached path cannot vouch for goes through Django's
+own ``auth.get_user``.
+
+Versions only work when every process sees the same default cache
+(``SHARED_CACHE``, i.e. REDIS_URL is set). Without one, a logout or password
+change would only bump the versions in the process that handled it, so the
+shared tier and the versions are skipped: a process reuses its own copy of a
+session or user for ``AUTH_CACHE_LOCAL_TTL`` seconds (a few) and then reads
+the rows again. The process that handled a logout or password change drops
+its copy at once; the others follow within that time.
+
+Settings use ``SESSION_ENGINE = 'myapp.auth_cache'`` and
+``myapp.auth_cache.CachedAuthenticationMiddleware`` in place of
+AuthenticationMiddleware. A system check refuses ``SHARED_CACHE`` with a
+local-memory default cache.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.backends import cached_db, db
+from django.core import checks
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+# Per-request caches Django keeps on a user that must not be shared between requests.
+USER_CACHE_ATTRIBUTES = ('_perm_cache', '_user_perm_cache', '_group_perm_cache')
+
+# Cache backends whose contents other processes cannot see.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+class LocalCache:
+    """Thread-safe LRU of (version, value, expires) entries."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[2] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key):
+        # The value whatever its version, without counting a lookup.
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def put(self, key, version, value, ttl=None):
+        ttl = settings.AUTH_CACHE_LOCAL_TTL if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (version, value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+sessions = LocalCache(settings.AUTH_CACHE_SIZE)
+users = LocalCache(settings.AUTH_CACHE_SIZE)
+
+
+# --- Versions ---
+
+def session_version_key(session_key):
+    return f'auth:session:{session_key}:version'
+
+
+def user_version_key(user_id):
+    return f'auth:user:{user_id}:version'
+
+
+def current_version(key, known=None):
+    version = known.get(key) if known is not None else cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump(key):
+    def increment():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+    increment()
+    transaction.on_commit(increment)
+
+
+# --- Sessions ---
+
+class SessionStore(cached_db.SessionStore):
+    """cached_db sessions with the in-process tier in front."""
+
+    # Version of the session's user, read along with the session's own version.
+    user_version = None
+
+    def load(self):
+        if not settings.SHARED_CACHE:
+            return self._load_local()
+        session_key = self.session_key
+        cached = sessions.peek(session_key)
+        user_id = cached.get(SESSION_KEY) if cached else None
+        keys = [session_version_key(session_key)] + ([user_version_key(user_id)] if user_id else [])
+        known = cache.get_many(keys)
+        version = current_version(keys[0], known)
+        if user_id:
+            self.user_version = (user_id, current_version(keys[1], known))
+
+        data = sessions.get(session_key, version)
+        if data is not None:
+            return copy.deepcopy(data)
+        data = super().load()
+        if self.session_key is not None and data:
+            sessions.put(self.session_key, version, copy.deepcopy(data))
+        return data
+
+    def _load_local(self):
+        # Without a shared cache: this process's copy until it expires, else the database row.
+        data = sessions.get(self.session_key, None)
+        if data is not None:
+            return copy.deepcopy(data)
+        data = db.SessionStore.load(self)
+        if self.session_key is not None and data:
+            sessions.put(self.session_key, None, copy.deepcopy(data))
+        return data
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        sessions.discard(self.session_key)
+        bump(session_version_key(self.session_key))
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        super().delete(session_key)
+        if session_key is not None:
+            sessions.discard(session_key)
+            bump(session_version_key(session_key))
+
+
+# --- Users ---
+
+def get_user(request):
+    """request.user: the cached user if the session still vouches for it, else Django's auth.get_user."""
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    if user_id is None:
+        return AnonymousUser()
+
+    shared = settings.SHARED_CACHE
+    if shared:
+        known = getattr(session, 'user_version', None)
+        version = known[1] if known and known[0] == user_id else current_version(user_version_key(user_id))
+    else:
+        version = None  # this process's copy until it expires
+    entry = users.get(user_id, version)
+    if entry is None and shared:
+        entry = cache.get(f'auth:user:{user_id}:{version}')
+        if entry is not None:
+            users.put(user_id, version, entry)
+    if (
+        entry is not None
+        and session.get(BACKEND_SESSION_KEY) in settings.AUTHENTICATION_BACKENDS
+        and constant_time_compare(session.get(HASH_SESSION_KEY) or '', entry[1])
+    ):
+        return copy.copy(entry[0])
+
+    user = auth.get_user(request)
+    if user.is_authenticated and str(user.pk) == str(user_id):
+        cached_user = copy.copy(user)
+        for attribute in USER_CACHE_ATTRIBUTES:
+            cached_user.__dict__.pop(attribute, None)
+        entry = (cached_user, user.get_session_auth_hash())
+        users.put(user_id, version, entry)
+        if shared:
+            cache.set(f'auth:user:{user_id}:{version}', entry, settings.SESSION_COOKIE_AGE)
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _request_user(request))
+
+
+def _request_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+@receiver(post_save, sender=User, dispatch_uid='auth_cache_user_saved')
+@receiver(post_delete, sender=User, dispatch_uid='auth_cache_user_deleted')
+def user_changed(sender, instance, **kwargs):
+    users.discard(str(instance.pk))
+    bump(user_version_key(instance.pk))
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.SHARED_CACHE and backend in PROCESS_LOCAL_CACHES:
+        return [checks.Error(
+            f'SHARED_CACHE is set but the default cache, {backend}, is not shared between processes.',
+            hint='Point CACHES at a cache every process uses (set REDIS_URL), or leave SHARED_CACHE off.',
+            id='myapp.E001',
+        )]
+    return []
+
+
+def stats():
+    return {'sessions': sessions.stats(), 'users': users.stats()}
+
+
+def clear():
+    sessions.clear()
+    users.clear()
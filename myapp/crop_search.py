@@ -0,0 +1,170 @@
+"""
+Full-text search over the crop catalog.
+
+The index is built once per worker from every text field of every crop:
+token postings for exact term matches, plus a trigram index over the
+vocabulary so misspelled or partial terms ("tomto", "aphid") still find
+their closest indexed tokens. Queries only touch the postings of the
+matched terms, never the crop text itself; snippets are cut from the few
+fields that end up in the result page.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.utils.html import escape
+
+from .crop_catalog import CATALOG
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Matches in these fields count for more than a mention deep in the guide.
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'identity_context': 2.0,
+    'varieties': 1.5,
+    'pests_affecting': 1.5,
+}
+
+# Fuzzy expansion: how similar a vocabulary token must be to a query term.
+MIN_SIMILARITY = 0.35
+MAX_EXPANSIONS = 4
+MIN_FUZZY_LENGTH = 3
+# A vocabulary token the term is a prefix of ("rust" -> "rusts") counts this much, below an exact hit.
+PREFIX_SIMILARITY = 0.8
+
+SNIPPET_RADIUS = 60
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token):
+    padded = f'${token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CropSearchIndex:
+    def __init__(self, catalog):
+        self.entries = list(catalog.values())
+        # token -> ((doc, weight), ...), weight summed over the doc's fields
+        postings = defaultdict(list)
+        # token -> {doc: {field: weight}}, only consulted to pick the snippet field of a hit
+        self.field_postings = defaultdict(dict)
+        for doc, entry in enumerate(self.entries):
+            fields = defaultdict(dict)
+            for field, text in entry.details.items():
+                weight = FIELD_WEIGHTS.get(field, 1.0)
+                for token, tf in Counter(tokenize(text)).items():
+                    fields[token][field] = weight * tf / (tf + 1.2)
+            for token, field_weights in fields.items():
+                postings[token].append((doc, sum(field_weights.values())))
+                self.field_postings[token][doc] = field_weights
+        self.postings = {token: tuple(hits) for token, hits in postings.items()}
+        self.field_postings = dict(self.field_postings)
+
+        total = len(self.entries)
+        self.idf = {}
+        for token, hits in self.postings.items():
+            df = len(hits)
+            self.idf[token] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+        self.token_trigrams = {token: trigrams(token) for token in self.postings}
+        trigram_postings = defaultdict(list)
+        for token, grams in self.token_trigrams.items():
+            for gram in grams:
+                trigram_postings[gram].append(token)
+        self.trigram_postings = {gram: tuple(tokens) for gram, tokens in trigram_postings.items()}
+
+    def expand(self, term):
+        # The exact hit plus the tokens it prefixes; without an exact hit, also the closest tokens by trigram overlap.
+        exact = term in self.postings
+        if len(term) < MIN_FUZZY_LENGTH:
+            return [(term, 1.0)] if exact else []
+        grams = trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigram_postings.get(gram, ()))
+        candidates = [(term, 1.0)] if exact else []
+        for token, overlap in shared.items():
+            if len(token) < MIN_FUZZY_LENGTH or token == term:
+                continue
+            similarity = overlap / len(grams | self.token_trigrams[token])
+            if token.startswith(term):
+                similarity = max(similarity, PREFIX_SIMILARITY)
+            elif exact:
+                continue
+            if similarity >= MIN_SIMILARITY:
+                candidates.append((token, similarity))
+        return heapq.nlargest(MAX_EXPANSIONS, candidates, key=lambda candidate: candidate[1])
+
+    def search(self, query, limit=10):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        scores = defaultdict(float)
+        matched_terms = defaultdict(int)
+        expansions = []
+        for term in terms:
+            best = {}
+            for token, similarity in self.expand(term):
+                expansions.append((token, similarity))
+                factor = similarity * self.idf[token]
+                for doc, weight in self.postings[token]:
+                    score = factor * weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] += score
+                matched_terms[doc] += 1
+
+        # Crops matching every term rank ahead of crops matching only some.
+        ranked = heapq.nlargest(limit, scores, key=lambda doc: (matched_terms[doc], scores[doc]))
+        highlight = {token for token, _ in expansions}
+        results = []
+        for doc in ranked:
+            entry = self.entries[doc]
+            field = self.snippet_field(doc, expansions)
+            results.append({
+                'crop': entry.slug,
+                'title': entry.details['title'],
+                'score': round(scores[doc] * matched_terms[doc] / len(terms), 4),
+                'field': field,
+                'snippet': snippet(entry.details[field], highlight),
+            })
+        return results
+
+    def snippet_field(self, doc, expansions):
+        field_scores = defaultdict(float)
+        for token, similarity in expansions:
+            for field, weight in self.field_postings[token].get(doc, {}).items():
+                field_scores[field] += similarity * self.idf[token] * weight
+        return max(field_scores, key=field_scores.get)
+
+
+def snippet(text, tokens):
+    # Window around the first highlighted token, HTML-escaped, matches wrapped in <mark>.
+    matches = [match for match in TOKEN_RE.finditer(text) if match.group().lower() in tokens]
+    if not matches:
+        return escape(text[:2 * SNIPPET_RADIUS])
+    start = max(0, matches[0].start() - SNIPPET_RADIUS)
+    end = min(len(text), matches[0].end() + SNIPPET_RADIUS)
+    parts = ['…' if start else '']
+    position = start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        parts.append(escape(text[position:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        position = match.end()
+    parts.append(escape(text[position:end]))
+    parts.append('…' if end < len(text) else '')
+    return ''.join(parts)
+
+
+INDEX = CropSearchIndex(CATALOG)
@@ -0,0 +1,300 @@
+"""
+DBT (Direct Benefit Transfer) linkage lookups for /api/check-dbt/ and its
+bulk CSV variant (myapp.dbt_bulk).
+
+The DBTLinkage table holds one row per Aadhaar number linked for DBT: the
+bank the payments are routed to and the last four digits of the account.
+Rows are keyed by an HMAC-SHA256 of the Aadhaar number under
+``DBT_AADHAAR_SALT``; the number itself is never stored, and without the
+salt the 10^11 valid numbers cannot simply be hashed and matched. Rows come
+from the bulk registry files loaded by ``manage.py import_dbt_registry``.
+
+Most numbers people check are not linked. The importer also writes a Bloom
+filter of every key in the table to ``DBT_BLOOM_PATH``, which each process
+maps read-only (the pages are shared between processes through the page
+cache). A lookup whose key is not in the filter is answered "not linked"
+without touching the database; the rest, linked numbers plus about
+``DBT_BLOOM_ERROR_RATE`` of the unlinked ones, read one row by primary key.
+Both steps cost the same at ten thousand or fifty million entries. The
+importer publishes the filter before it writes the rows, so the filter
+only ever knows about more numbers than the table, never fewer. A process
+picks up a replaced filter within ``RELOAD_CHECK_SECONDS``.
+"""
+
+import hashlib
+import hmac
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .models import DBTLinkage
+
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHECK_SECONDS = 30
+
+MASK64 = (1 << 64) - 1
+
+# Verhoeff tables; the last digit of an Aadhaar number is a Verhoeff check digit.
+_MULTIPLY = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 2, 3, 4, 0, 6, 7, 8, 9, 5], [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
+    [3, 4, 0, 1, 2, 8, 9, 5, 6, 7], [4, 0, 1, 2, 3, 9, 5, 6, 7, 8], [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
+    [6, 5, 9, 8, 7, 1, 0, 4, 3, 2], [7, 6, 5, 9, 8, 2, 1, 0, 4, 3], [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
+    [9, 8, 7, 6, 5, 4, 3, 2, 1, 0],
+]
+_PERMUTE = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 5, 7, 6, 2, 8, 3, 0, 9, 4], [5, 8, 0, 3, 7, 9, 6, 2, 4, 1],
+    [8, 9, 1, 6, 0, 4, 3, 5, 2, 7], [9, 4, 5, 8, 3, 6, 2, 7, 1, 0], [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
+    [2, 7, 9, 3, 8, 0, 6, 4, 1, 5], [7, 0, 4, 6, 9, 1, 3, 2, 5, 8],
+]
+_INVERSE = [0, 4, 3, 2, 1, 5, 6, 7, 8, 9]
+
+AADHAAR_RE = re.compile(r'[2-9][0-9]{11}')
+ACCOUNT_RE = re.compile(r'[0-9]{9,18}')
+
+
+class InvalidNumber(ValueError):
+    pass
+
+
+# --- Numbers ---
+
+def check_digit(digits):
+    """The Verhoeff check digit to append to ``digits``."""
+    checksum = 0
+    for position, digit in enumerate(reversed(digits), start=1):
+        checksum = _MULTIPLY[checksum][_PERMUTE[position % 8][int(digit)]]
+    return str(_INVERSE[checksum])
+
+
+def clean_aadhaar(raw):
+    aadhaar = re.sub(r'[\s-]', '', raw or '')
+    if not AADHAAR_RE.fullmatch(aadhaar) or check_digit(aadhaar[:-1]) != aadhaar[-1]:
+        raise InvalidNumber('Please enter a valid 12-digit Aadhaar number.')
+    return aadhaar
+
+
+def clean_account(raw):
+    account = re.sub(r'[\s-]', '', raw or '')
+    if not ACCOUNT_RE.fullmatch(account):
+        raise InvalidNumber('Please enter a valid bank account number.')
+    return account
+
+
+def mask(aadhaar):
+    return f'XXXX XXXX {aadhaar[-4:]}'
+
+
+def aadhaar_digest(aadhaar, key=None):
+    """HMAC-SHA256 of a cleaned Aadhaar number; its hex form is the DBTLinkage primary key."""
+    key = key if key is not None else settings.DBT_AADHAAR_SALT.encode()
+    return hmac.new(key, aadhaar.encode(), hashlib.sha256).digest()
+
+
+def account_matches(account, linkage):
+    return account.endswith(linkage.account_suffix)
+
+
+def describe(aadhaar, account, linkage):
+    """
+    (linked, account matches, message for the farmer) for a lookup result.
+    The public check answers anyone who types in a number, so it never
+    reveals the bank or account on record, only whether the entered account
+    is the one benefits go to.
+    """
+    if linkage is None:
+        return False, None, (
+            f'❌ Your Aadhaar {mask(aadhaar)} is not linked to DBT scheme. Please visit your nearest bank '
+            f'branch to link your Aadhaar with bank account.'
+        )
+    if account_matches(account, linkage):
+        return True, True, (
+            f'✅ Your Aadhaar {mask(aadhaar)} is successfully linked to DBT scheme with the bank account you '
+            f'entered. You are eligible for direct benefit transfers.'
+        )
+    return True, False, (
+        f'⚠️ Your Aadhaar {mask(aadhaar)} is linked to DBT scheme, but benefits are not paid into the account '
+        f'ending {account[-4:]} that you entered. Please check with your bank branch.'
+    )
+
+
+# --- Bloom filter ---
+
+class BloomFilter:
+    """
+    Bit array with ``hashes`` probes per key. Keys are HMAC digests, already
+    uniformly distributed, so the probe positions come straight from their
+    first 16 bytes by double hashing instead of from further hash functions.
+    """
+
+    MAGIC = b'DBTBLOOM'
+    # magic, bits, hashes, entries, key id
+    HEADER = struct.Struct('<8sQQQ16s')
+
+    def __init__(self, bits, hashes, array, count=0, key_id=b''):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = array
+        self.count = count
+        self.key_id = key_id
+
+    @classmethod
+    def with_capacity(cls, capacity, error_rate, key_id):
+        capacity = max(capacity, 1)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        bits = -(-bits // 64) * 64
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes, np.zeros(bits // 8, dtype=np.uint8), key_id=key_id)
+
+    def add_many(self, digests):
+        if not digests:
+            return
+        halves = np.frombuffer(b''.join(digest[:16] for digest in digests), dtype='<u8').reshape(-1, 2)
+        first, step = halves[:, :1], halves[:, 1:] | np.uint64(1)
+        # uint64 arithmetic wraps, as the & MASK64 in __contains__ does.
+        positions = (first + np.arange(self.hashes, dtype=np.uint64) * step) % np.uint64(self.bits)
+        masks = (np.uint64(1) << (positions & np.uint64(7))).astype(np.uint8)
+        np.bitwise_or.at(self.array, (positions >> np.uint64(3)).astype(np.intp).ravel(), masks.ravel())
+        self.count += len(digests)
+
+    def __contains__(self, digest):
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:16], 'little') | 1
+        array, bits = self.array, self.bits
+        for probe in range(self.hashes):
+            position = ((first + probe * step) & MASK64) % bits
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def save(self, path):
+        """Write the filter next to ``path`` and rename it into place, so readers never see half a file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(partial, 'wb') as output:
+            output.write(self.HEADER.pack(self.MAGIC, self.bits, self.hashes, self.count, self.key_id))
+            output.write(memoryview(self.array))
+            output.flush()
+            os.fsync(output.fileno())
+        os.replace(partial, path)
+
+    @classmethod
+    def open(cls, path):
+        """Map a saved filter read-only."""
+        with open(path, 'rb') as saved:
+            mapped = mmap.mmap(saved.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, bits, hashes, count, key_id = cls.HEADER.unpack_from(mapped)
+        if magic != cls.MAGIC or len(mapped) != cls.HEADER.size + bits // 8:
+            mapped.close()
+            raise ValueError(f'{path} is not a DBT Bloom filter')
+        return cls(bits, hashes, memoryview(mapped)[cls.HEADER.size:], count, key_id)
+
+
+def key_id(key=None):
+    # Identifies the salt a filter was built with, without revealing it.
+    key = key if key is not None else settings.DBT_AADHAAR_SALT.encode()
+    return hmac.new(key, b'dbt-bloom-filter', hashlib.sha256).digest()[:16]
+
+
+# --- Lookups ---
+
+class LinkageRegistry:
+    def __init__(self, bloom_path):
+        self.bloom_path = bloom_path
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._bloom_file = None  # (inode, mtime) of the mapped file
+        self._checked_at = None
+        self.lookups = 0
+        self.filtered = 0
+        self.false_positives = 0
+        self.linked = 0
+
+    def bloom(self):
+        """The current filter, or None when there is none to trust (every lookup then reads the table)."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return self._bloom
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.bloom_path)
+            except (OSError, TypeError):
+                self._bloom, self._bloom_file = None, None
+                return None
+            if (stat.st_ino, stat.st_mtime_ns) != self._bloom_file:
+                self._bloom_file = (stat.st_ino, stat.st_mtime_ns)
+                try:
+                    bloom = BloomFilter.open(self.bloom_path)
+                except (OSError, ValueError, struct.error):
+                    logger.warning('Ignoring unreadable DBT Bloom filter %s', self.bloom_path, exc_info=True)
+                    bloom = None
+                if bloom is not None and bloom.key_id != key_id():
+                    logger.warning('Ignoring DBT Bloom filter %s built with another DBT_AADHAAR_SALT', self.bloom_path)
+                    bloom = None
+                self._bloom = bloom
+            return self._bloom
+
+    def lookup(self, aadhaar):
+        """The DBTLinkage row for a cleaned Aadhaar number, or None if it is not linked."""
+        digest = aadhaar_digest(aadhaar)
+        bloom = self.bloom()
+        maybe_linked = bloom is None or digest in bloom
+        linkage = DBTLinkage.objects.filter(pk=digest.hex()).first() if maybe_linked else None
+        with self._lock:
+            self.lookups += 1
+            if not maybe_linked:
+                self.filtered += 1
+            elif linkage is not None:
+                self.linked += 1
+            elif bloom is not None:
+                self.false_positives += 1
+        return linkage
+
+    def lookup_many(self, aadhaars):
+        """
+        ``{aadhaar: DBTLinkage or None}`` for cleaned numbers, fetching those
+        the filter lets through with a single IN query.
+        """
+        digests = {aadhaar: aadhaar_digest(aadhaar) for aadhaar in aadhaars}
+        bloom = self.bloom()
+        candidates = {digest.hex() for digest in digests.values() if bloom is None or digest in bloom}
+        found = {linkage.pk: linkage for linkage in DBTLinkage.objects.filter(pk__in=candidates)} if candidates else {}
+        with self._lock:
+            self.lookups += len(digests)
+            self.filtered += len(digests) - len(candidates)
+            self.linked += len(found)
+            if bloom is not None:
+                self.false_positives += len(candidates) - len(found)
+        return {aadhaar: found.get(digest.hex()) for aadhaar, digest in digests.items()}
+
+    def stats(self):
+        with self._lock:
+            bloom = self._bloom
+            return {
+                'lookups': self.lookups,
+                'filtered': self.filtered,
+                'false_positives': self.false_positives,
+                'linked': self.linked,
+                'filter_entries': bloom.count if bloom is not None else None,
+                'filtered_rate': round(self.filtered / self.lookups, 4) if self.lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._bloom, self._bloom_file, self._checked_at = None, None, None
+            self.lookups = self.filtered = self.false_positives = self.linked = 0
+
+
+registry = LinkageRegistry(settings.DBT_BLOOM_PATH)
@@ -0,0 +1,107 @@
+"""
+Bulk DBT status checks for /api/check-dbt/bulk/: Common Service Centre
+operators (staff accounts) upload a CSV of Aadhaar/account pairs and get a
+CSV of results. As with the single check, a result only says whether the
+number is linked and whether the uploaded account is the one benefits go to,
+never the bank or account on record.
+
+The upload is read row by row (Django spools large uploads to a temporary
+file) and resolved ``CHUNK_SIZE`` rows at a time: the Bloom filter drops the
+unlinked numbers it can, and the rest are fetched with one
+``aadhaar_hash IN (...)`` query per chunk. Result rows are streamed back as
+each chunk is resolved, so memory use is one chunk whatever the file size.
+"""
+
+import csv
+import io
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from . import dbt
+from .streaming import Echo, batched
+
+
+CHUNK_SIZE = 500
+
+COLUMNS = ('row', 'aadhaar', 'status', 'account_matches')
+
+LINKED = 'linked'
+NOT_LINKED = 'not_linked'
+INVALID_AADHAAR = 'invalid_aadhaar'
+INVALID_ACCOUNT = 'invalid_account'
+
+
+class InvalidUpload(ValueError):
+    pass
+
+
+def read_pairs(upload):
+    """(row number, raw Aadhaar, raw account) for each data row; InvalidUpload if the header is wrong."""
+    reader = csv.reader(io.TextIOWrapper(upload, encoding='utf-8-sig', errors='replace', newline=''))
+    header = [name.strip().lower() for name in next(reader, [])]
+    if 'aadhaar' not in header or 'account' not in header:
+        raise InvalidUpload('The CSV file needs a header row with "aadhaar" and "account" columns.')
+    aadhaar_column, account_column = header.index('aadhaar'), header.index('account')
+    return (
+        (number, *_cells(row, aadhaar_column, account_column))
+        for number, row in enumerate(reader, start=1)
+        if any(cell.strip() for cell in row)
+    )
+
+
+def _cells(row, *columns):
+    return [row[column] if column < len(row) else '' for column in columns]
+
+
+def chunks(pairs):
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def resolve(chunk):
+    """Result columns for a chunk of (row number, raw Aadhaar, raw account)."""
+    cleaned = []
+    for number, raw_aadhaar, raw_account in chunk:
+        try:
+            aadhaar = dbt.clean_aadhaar(raw_aadhaar)
+        except dbt.InvalidNumber:
+            cleaned.append((number, None, None, INVALID_AADHAAR))
+            continue
+        try:
+            cleaned.append((number, aadhaar, dbt.clean_account(raw_account), None))
+        except dbt.InvalidNumber:
+            cleaned.append((number, aadhaar, None, INVALID_ACCOUNT))
+    linkages = dbt.registry.lookup_many({aadhaar for _, aadhaar, _, error in cleaned if error is None})
+    for number, aadhaar, account, error in cleaned:
+        masked = dbt.mask(aadhaar) if aadhaar else ''
+        if error:
+            yield number, masked, error, ''
+            continue
+        linkage = linkages[aadhaar]
+        if linkage is None:
+            yield number, masked, NOT_LINKED, ''
+        else:
+            yield number, masked, LINKED, 'yes' if dbt.account_matches(account, linkage) else 'no'
+
+
+def encode_csv(pairs):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for chunk in chunks(pairs):
+        for row in resolve(chunk):
+            yield writer.writerow(row)
+
+
+def check_response(upload):
+    """Streaming CSV response for an uploaded CSV; raises InvalidUpload before streaming if it is unusable."""
+    pairs = read_pairs(upload)
+    response = StreamingHttpResponse(batched(encode_csv(pairs)), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="dbt-status-{timezone.localdate():%Y%m%d}.csv"'
+    return response
@@ -0,0 +1,28 @@
+"""
+Write farmer registrations left in spool files by web processes that died
+before flushing them to the database.
+
+    python manage.py flush_registrations
+
+Web processes do this themselves when they start, so the command is only
+needed when no web process will be started again, or where there is no
+flock (Windows), in which case run it while the site is stopped: without
+locks it cannot tell a live process's spool from a dead one's.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from myapp import registrations
+
+
+class Command(BaseCommand):
+    help = 'Write registrations left in the spool directory by web processes that have exited.'
+
+    def handle(self, *args, **options):
+        spool_dir = settings.REGISTRATION_SPOOL_DIR
+        if not spool_dir.is_dir():
+            self.stdout.write(f'No spool directory at {spool_dir}.')
+            return
+        written = registrations.replay_orphans(spool_dir)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} registrations from {spool_dir}.'))
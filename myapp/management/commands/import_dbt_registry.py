@@ -0,0 +1,151 @@
+"""
+Load bulk DBT linkage registry files into the DBTLinkage table and rebuild
+the Bloom filter that /api/check-dbt/ consults first.
+
+    python manage.py import_dbt_registry registry.csv [more.csv.gz ...] [--batch-size 5000]
+    python manage.py import_dbt_registry --filter-only
+
+Files are CSV, optionally gzipped, with the columns ``aadhaar``, ``bank`` and
+``account``. They are streamed, never read whole: each Aadhaar number is
+hashed as it is read, and only the hash, the bank and the account's last four
+digits are written. Rows with an invalid Aadhaar or account number are
+skipped and counted. A number already in the table gets the new bank and
+account.
+
+The new filter, holding the existing rows and the files' numbers, is written
+before any row. While the import runs the filter may answer "maybe" for a
+number whose row is not in yet, but never "no" for one that is. Use
+--filter-only to rebuild it from the table alone, e.g. after rows were
+deleted.
+"""
+
+import csv
+import gzip
+import io
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from myapp import dbt
+from myapp.models import DBTLinkage
+
+
+COLUMNS = {'aadhaar', 'bank', 'account'}
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = 'Import DBT linkage registry CSV files and rebuild the DBT Bloom filter.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Registry CSV files (.csv or .csv.gz).')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--filter-only', action='store_true', help='Only rebuild the filter from the table.')
+
+    def handle(self, *args, **options):
+        paths, batch_size = options['paths'], options['batch_size']
+        if not paths and not options['filter_only']:
+            raise CommandError('Give registry files to import, or --filter-only.')
+        if options['filter_only']:
+            paths = []
+        key = settings.DBT_AADHAAR_SALT.encode()
+        for path in paths:
+            # Fail on a missing file or wrong columns before anything is written.
+            self.open_registry(path)[0].close()
+
+        expected = sum(self.count_rows(path) for path in paths)
+        bloom = dbt.BloomFilter.with_capacity(
+            DBTLinkage.objects.count() + expected, settings.DBT_BLOOM_ERROR_RATE, dbt.key_id(key),
+        )
+        for digests in self.stored_digests(batch_size):
+            bloom.add_many(digests)
+        for path in paths:
+            for rows in chunked(self.read_registry(path, key), batch_size):
+                bloom.add_many([row[0] for row in rows if row is not None])
+        bloom.save(settings.DBT_BLOOM_PATH)
+
+        imported = skipped = 0
+        for path in paths:
+            for rows in chunked(self.read_registry(path, key), batch_size):
+                valid = [row for row in rows if row is not None]
+                skipped += len(rows) - len(valid)
+                imported += self.write(valid)
+        if skipped:
+            self.stderr.write(f'Skipped {skipped} rows with an invalid Aadhaar or account number.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} registry entries from {len(paths)} files. '
+            f'Bloom filter: {bloom.count} entries, {bloom.bits // 8 / 1024 / 1024:.1f} MB, '
+            f'{bloom.hashes} probes, written to {settings.DBT_BLOOM_PATH}.'
+        ))
+
+    def open_registry(self, path):
+        try:
+            raw = gzip.open(path, 'rb') if str(path).endswith('.gz') else open(path, 'rb')
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+        registry = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(registry)
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+        if not COLUMNS <= set(reader.fieldnames):
+            registry.close()
+            raise CommandError(f'{path} needs the columns {", ".join(sorted(COLUMNS))}.')
+        return registry, reader
+
+    def count_rows(self, path):
+        registry, reader = self.open_registry(path)
+        with registry:
+            return sum(1 for _ in reader)
+
+    def read_registry(self, path, key):
+        """(digest, bank, account suffix) per row, or None for a row that fails validation."""
+        registry, reader = self.open_registry(path)
+        with registry:
+            for row in reader:
+                try:
+                    aadhaar = dbt.clean_aadhaar(row['aadhaar'])
+                    account = dbt.clean_account(row['account'])
+                except dbt.InvalidNumber:
+                    yield None
+                    continue
+                bank = (row['bank'] or '').strip()[:100]
+                yield dbt.aadhaar_digest(aadhaar, key), bank, account[-4:]
+
+    def stored_digests(self, batch_size):
+        # Keyset pagination: constant memory on every backend, unlike a streaming cursor.
+        last = ''
+        while True:
+            keys = list(
+                DBTLinkage.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not keys:
+                return
+            yield [bytes.fromhex(hex_key) for hex_key in keys]
+            last = keys[-1]
+
+    def write(self, rows):
+        now = timezone.now()
+        # A number twice in one batch would hit the same row twice in one statement.
+        linkages = {
+            digest.hex(): DBTLinkage(aadhaar_hash=digest.hex(), bank_name=bank, account_suffix=suffix, updated_at=now)
+            for digest, bank, suffix in rows
+        }
+        with transaction.atomic():
+            DBTLinkage.objects.bulk_create(
+                linkages.values(),
+                update_conflicts=True,
+                unique_fields=['aadhaar_hash'] if connection.features.supports_update_conflicts_with_target else None,
+                update_fields=['bank_name', 'account_suffix', 'updated_at'],
+            )
+        return len(linkages)
@@ -0,0 +1,184 @@
+"""
+Bulk-load mandi price dumps (Agmarknet / data.gov.in CSV exports) into
+PriceObservation.
+
+    python manage.py ingest_mandi_prices dumps/2025-10-01.csv.gz [more.csv ...]
+    python manage.py ingest_mandi_prices --refresh-all
+
+Rows are streamed from disk and written with bulk_create in batches, so
+memory stays flat however large the file is. Commodities and mandis are
+resolved through in-memory maps (loaded once, extended as new names appear),
+and rows already in the table are skipped, so a dump can be re-run safely.
+New commodities are filed under a market page section by name
+(market.DEFAULT_CATEGORIES). Afterwards the LatestPrice snapshot is
+recomputed for every commodity the dumps touched; --refresh-all recomputes
+it for all of them.
+"""
+
+import csv
+import datetime
+import gzip
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp import market
+from myapp.models import Commodity, Mandi, PriceObservation
+
+
+# Header spellings seen in the dumps -> our field names. Headers are
+# lower-cased, "_x0020_" (XML-escaped space) and spaces turned into "_".
+COLUMN_ALIASES = {
+    'state': 'state',
+    'district': 'district',
+    'market': 'market',
+    'market_name': 'market',
+    'commodity': 'commodity',
+    'variety': 'variety',
+    'arrival_date': 'date',
+    'price_date': 'date',
+    'date': 'date',
+    'min_price': 'min_price',
+    'min_price_(rs./quintal)': 'min_price',
+    'max_price': 'max_price',
+    'max_price_(rs./quintal)': 'max_price',
+    'modal_price': 'modal_price',
+    'modal_price_(rs./quintal)': 'modal_price',
+}
+
+REQUIRED_COLUMNS = {'state', 'district', 'market', 'commodity', 'date', 'min_price', 'max_price', 'modal_price'}
+
+DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d-%b-%Y')
+
+MAX_REPORTED_ERRORS = 10
+
+
+def normalize_header(name):
+    return name.strip().lower().replace('_x0020_', '_').replace(' ', '_')
+
+
+def open_dump(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, encoding='utf-8-sig', newline='')
+
+
+class Command(BaseCommand):
+    help = 'Stream mandi price CSV dumps into the market price store in bulk_create batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='CSV files to ingest (optionally .gz compressed).')
+        parser.add_argument(
+            '--refresh-all', action='store_true', help='Recompute the latest-price snapshot of every commodity.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch (default 5000).')
+        parser.add_argument('--delimiter', default=',', help='CSV field delimiter (default ",").')
+
+    def handle(self, *args, paths, batch_size, delimiter, refresh_all, **options):
+        if not paths and not refresh_all:
+            raise CommandError('Give the dumps to ingest, or --refresh-all.')
+        self.commodities = dict(Commodity.objects.values_list('name', 'id'))
+        self.mandis = {
+            (state, district, name): pk
+            for pk, state, district, name in Mandi.objects.values_list('id', 'state', 'district', 'name')
+        }
+        self.dates = {}
+        self.touched = set()
+        for path in paths:
+            self.ingest(path, batch_size, delimiter)
+
+        refresh = self.commodities.values() if refresh_all else self.touched
+        market.refresh_latest_prices(sorted(refresh))
+        self.stdout.write(f'Latest prices refreshed for {len(refresh)} commodities.')
+
+    def ingest(self, path, batch_size, delimiter):
+        started = time.monotonic()
+        read = written = skipped = 0
+        batch = []
+        try:
+            dump = open_dump(path)
+        except OSError as exc:
+            raise CommandError(f'Cannot open {path}: {exc}')
+        with dump:
+            reader = csv.reader(dump, delimiter=delimiter)
+            columns = self.map_columns(path, next(reader, []))
+            for line_number, row in enumerate(reader, start=2):
+                read += 1
+                try:
+                    batch.append(self.build_observation(row, columns))
+                except (ValueError, IndexError, InvalidOperation) as exc:
+                    skipped += 1
+                    if skipped <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f'{path}:{line_number}: skipped ({exc})')
+                    continue
+                if len(batch) >= batch_size:
+                    written += self.flush(batch)
+                    batch = []
+            written += self.flush(batch)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{path}: {read} rows read, {written} written (rows already stored are ignored), '
+            f'{skipped} skipped in {elapsed:.1f}s ({read / elapsed if elapsed else read:.0f} rows/s)'
+        ))
+
+    def map_columns(self, path, header):
+        columns = {}
+        for index, name in enumerate(header):
+            field = COLUMN_ALIASES.get(normalize_header(name))
+            if field and field not in columns:
+                columns[field] = index
+        missing = REQUIRED_COLUMNS - set(columns)
+        if missing:
+            raise CommandError(f'{path}: missing columns: {", ".join(sorted(missing))}')
+        return columns
+
+    def build_observation(self, row, columns):
+        commodity = row[columns['commodity']].strip()
+        mandi_key = (row[columns['state']].strip(), row[columns['district']].strip(), row[columns['market']].strip())
+        if not commodity or not all(mandi_key):
+            raise ValueError('blank commodity or market')
+        observation = PriceObservation(
+            commodity_id=self.commodity_id(commodity),
+            mandi_id=self.mandi_id(mandi_key),
+            variety=row[columns['variety']].strip()[:100] if 'variety' in columns else '',
+            date=self.parse_date(row[columns['date']].strip()),
+            min_price=Decimal(row[columns['min_price']]),
+            max_price=Decimal(row[columns['max_price']]),
+            modal_price=Decimal(row[columns['modal_price']]),
+        )
+        self.touched.add(observation.commodity_id)
+        return observation
+
+    def commodity_id(self, name):
+        if name not in self.commodities:
+            self.commodities[name] = Commodity.objects.get_or_create(
+                name=name, defaults={'category': market.default_category(name)},
+            )[0].pk
+        return self.commodities[name]
+
+    def mandi_id(self, key):
+        if key not in self.mandis:
+            state, district, name = key
+            self.mandis[key] = Mandi.objects.get_or_create(state=state, district=district, name=name)[0].pk
+        return self.mandis[key]
+
+    def parse_date(self, value):
+        # A dump only holds a handful of distinct dates, so parse each string once.
+        if value not in self.dates:
+            for date_format in DATE_FORMATS:
+                try:
+                    self.dates[value] = datetime.datetime.strptime(value, date_format).date()
+                    break
+                except ValueError:
+                    continue
+            else:
+                raise ValueError(f'unrecognised date "{value}"')
+        return self.dates[value]
+
+    def flush(self, batch):
+        if not batch:
+            return 0
+        PriceObservation.objects.bulk_create(batch, batch_size=len(batch), ignore_conflicts=True)
+        return len(batch)
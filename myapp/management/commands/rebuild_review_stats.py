@@ -0,0 +1,27 @@
+"""
+Recount the ReviewStats row from the Review table.
+
+    python manage.py rebuild_review_stats
+
+The row is normally kept current one review at a time; run this after
+loading reviews with bulk operations that skip signals (bulk_create, raw
+SQL, fixtures) or if the totals are ever suspected to have drifted.
+"""
+
+from django.core.management.base import BaseCommand
+
+from myapp import reviews
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the review count, rating sum and rating histogram from the Review table.'
+
+    def handle(self, *args, **options):
+        stats = reviews.review_stats()
+        before = (stats.review_count, stats.rating_sum)
+        stats = reviews.rebuild_stats()
+        histogram = ', '.join(f'{rating}★: {count}' for rating, count in stats.histogram.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'{stats.review_count} reviews, average {stats.average_rating} ({histogram}); '
+            f'was {before[0]} reviews with rating sum {before[1]}.'
+        ))
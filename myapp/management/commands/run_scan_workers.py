@@ -0,0 +1,64 @@
+"""
+Work the plant disease scan queue (myapp.scan_jobs).
+
+    python manage.py run_scan_workers [--processes N]
+
+Loads the model once, then forks N worker processes (default
+SCAN_WORKERS), each claiming and scanning one job at a time. Run more
+processes, or the command on more hosts against the same database, for more
+throughput. SIGTERM or Ctrl-C lets every worker finish its current scan and
+exit.
+"""
+
+import multiprocessing
+import os
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from myapp import scan_jobs, scanner
+
+
+def worker_main(name):
+    stop = scan_jobs.stop_on_signals()
+    scan_jobs.work(name, stop)
+
+
+class Command(BaseCommand):
+    help = 'Run worker processes that scan queued /api/scan-image/ uploads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.SCAN_WORKERS)
+
+    def handle(self, *args, **options):
+        # Loaded before forking, so every worker starts warm and shares the model pages.
+        scanner.get_engine()
+        host = socket.gethostname()
+        count = max(1, options['processes'])
+        self.stdout.write(f'Starting {count} scan worker(s) on {host}.')
+        if count == 1:
+            worker_main(f'{host}:{os.getpid()}')
+            return
+
+        # Each worker opens its own database connections.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=worker_main, args=(f'{host}:{os.getpid()}-{i}',), name=f'scan-worker-{i}')
+            for i in range(count)
+        ]
+        for worker in workers:
+            worker.start()
+        stop = scan_jobs.stop_on_signals()
+        try:
+            while not stop.is_set() and any(worker.is_alive() for worker in workers):
+                stop.wait(1)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+        self.stdout.write('Scan workers stopped.')
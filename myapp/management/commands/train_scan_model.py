@@ -0,0 +1,100 @@
+"""
+Fit the plant disease scanner's linear model from labelled leaf photos.
+
+    python manage.py train_scan_model photos/ [--output myapp/data/scan_model.json]
+
+``photos/`` holds one sub-folder per class, named after the keys of
+myapp.scanner.DISEASES (healthy/, leaf_blight/, ...). Every image goes
+through the same decode and feature extraction as an upload, then a softmax
+regression is fitted with plain NumPy gradient descent and written as the
+compact JSON file LinearModelEngine reads. Restart the web and scan workers
+to pick up a new model.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp import scanner
+
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp', '.bmp'}
+
+
+class Command(BaseCommand):
+    help = 'Train the scan_image classifier from a folder of labelled leaf photos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('photos', help='Folder with one sub-folder of images per class.')
+        parser.add_argument('--output', default=settings.SCAN_MODEL_PATH)
+        parser.add_argument('--epochs', type=int, default=500)
+        parser.add_argument('--learning-rate', type=float, default=0.5)
+        parser.add_argument('--l2', type=float, default=1e-3)
+
+    def handle(self, *args, **options):
+        root = Path(options['photos'])
+        classes = sorted(folder.name for folder in root.iterdir() if folder.is_dir()) if root.is_dir() else []
+        unknown = set(classes) - set(scanner.DISEASES)
+        if unknown:
+            raise CommandError(f'Unknown classes: {", ".join(sorted(unknown))}. Use the keys of scanner.DISEASES.')
+        if len(classes) < 2:
+            raise CommandError(f'{root} needs sub-folders for at least two classes.')
+
+        rows, labels = [], []
+        for label, name in enumerate(classes):
+            for path in sorted((root / name).iterdir()):
+                if path.suffix.lower() not in IMAGE_SUFFIXES:
+                    continue
+                try:
+                    with path.open('rb') as image:
+                        rows.append(scanner.extract_features(scanner.load_image(image)))
+                except scanner.InvalidImage as exc:
+                    self.stderr.write(f'Skipping {path}: {exc}')
+                    continue
+                labels.append(label)
+        if not rows:
+            raise CommandError(f'No readable images under {root}.')
+
+        features, labels = np.stack(rows), np.asarray(labels)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1
+        weights, bias = fit_softmax(
+            (features - mean) / scale, labels, len(classes),
+            options['epochs'], options['learning_rate'], options['l2'],
+        )
+        predicted = (((features - mean) / scale) @ weights.T + bias).argmax(axis=1)
+
+        model = {
+            'classes': classes,
+            'features': scanner.FEATURE_NAMES,
+            'mean': mean.round(6).tolist(),
+            'scale': scale.round(6).tolist(),
+            'weights': weights.round(6).tolist(),
+            'bias': bias.round(6).tolist(),
+        }
+        Path(options['output']).write_text(json.dumps(model, separators=(',', ':')), encoding='utf-8')
+        counts = ', '.join(f'{name}: {int((labels == i).sum())}' for i, name in enumerate(classes))
+        self.stdout.write(self.style.SUCCESS(
+            f'Trained on {len(labels)} images ({counts}); training accuracy {(predicted == labels).mean():.1%}. '
+            f'Wrote {options["output"]}.'
+        ))
+
+
+def fit_softmax(features, labels, class_count, epochs, learning_rate, l2):
+    """Full-batch gradient descent on the cross-entropy of a softmax regression."""
+    samples, width = features.shape
+    weights = np.zeros((class_count, width))
+    bias = np.zeros(class_count)
+    targets = np.eye(class_count)[labels]
+    for _ in range(epochs):
+        logits = features @ weights.T + bias
+        probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        error = (probabilities - targets) / samples
+        weights -= learning_rate * (error.T @ features + l2 * weights)
+        bias -= learning_rate * error.sum(axis=0)
+    return weights, bias
@@ -0,0 +1,156 @@
+"""
+Read side of the market price store (see ingest_mandi_prices for the write side).
+"""
+
+import datetime
+
+from django.db.models import Avg, Max, Min
+
+from .models import Commodity, LatestPrice, PriceObservation
+
+
+# Sections of the market page; every one is always present in the payload.
+PAGE_SECTIONS = ('cereals', 'vegetables', 'pulses')
+
+# Page section for commodities as the dumps name them (lower case, before any
+# "(...)" qualifier), given to new commodities by ingest_mandi_prices. Anything
+# else starts as "other" until an admin files it under a section.
+DEFAULT_CATEGORIES = {
+    **dict.fromkeys((
+        'wheat', 'paddy', 'rice', 'maize', 'bajra', 'jowar', 'barley', 'ragi', 'foxtail millet',
+    ), 'cereals'),
+    **dict.fromkeys((
+        'potato', 'onion', 'tomato', 'brinjal', 'cabbage', 'cauliflower', 'green chilli', 'bhindi', 'carrot',
+        'cucumbar', 'bottle gourd', 'bitter gourd', 'capsicum', 'peas wet', 'beans', 'pumpkin', 'radish',
+        'spinach', 'ginger', 'garlic',
+    ), 'vegetables'),
+    **dict.fromkeys((
+        'bengal gram', 'arhar', 'green gram', 'black gram', 'lentil', 'peas', 'kabuli chana', 'soyabean',
+        'groundnut', 'mustard', 'sesamum', 'sunflower', 'castor seed', 'linseed',
+    ), 'pulses'),
+}
+
+
+def default_category(name):
+    return DEFAULT_CATEGORIES.get(name.split('(')[0].strip().lower(), 'other')
+
+
+def latest_prices():
+    """
+    Latest all-India modal price per commodity, with the % change from its
+    previous trading day, grouped by page section. One query on the
+    LatestPrice snapshot, however many observations the store holds.
+    """
+    snapshot = {section: [] for section in PAGE_SECTIONS}
+    latest = (
+        LatestPrice.objects
+        .filter(commodity__category__in=PAGE_SECTIONS)
+        .select_related('commodity')
+        .order_by('commodity__name')
+    )
+    for row in latest:
+        commodity = row.commodity
+        price, previous = float(row.price), float(row.previous_price or 0)
+        change = round((price - previous) / previous * 100) if previous else 0
+        item = {'name': commodity.name, 'price': round(price), 'change': change}
+        if commodity.unit != 'quintal':
+            item['unit'] = commodity.unit
+        snapshot[commodity.category].append(item)
+    return snapshot
+
+
+def refresh_latest_prices(commodity_ids):
+    """
+    Recompute the LatestPrice rows of the given commodities. Each reads only
+    its two newest trading dates off the (commodity, date, modal_price)
+    index: one query for the dates, one for their mean prices.
+    """
+    for commodity_id in commodity_ids:
+        observations = PriceObservation.objects.filter(commodity_id=commodity_id)
+        dates = list(observations.order_by('-date').values_list('date', flat=True).distinct()[:2])
+        if not dates:
+            LatestPrice.objects.filter(commodity_id=commodity_id).delete()
+            continue
+        prices = dict(
+            observations.filter(date__in=dates).values_list('date').annotate(price=Avg('modal_price')).order_by()
+        )
+        previous = dates[1] if len(dates) > 1 else None
+        LatestPrice.objects.update_or_create(commodity_id=commodity_id, defaults={
+            'date': dates[0],
+            'price': round(prices[dates[0]], 2),
+            'previous_date': previous,
+            'previous_price': round(prices[previous], 2) if previous else None,
+        })
+
+
+HISTORY_INTERVALS = ('day', 'week', 'month')
+HISTORY_METRICS = ('ohlc', 'mean')
+
+
+def bucket_start(date, interval):
+    if interval == 'week':
+        return date - datetime.timedelta(days=date.weekday())
+    if interval == 'month':
+        return date.replace(day=1)
+    return date
+
+
+def price_history(commodity, start, end, interval='day', metric='ohlc', mandi=None):
+    """
+    Downsampled price series for one commodity, as parallel arrays.
+
+    The database collapses the raw observations into one row per day (a range
+    scan on the covering (commodity, date, modal_price, min_price, max_price)
+    index): the mean modal price and, for OHLC, the lowest min_price and
+    highest max_price any mandi reported. Days are then folded into the
+    interval's buckets: open/close are the mean modal price of the first and
+    last trading day of the bucket, high/low the extremes of its days' price
+    ranges, mean the average of its days' modal prices. A year of weekly OHLC
+    is ~53 points whatever the row count.
+    """
+    observations = PriceObservation.objects.filter(commodity=commodity, date__range=(start, end))
+    if mandi is not None:
+        observations = observations.filter(mandi=mandi)
+    daily = observations.values_list('date').annotate(price=Avg('modal_price'))
+    if metric == 'ohlc':
+        daily = daily.annotate(low=Min('min_price'), high=Max('max_price'))
+    daily = daily.order_by('date')
+
+    series = {'t': []}
+    columns = ('o', 'h', 'l', 'c') if metric == 'ohlc' else ('mean',)
+    for column in columns:
+        series[column] = []
+    bucket = None
+    days = []  # (mean modal, low, high) per trading day of the bucket
+
+    def close_bucket():
+        series['t'].append(bucket.isoformat())
+        if metric == 'ohlc':
+            series['o'].append(round(days[0][0], 2))
+            series['h'].append(round(max(high for _, _, high in days), 2))
+            series['l'].append(round(min(low for _, low, _ in days), 2))
+            series['c'].append(round(days[-1][0], 2))
+        else:
+            series['mean'].append(round(sum(price for price, _, _ in days) / len(days), 2))
+
+    for date, price, *price_range in daily:
+        key = bucket_start(date, interval)
+        if key != bucket:
+            if days:
+                close_bucket()
+            bucket, days = key, []
+        low, high = price_range or (price, price)
+        days.append((float(price), float(low), float(high)))
+    if days:
+        close_bucket()
+
+    return {
+        'commodity': commodity.name,
+        'unit': commodity.unit,
+        'mandi': mandi.pk if mandi is not None else None,
+        'interval': interval,
+        'metric': metric,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        **series,
+    }
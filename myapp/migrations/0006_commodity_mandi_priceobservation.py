@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0005_alter_review_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Commodity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('category', models.CharField(choices=[('cereals', 'Cereals & Grains'), ('vegetables', 'Vegetables'), ('pulses', 'Pulses & Oilseeds'), ('fruits', 'Fruits'), ('other', 'Other')], default='other', max_length=20)),
+                ('unit', models.CharField(default='quintal', max_length=20)),
+            ],
+            options={
+                'verbose_name_plural': 'commodities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Mandi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('district', models.CharField(max_length=100)),
+                ('state', models.CharField(max_length=100)),
+            ],
+            options={
+                'ordering': ['state', 'district', 'name'],
+                'unique_together': {('state', 'district', 'name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('variety', models.CharField(blank=True, default='', max_length=100)),
+                ('date', models.DateField()),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('modal_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('commodity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='myapp.commodity')),
+                ('mandi', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='myapp.mandi')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['commodity', 'date'], name='price_commodity_date_idx'), models.Index(fields=['date'], name='price_date_idx')],
+                'unique_together': {('commodity', 'mandi', 'date', 'variety')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_commodity_mandi_priceobservation'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='priceobservation',
+            name='price_commodity_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='priceobservation',
+            index=models.Index(fields=['commodity', 'date', 'modal_price'], name='price_history_idx'),
+        ),
+    ]
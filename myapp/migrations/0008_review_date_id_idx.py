@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0007_priceobservation_history_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['submission_date', 'id'], name='review_date_id_idx'),
+        ),
+    ]
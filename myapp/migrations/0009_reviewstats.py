@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:01
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+
+def seed_review_stats(apps, schema_editor):
+    Review = apps.get_model('myapp', 'Review')
+    ReviewStats = apps.get_model('myapp', 'ReviewStats')
+    totals = Review.objects.aggregate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating', default=0),
+        **{f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)},
+    )
+    ReviewStats.objects.create(pk=1, rebuilt_at=timezone.now(), **totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0008_review_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'review stats',
+            },
+        ),
+        migrations.RunPython(seed_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# FULLTEXT index for review search (myapp.review_search). Django has no
+# portable FULLTEXT index type, and other backends use the in-process
+# fallback index, so this only touches MySQL.
+
+from django.db import migrations
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE myapp_review ADD FULLTEXT INDEX review_text_ft (review_text)')
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE myapp_review DROP INDEX review_text_ft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0009_reviewstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0010_review_text_fulltext'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating', 'submission_date', 'id'], name='review_rating_date_idx'),
+        ),
+    ]
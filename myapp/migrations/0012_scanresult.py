@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_review_rating_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_version', models.CharField(max_length=32)),
+                ('fingerprint', models.CharField(max_length=16)),
+                ('band_0', models.PositiveIntegerField()),
+                ('band_1', models.PositiveIntegerField()),
+                ('band_2', models.PositiveIntegerField()),
+                ('band_3', models.PositiveIntegerField()),
+                ('label', models.CharField(max_length=32)),
+                ('confidence', models.FloatField()),
+                ('scores', models.JSONField(default=dict)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model_version', 'band_0'], name='scan_result_band_0_idx'), models.Index(fields=['model_version', 'band_1'], name='scan_result_band_1_idx'), models.Index(fields=['model_version', 'band_2'], name='scan_result_band_2_idx'), models.Index(fields=['model_version', 'band_3'], name='scan_result_band_3_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model_version', 'fingerprint'), name='scan_result_fingerprint_uniq')],
+            },
+        ),
+    ]
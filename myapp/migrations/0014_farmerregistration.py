@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_scanjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerRegistration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(max_length=10, unique=True)),
+                ('email', models.EmailField(max_length=254)),
+                ('registered_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0014_farmerregistration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DBTLinkage',
+            fields=[
+                ('aadhaar_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('bank_name', models.CharField(max_length=100)),
+                ('account_suffix', models.CharField(max_length=4)),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+    ]
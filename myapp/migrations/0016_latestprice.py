@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg
+
+
+def seed_latest_prices(apps, schema_editor):
+    # Same as market.refresh_latest_prices for every commodity with observations.
+    PriceObservation = apps.get_model('myapp', 'PriceObservation')
+    LatestPrice = apps.get_model('myapp', 'LatestPrice')
+    commodity_ids = PriceObservation.objects.values_list('commodity_id', flat=True).distinct().order_by()
+    for commodity_id in commodity_ids:
+        observations = PriceObservation.objects.filter(commodity_id=commodity_id)
+        dates = list(observations.order_by('-date').values_list('date', flat=True).distinct()[:2])
+        prices = dict(
+            observations.filter(date__in=dates).values_list('date').annotate(price=Avg('modal_price')).order_by()
+        )
+        previous = dates[1] if len(dates) > 1 else None
+        LatestPrice.objects.create(
+            commodity_id=commodity_id,
+            date=dates[0],
+            price=round(prices[dates[0]], 2),
+            previous_date=previous,
+            previous_price=round(prices[previous], 2) if previous else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_dbtlinkage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestPrice',
+            fields=[
+                ('commodity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest_price', serialize=False, to='myapp.commodity')),
+                ('date', models.DateField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('previous_date', models.DateField(blank=True, null=True)),
+                ('previous_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+            ],
+        ),
+        migrations.RunPython(seed_latest_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0016_latestprice'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='priceobservation',
+            name='price_history_idx',
+        ),
+        migrations.AddIndex(
+            model_name='priceobservation',
+            index=models.Index(fields=['commodity', 'date', 'modal_price', 'min_price', 'max_price'], name='price_history_idx'),
+        ),
+    ]
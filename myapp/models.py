@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -23,4 +25,251 @@ class Review(models.Model):
     class Meta:
         # Prevents a user from submitting more than one review
         unique_together = ('user',)
-        ordering = ['-submission_date']
\ No newline at end of file
+        ordering = ['-submission_date']
+        indexes = [
+            # Keyset pagination of the feedback list walks (submission_date, id) newest first
+            models.Index(fields=['submission_date', 'id'], name='review_date_id_idx'),
+            # Rating filters (admin, exports) keep the same newest-first order
+            models.Index(fields=['rating', 'submission_date', 'id'], name='review_rating_date_idx'),
+        ]
+
+class ReviewStats(models.Model):
+    """
+    Running totals over all reviews, kept in a single row (pk=1) and adjusted
+    by signal handlers in myapp.reviews as reviews are added, edited or
+    deleted, so the feedback dashboard never scans the Review table.
+    """
+    # Number of reviews and the sum of their ratings
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    # Rating histogram: how many reviews gave 1, 2, ... 5 stars
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    # When the row was last rebuilt from the Review table
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.review_count} reviews, average {self.average_rating}"
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.review_count, 1) if self.review_count else 0
+
+    @property
+    def histogram(self):
+        return {rating: getattr(self, f'rating_{rating}') for rating in range(1, 6)}
+
+    class Meta:
+        verbose_name_plural = 'review stats'
+
+# --- Market Prices ---
+
+class Commodity(models.Model):
+    CATEGORY_CHOICES = [
+        ('cereals', 'Cereals & Grains'),
+        ('vegetables', 'Vegetables'),
+        ('pulses', 'Pulses & Oilseeds'),
+        ('fruits', 'Fruits'),
+        ('other', 'Other'),
+    ]
+
+    # Commodity name as published in the mandi dumps, e.g. "Wheat"
+    name = models.CharField(max_length=100, unique=True)
+
+    # Which section of the market page the commodity is shown in
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other')
+
+    # Unit the prices are quoted per
+    unit = models.CharField(max_length=20, default='quintal')
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'commodities'
+
+
+class Mandi(models.Model):
+    name = models.CharField(max_length=100)
+    district = models.CharField(max_length=100)
+    state = models.CharField(max_length=100)
+
+    def __str__(self):
+        return f"{self.name}, {self.district} ({self.state})"
+
+    class Meta:
+        unique_together = ('state', 'district', 'name')
+        ordering = ['state', 'district', 'name']
+
+
+class PriceObservation(models.Model):
+    commodity = models.ForeignKey(Commodity, on_delete=models.CASCADE, related_name='prices')
+    mandi = models.ForeignKey(Mandi, on_delete=models.CASCADE, related_name='prices')
+
+    # Variety/grade as reported by the mandi; blank when the dump has none
+    variety = models.CharField(max_length=100, blank=True, default='')
+
+    # Arrival date the prices were recorded for
+    date = models.DateField()
+
+    # Prices in rupees per commodity unit
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2)
+    modal_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.commodity} at {self.mandi.name} on {self.date}: ₹{self.modal_price}"
+
+    class Meta:
+        # One row per commodity, mandi, day and variety. The unique index doubles as the
+        # (commodity, mandi, date) lookup index and lets re-ingested dumps skip existing rows.
+        unique_together = ('commodity', 'mandi', 'date', 'variety')
+        indexes = [
+            # Covers the history query: range scan on (commodity, date) reading the prices
+            # straight from the index, without touching the table rows.
+            models.Index(fields=['commodity', 'date', 'modal_price', 'min_price', 'max_price'], name='price_history_idx'),
+            models.Index(fields=['date'], name='price_date_idx'),
+        ]
+
+
+class LatestPrice(models.Model):
+    """
+    Each commodity's last two trading days of all-India mean modal price,
+    recomputed by ingest_mandi_prices for the commodities a dump touched, so
+    the market page reads one row per commodity instead of the observations.
+    """
+
+    commodity = models.OneToOneField(Commodity, on_delete=models.CASCADE, primary_key=True, related_name='latest_price')
+
+    date = models.DateField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    # The trading day before ``date``; empty while the commodity has only one
+    previous_date = models.DateField(null=True, blank=True)
+    previous_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.commodity} on {self.date}: ₹{self.price}"
+
+# --- Plant Disease Scanner ---
+
+class ScanResult(models.Model):
+    """A diagnosis, found again by the perceptual hash of the photo it was made for."""
+
+    # Which model produced the diagnosis; results of any other model are not reused
+    model_version = models.CharField(max_length=32)
+
+    # 64-bit dHash of the downscaled image, as 16 hex digits
+    fingerprint = models.CharField(max_length=16)
+
+    # The hash cut into four 16-bit bands. A near-duplicate (at most 3 bits apart)
+    # matches at least one band exactly, so candidates come from index lookups.
+    band_0 = models.PositiveIntegerField()
+    band_1 = models.PositiveIntegerField()
+    band_2 = models.PositiveIntegerField()
+    band_3 = models.PositiveIntegerField()
+
+    # Key into myapp.scanner.DISEASES, and the model's probability for it
+    label = models.CharField(max_length=32)
+    confidence = models.FloatField()
+    scores = models.JSONField(default=dict)
+
+    # Uploads answered from this row instead of running the model
+    hits = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.fingerprint}: {self.label} ({self.confidence:.0%})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model_version', 'fingerprint'], name='scan_result_fingerprint_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['model_version', f'band_{band}'], name=f'scan_result_band_{band}_idx')
+            for band in range(4)
+        ]
+
+
+class ScanJob(models.Model):
+    """An uploaded leaf photo waiting for, or scanned by, ``manage.py run_scan_workers``."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Id the client polls with; not guessable, unlike the primary key
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+
+    # The uploaded file, emptied once the job has finished
+    image = models.BinaryField()
+
+    # The /api/scan-image/ response body for a finished scan, or why it failed
+    result = models.JSONField(null=True, blank=True)
+    error = models.CharField(max_length=200, blank=True, default='')
+
+    # Whether the diagnosis came from the scan result cache instead of the model
+    cached = models.BooleanField(default=False)
+
+    # Claims so far (a job whose worker died is claimed again) and the latest claimant
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Scan {self.token} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest queued job, and look for running ones past their lease.
+            models.Index(fields=['status', 'id'], name='scan_job_claim_idx'),
+            models.Index(fields=['finished_at'], name='scan_job_finished_idx'),
+        ]
+
+
+class FarmerRegistration(models.Model):
+    # 10-digit mobile number without the +91 or leading 0; one registration per phone
+    phone_number = models.CharField(max_length=10, unique=True)
+
+    # Updated when the same phone registers again
+    email = models.EmailField()
+
+    # When the farmer submitted the form (rows are written in batches, a little later)
+    registered_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Registration {self.phone_number}"
+
+
+class DBTLinkage(models.Model):
+    # HMAC-SHA256 (hex) of the Aadhaar number under DBT_AADHAAR_SALT; the number itself is never stored
+    aadhaar_hash = models.CharField(max_length=64, primary_key=True)
+
+    # Where DBT payments for this Aadhaar are routed
+    bank_name = models.CharField(max_length=100)
+    account_suffix = models.CharField(max_length=4)
+
+    # When the registry file carrying this entry was imported
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"DBT linkage {self.aadhaar_hash[:12]}... ({self.bank_name})"
@@ -0,0 +1,141 @@
+"""
+Pre-rendered static content pages (crops, market, scanner, DBT, pests,
+organic farming, videos, news, jobs, benefits...).
+
+These pages are the same for every farmer apart from the CSRF token on the
+forms that post back. Each page is rendered once per process as a skeleton,
+with a marker where the token goes, and split at the markers. A request joins
+the skeleton back together with its own token, from ``get_token`` as
+``{% csrf_token %}`` would have rendered it (and the CSRF cookie is set the
+same way), so serving a page runs no template at all. A skeleton can only
+use what the template context has without a request: no ``user``,
+``request`` or ``messages``.
+
+Skeletons are keyed by ``PAGE_CACHE_VERSION`` (set per deployment). In
+production that is all: templates only change with a deployment, and the
+template loaders cache them until a restart anyway. With DEBUG the version
+also covers the paths, sizes and modification times of the files in the
+template directories, checked by one request at a time at most every
+``PAGE_CACHE_CHECK_SECONDS``; when they change the template loaders are
+reset as well, so edited templates show up without a restart.
+"""
+
+import hashlib
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.autoreload import get_template_directories, reset_loaders
+from django.template.loader import render_to_string
+
+
+MARKER = '[[page-hole:{}]]'
+MARKER_RE = re.compile(r'\[\[page-hole:(\w+)\]\]')
+
+HOLES = {
+    'csrf_token': get_token,
+}
+
+
+# --- Pages ---
+
+class PageCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = {}  # template name -> (version, skeleton parts)
+        self._version = None
+        self._templates = None  # fingerprint of the template files
+        self._checked_at = None
+        self._checking = threading.Lock()  # held by the one request fingerprinting the templates
+        self.hits = 0
+        self.misses = 0
+
+    def version(self):
+        """Current skeleton version; with DEBUG, resets the template loaders when the template files have changed."""
+        if not settings.DEBUG:
+            return settings.PAGE_CACHE_VERSION
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < settings.PAGE_CACHE_CHECK_SECONDS:
+            return self._version
+        # Others keep the version they have while one request walks the files, unless there is none yet.
+        if not self._checking.acquire(blocking=self._version is None):
+            return self._version
+        try:
+            templates = template_fingerprint()
+            with self._lock:
+                self._checked_at = now
+                if self._templates is not None and templates != self._templates:
+                    reset_loaders()
+                self._templates = templates
+                self._version = f'{settings.PAGE_CACHE_VERSION}:{templates}'
+                return self._version
+        finally:
+            self._checking.release()
+
+    def skeleton(self, template_name):
+        """
+        The page split at its holes: UTF-8 text and hole names alternately,
+        starting and ending with text.
+        """
+        version = self.version()
+        entry = self._pages.get(template_name)
+        if entry is not None and entry[0] == version:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+        context = {'csrf_token': MARKER.format('csrf_token')}
+        parts = [
+            part.encode() if index % 2 == 0 else part
+            for index, part in enumerate(MARKER_RE.split(render_to_string(template_name, context)))
+        ]
+        with self._lock:
+            self.misses += 1
+            self._pages[template_name] = (version, parts)
+        return parts
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'pages': len(self._pages),
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._version, self._templates, self._checked_at = None, None, None
+            self.hits = self.misses = 0
+
+
+def template_fingerprint():
+    digest = hashlib.sha256()
+    for directory in sorted(get_template_directories()):
+        for path in sorted(directory.rglob('*')):
+            if path.is_file():
+                stat = path.stat()
+                digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()[:16]
+
+
+pages = PageCache()
+
+
+def render_page(request, template_name):
+    """HttpResponse for a static page, filled in for this request from its cached skeleton."""
+    parts = pages.skeleton(template_name)
+    content = b''.join(part if index % 2 == 0 else HOLES[part](request).encode() for index, part in enumerate(parts))
+    return HttpResponse(content)
+
+
+def stats():
+    return pages.stats()
+
+
+def clear():
+    pages.clear()
@@ -0,0 +1,181 @@
+"""
+Server-Sent Events feed of market price changes for the market page.
+
+One broadcaster per worker polls the price store every
+``PRICE_STREAM_INTERVAL`` seconds, whatever the number of connected clients,
+and publishes only the commodities whose price or change moved since the
+last poll. Each event is encoded once into a short shared ring; subscribers
+just wait for the next version and write the bytes out, so an idle
+connection costs one suspended generator and no per-client queue. A client
+that falls further behind than the ring gets a fresh full snapshot instead.
+
+Only served through ``myproject.asgi:application``, which routes the path
+straight to ``asgi_app``. Under WSGI an endless response would pin a worker,
+so the path is not routed there at all and the market page falls back to
+polling /api/market-prices/.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import market
+
+
+logger = logging.getLogger(__name__)
+
+RING_SIZE = 32
+
+
+def encode_event(name, data, version):
+    payload = json.dumps(data, separators=(',', ':'))
+    return f'id: {version}\nevent: {name}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+def price_map(snapshot):
+    return {
+        (section, item['name']): item
+        for section, items in snapshot.items()
+        for item in items
+    }
+
+
+def changed_items(previous, current):
+    changes = {}
+    for (section, name), item in current.items():
+        if previous.get((section, name)) != item:
+            changes.setdefault(section, []).append(item)
+    return changes
+
+
+class PriceBroadcaster:
+    def __init__(self, load_snapshot, interval, heartbeat):
+        self.load_snapshot = load_snapshot
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.version = 0
+        self.snapshot_event = None
+        self.prices = {}
+        self.ring = deque(maxlen=RING_SIZE)  # (version, encoded event)
+        self.subscribers = 0
+        self.polls = 0
+        self._published = None
+        self._poller = None
+        self._ready = asyncio.Event()
+
+    async def poll_once(self):
+        snapshot = await self.load_snapshot()
+        self.polls += 1
+        prices = price_map(snapshot)
+        if self.snapshot_event is None:
+            self.publish(prices, encode_event('snapshot', snapshot, self.version + 1), None)
+            return
+        changes = changed_items(self.prices, prices)
+        if changes:
+            self.publish(prices, encode_event('snapshot', snapshot, self.version + 1), encode_event('prices', changes, self.version + 1))
+
+    def publish(self, prices, snapshot_event, change_event):
+        self.version += 1
+        self.prices = prices
+        self.snapshot_event = snapshot_event
+        if change_event is not None:
+            self.ring.append((self.version, change_event))
+        if self._published is not None:
+            self._published.set()
+        self._published = asyncio.Event()
+
+    async def _poll_forever(self):
+        # Runs while anyone is subscribed; the first poll happens straight away.
+        while True:
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.warning('Market price poll failed', exc_info=True)
+            else:
+                self._ready.set()
+            await asyncio.sleep(self.interval)
+            if not self.subscribers:
+                break
+        # The snapshot goes stale from here; the next subscriber waits for a fresh poll.
+        self._ready.clear()
+        self._poller = None
+
+    async def subscribe(self):
+        self.subscribers += 1
+        try:
+            if self._poller is None:
+                self._poller = asyncio.ensure_future(self._poll_forever())
+            await self._ready.wait()
+            yield b'retry: 5000\n\n' + self.snapshot_event
+            seen = self.version
+            while True:
+                published = self._published
+                try:
+                    await asyncio.wait_for(published.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b': keep-alive\n\n'
+                    continue
+                yield self.events_since(seen)
+                seen = self.version
+        finally:
+            self.subscribers -= 1
+
+    def events_since(self, seen):
+        """What brings a subscriber that has seen up to version ``seen`` up to date."""
+        pending = [event for version, event in self.ring if version > seen]
+        if self.ring and self.ring[0][0] > seen + 1 or not pending:
+            # Fell behind the ring (or only a snapshot changed): resend the full picture.
+            return self.snapshot_event
+        return b''.join(pending)
+
+
+_broadcaster = None
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = PriceBroadcaster(
+            sync_to_async(market.latest_prices), settings.PRICE_STREAM_INTERVAL, settings.PRICE_STREAM_HEARTBEAT,
+        )
+    return _broadcaster
+
+
+async def asgi_app(scope, receive, send):
+    """
+    The stream as a bare ASGI app, mounted in front of Django by myproject.asgi
+    so an idle subscriber holds no request, middleware or thread-pool state.
+    """
+    if scope['method'] != 'GET':
+        await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    async def pump():
+        async for chunk in get_broadcaster().subscribe():
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+    async def wait_for_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    streaming = asyncio.ensure_future(pump())
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    done, pending = await asyncio.wait({streaming, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    for task in done:
+        task.result()
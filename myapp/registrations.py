@@ -0,0 +1,309 @@
+"""
+Farmer registrations from /api/register-farmer/, written to the
+FarmerRegistration table in batches instead of one INSERT per request.
+
+The view hands each registration to this process's RegistrationBuffer,
+which
+
+- appends it as a JSON line to the process's spool file (fsynced when
+  ``REGISTRATION_SPOOL_FSYNC``) before the view answers, so an acknowledged
+  registration survives the process dying before it reaches the database;
+- keeps it in memory keyed by phone number, so a farmer who submits twice
+  costs one row, holding the latest email;
+- writes the pending registrations with one bulk upsert on phone number once
+  ``REGISTRATION_BATCH_SIZE`` of them are waiting, and otherwise every
+  ``REGISTRATION_FLUSH_INTERVAL`` seconds from a background thread. After a
+  successful write the spool starts over with whatever arrived meanwhile; if
+  the database is unavailable the registrations stay pending and spooled for
+  the next attempt.
+
+Each process spools to its own file under ``REGISTRATION_SPOOL_DIR`` and
+holds an flock on it. A spool file nobody holds a lock on was left by a
+process that died before flushing: the next buffer to start, or
+``manage.py flush_registrations``, writes it to the database and deletes it.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so leftovers are only replayed by the command.
+    fcntl = None
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, close_old_connections, connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import FarmerRegistration
+
+
+logger = logging.getLogger(__name__)
+
+SPOOL_SUFFIX = '.spool'
+
+# Indian mobile number, optionally written with +91, 91 or a leading 0.
+PHONE_RE = re.compile(r'(?:\+?91|0)?([6-9][0-9]{9})')
+
+
+class InvalidRegistration(ValueError):
+    pass
+
+
+def clean(phone_number, email):
+    """The normalized (phone number, email) pair, or InvalidRegistration with a message for the farmer."""
+    match = PHONE_RE.fullmatch(re.sub(r'[\s-]', '', phone_number or ''))
+    if match is None:
+        raise InvalidRegistration('Please enter a valid 10-digit mobile number.')
+    email = (email or '').strip()
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise InvalidRegistration('Please enter a valid email address.')
+    return match.group(1), email
+
+
+def write(registrations):
+    """Upsert ``{phone number: (email, registered_at)}``: new phones are inserted, known ones get the new email."""
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target; SQLite and PostgreSQL need one.
+    unique_fields = ['phone_number'] if connection.features.supports_update_conflicts_with_target else None
+    FarmerRegistration.objects.bulk_create(
+        [
+            FarmerRegistration(phone_number=phone, email=email, registered_at=registered_at)
+            for phone, (email, registered_at) in registrations.items()
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=['email'],
+    )
+    return len(registrations)
+
+
+# --- Spool files ---
+
+def _record(phone_number, email, registered_at):
+    return (json.dumps({'phone': phone_number, 'email': email, 'at': registered_at.isoformat()}) + '\n').encode()
+
+
+def read_spool(spool):
+    """The registrations in a spool file object, later lines winning. A torn last line is skipped."""
+    registrations = {}
+    for line in spool:
+        try:
+            record = json.loads(line)
+            registrations[record['phone']] = (record['email'], parse_datetime(record['at']))
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Skipping unreadable registration spool line in %s', getattr(spool, 'name', spool))
+    return registrations
+
+
+def _try_lock(spool):
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(spool.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def replay_orphans(spool_dir):
+    """Write and delete spool files that no running process holds; returns the registrations written."""
+    written = 0
+    for path in sorted(Path(spool_dir).glob(f'*{SPOOL_SUFFIX}')):
+        try:
+            spool = open(path, 'rb')
+        except FileNotFoundError:
+            continue
+        with spool:
+            # Locked: a live buffer's spool. Unlinked while we waited: its owner has just flushed it.
+            if not _try_lock(spool) or os.fstat(spool.fileno()).st_nlink == 0:
+                continue
+            registrations = read_spool(spool)
+            if registrations:
+                written += write(registrations)
+            path.unlink()
+            logger.info('Replayed %d registrations from %s', len(registrations), path)
+    return written
+
+
+# --- Buffer ---
+
+class RegistrationBuffer:
+    def __init__(self, spool_dir, batch_size, flush_interval, fsync=True):
+        self.spool_dir = Path(spool_dir)
+        self.batch_size = batch_size
+        # Seconds between background flushes; None flushes only at batch_size or when asked (tests).
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()  # pending registrations and the spool file
+        self._flush_lock = threading.Lock()  # one database write at a time, in order
+        self._pending = {}  # phone number -> (email, registered_at)
+        self._spool = None
+        self._token = uuid.uuid4().hex
+        self._segment = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self.accepted = 0
+        self.duplicates = 0
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0
+
+    def start(self):
+        """Open this process's spool, replay ones left by dead processes and start the flush thread."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._spool = self._open_segment()
+        if fcntl is not None:
+            try:
+                replay_orphans(self.spool_dir)
+            except DatabaseError:
+                logger.warning('Could not replay registration spool files', exc_info=True)
+        if self.flush_interval:
+            self._thread = threading.Thread(target=self._run, name='registration-flush', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the flush thread and write what is pending (at exit)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        except DatabaseError:
+            return  # Still spooled; replayed by the next process to start.
+        with self._lock:
+            if not self._pending:
+                os.unlink(self._spool.name)
+                self._spool.close()
+
+    def add(self, phone_number, email, registered_at=None):
+        """Spool a cleaned registration; it reaches the database with the next flush."""
+        registered_at = registered_at or timezone.now()
+        record = _record(phone_number, email, registered_at)
+        with self._lock:
+            self._spool.write(record)
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+            if phone_number in self._pending:
+                self.duplicates += 1
+            self._pending[phone_number] = (email, registered_at)
+            self.accepted += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            if self._thread is None:
+                try:
+                    self.flush()
+                except DatabaseError:
+                    pass  # Logged by flush; the registration is spooled either way.
+            else:
+                self._wake.set()
+
+    def flush(self):
+        """Write the pending registrations to the database; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                spooled = self._spool.tell() if self._spool is not None else 0
+            if not batch:
+                return 0
+            try:
+                write(batch)
+            except DatabaseError:
+                logger.warning('Could not write %d registrations; keeping them spooled', len(batch), exc_info=True)
+                with self._lock:
+                    # Registrations that arrived during the attempt are newer.
+                    self._pending = {**batch, **self._pending}
+                    self.failures += 1
+                raise
+            with self._lock:
+                self._rotate(spooled)
+                self.written += len(batch)
+                self.flushes += 1
+            return len(batch)
+
+    def _open_segment(self):
+        # Caller holds the lock. Unbuffered, so a line is with the OS as soon as add() returns.
+        self._segment += 1
+        path = self.spool_dir / f'{self._token}-{self._segment:06d}{SPOOL_SUFFIX}'
+        spool = open(path, 'a+b', buffering=0)
+        _try_lock(spool)
+        return spool
+
+    def _rotate(self, written_up_to):
+        # Caller holds the lock. Bytes past ``written_up_to`` belong to registrations that arrived
+        # during the flush; they move to a fresh segment before the old one is deleted.
+        old = self._spool
+        old.seek(written_up_to)
+        tail = old.read()
+        self._spool = self._open_segment()
+        if tail:
+            self._spool.write(tail)
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+        os.unlink(old.name)
+        old.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except DatabaseError:
+                connection.close()
+                # Back off for an interval rather than retrying a down database in a loop.
+                time.sleep(self.flush_interval)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'accepted': self.accepted,
+                'duplicates': self.duplicates,
+                'pending': len(self._pending),
+                'written': self.written,
+                'flushes': self.flushes,
+                'failures': self.failures,
+            }
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    # One buffer per process, started by the first registration it receives.
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = RegistrationBuffer(
+                settings.REGISTRATION_SPOOL_DIR,
+                settings.REGISTRATION_BATCH_SIZE,
+                settings.REGISTRATION_FLUSH_INTERVAL,
+                fsync=settings.REGISTRATION_SPOOL_FSYNC,
+            ).start()
+            atexit.register(_buffer.stop)
+    return _buffer
+
+
+def register(phone_number, email):
+    """Clean and buffer a registration from the form; raises InvalidRegistration."""
+    phone_number, email = clean(phone_number, email)
+    get_buffer().add(phone_number, email)
+    return phone_number
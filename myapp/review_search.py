@@ -0,0 +1,223 @@
+"""
+Full-text search over review text, for support staff (admin) and
+/api/reviews/search/.
+
+On MySQL the search runs against the ``review_text_ft`` FULLTEXT index in
+boolean mode: every query term must appear, as a word or a word prefix
+("irrigat" finds "irrigation"), ranked by MySQL's relevance. Other backends
+(the SQLite test and dev databases) have no such index, so the same
+semantics are served from an inverted index over review text built in
+process on first use and kept current by the Review signal handlers below.
+The handlers also bump a version in the default cache when the change
+commits; a process whose index was built under an older version than the
+current one (another worker changed a review) builds it again. With
+per-process caches (no REDIS_URL) the bump stays in its own process, so
+other workers only see their own changes until they restart.
+
+Usernames are matched separately by prefix, which the unique index on
+auth_user.username can answer without a scan.
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .crop_search import tokenize
+from .models import Review
+from .reviews import CARD_FIELDS
+
+
+# InnoDB ignores shorter words (innodb_ft_min_token_size); so does the fallback.
+MIN_TERM_LENGTH = 3
+
+SEARCH_LIMIT = 50
+
+INDEX_VERSION_KEY = 'review_search:version'
+
+
+def query_terms(query):
+    # Tokenizing also strips boolean-mode operators (+ - * " ~ < >) out of user input.
+    return [term for term in dict.fromkeys(tokenize(query)) if len(term) >= MIN_TERM_LENGTH]
+
+
+class MatchAgainst(Func):
+    """MySQL ``MATCH (column) AGAINST (query IN BOOLEAN MODE)``: the relevance score, 0 for no match."""
+
+    output_field = FloatField()
+
+    def __init__(self, column, query):
+        super().__init__(F(column), Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column, query = self.get_source_expressions()
+        column_sql, column_params = compiler.compile(column)
+        query_sql, query_params = compiler.compile(query)
+        return f'MATCH ({column_sql}) AGAINST ({query_sql} IN BOOLEAN MODE)', (*column_params, *query_params)
+
+
+class ReviewTextIndex:
+    """In-process inverted index mirroring the FULLTEXT search semantics."""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # token -> {review id: term frequency}
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+        self.documents = {}  # review id -> tokens, so a review can be removed
+        self._lock = threading.Lock()
+
+    def add(self, pk, text):
+        with self._lock:
+            self._remove(pk)
+            counts = Counter(token for token in tokenize(text or '') if len(token) >= MIN_TERM_LENGTH)
+            for token, tf in counts.items():
+                if token not in self.postings:
+                    bisect.insort(self.vocabulary, token)
+                self.postings[token][pk] = tf
+            self.documents[pk] = tuple(counts)
+
+    def remove(self, pk):
+        with self._lock:
+            self._remove(pk)
+
+    def _remove(self, pk):
+        for token in self.documents.pop(pk, ()):
+            postings = self.postings[token]
+            postings.pop(pk, None)
+            if not postings:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def prefix_postings(self, term):
+        start = bisect.bisect_left(self.vocabulary, term)
+        matched = defaultdict(int)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            for pk, tf in self.postings[token].items():
+                matched[pk] += tf
+        return matched
+
+    def search(self, terms):
+        """Ids of reviews containing every term (as a word prefix), best first."""
+        with self._lock:
+            total = len(self.documents)
+            scores = None
+            for term in terms:
+                matched = self.prefix_postings(term)
+                if not matched:
+                    return []
+                idf = math.log(1 + total / len(matched))
+                if scores is None:
+                    scores = {pk: tf * idf for pk, tf in matched.items()}
+                else:
+                    scores = {pk: score + matched[pk] * idf for pk, score in scores.items() if pk in matched}
+        return sorted(scores or (), key=lambda pk: (-scores[pk], -pk))
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def index_version():
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        # From the clock, as in reviews.cache_version, so a lost version never comes back.
+        cache.add(INDEX_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(INDEX_VERSION_KEY)
+    return version
+
+
+def bump_index_version():
+    global _index_version
+    try:
+        version = cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.add(INDEX_VERSION_KEY, time.time_ns(), timeout=None)
+        return
+    with _index_lock:
+        # Nobody else changed anything since our index was built: it already has this change.
+        if _index is not None and _index_version == version - 1:
+            _index_version = version
+
+
+def fallback_index():
+    global _index, _index_version
+    version = index_version()
+    with _index_lock:
+        if _index is None or _index_version != version:
+            index = ReviewTextIndex()
+            for pk, text in Review.objects.values_list('id', 'review_text').iterator(chunk_size=2000):
+                index.add(pk, text)
+            _index, _index_version = index, version
+        return _index
+
+
+def clear_fallback_index():
+    # Dropped and rebuilt on next use, e.g. after test rollbacks that send no signals.
+    global _index, _index_version
+    with _index_lock:
+        _index = _index_version = None
+
+
+def uses_fulltext():
+    return connection.vendor == 'mysql'
+
+
+def fulltext_matches(terms):
+    boolean_query = ' '.join(f'+{term}*' for term in terms)
+    return Review.objects.annotate(relevance=MatchAgainst('review_text', boolean_query)).filter(relevance__gt=0)
+
+
+def filter_reviews(queryset, query):
+    """Narrow a Review queryset to reviews whose text or author matches ``query``."""
+    query = query.strip()
+    if not query:
+        return queryset
+    condition = Q(user__username__istartswith=query)
+    terms = query_terms(query)
+    if terms:
+        matches = fulltext_matches(terms).values('id') if uses_fulltext() else fallback_index().search(terms)
+        condition |= Q(id__in=matches)
+    return queryset.filter(condition)
+
+
+def search(query, limit=SEARCH_LIMIT):
+    """The ``limit`` most relevant reviews for ``query``, with the columns the review cards show."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if uses_fulltext():
+        return list(
+            fulltext_matches(terms).select_related('user').only(*CARD_FIELDS)
+            .order_by('-relevance', '-submission_date', '-id')[:limit]
+        )
+    ranked = fallback_index().search(terms)[:limit]
+    found = Review.objects.select_related('user').only(*CARD_FIELDS).in_bulk(ranked)
+    return [found[pk] for pk in ranked if pk in found]
+
+
+@receiver(post_save, sender=Review)
+def index_saved_review(sender, instance, **kwargs):
+    # Only the fallback index needs this; MySQL maintains FULLTEXT itself.
+    if uses_fulltext():
+        return
+    if _index is not None:
+        _index.add(instance.pk, instance.review_text)
+    transaction.on_commit(bump_index_version)
+
+
+@receiver(post_delete, sender=Review)
+def unindex_deleted_review(sender, instance, **kwargs):
+    if uses_fulltext():
+        return
+    if _index is not None:
+        _index.remove(instance.pk)
+    transaction.on_commit(bump_index_version)
@@ -0,0 +1,225 @@
+"""
+Customer feedback listing, paged with a keyset cursor.
+
+Reviews are read newest first in pages of ``PAGE_SIZE``. Instead of an
+OFFSET, each page carries an opaque cursor holding the (submission_date, id)
+of its last row and the next page starts strictly after it, so every page is
+an index range scan on ``review_date_id_idx`` and costs the same whether the
+table holds a hundred reviews or a million.
+
+The dashboard's count, average and rating histogram come from the single
+ReviewStats row, which the signal handlers below adjust by one review at a
+time (a single UPDATE, in the same transaction as the review change).
+
+Rendered review cards and the whole first page of the feed are cached under
+keys that include a version number. Saving or deleting any review, or
+saving a user other than just their last login (the cards show usernames),
+bumps the version once its transaction commits, so stale HTML is never
+served and nothing has to be deleted: old keys simply age out of the cache. That holds
+when the default cache is shared by every process; with per-process caches
+the bump is only seen by the worker that made it, and the others serve their
+copy until ``REVIEW_CACHE_TIMEOUT`` (seconds in that case) runs out.
+"""
+
+import base64
+import binascii
+import datetime
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .models import Review, ReviewStats
+
+
+RATINGS = range(1, 6)
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Columns the review cards actually show.
+CARD_FIELDS = ('id', 'rating', 'review_text', 'submission_date', 'user__username')
+
+
+VERSION_KEY = 'reviews:version'
+
+CARD_TEMPLATE = 'myapp/includes/_review_card.html'
+FEED_TEMPLATE = 'myapp/includes/_reviews_feed.html'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(review):
+    raw = f'{review.submission_date.isoformat()}|{review.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        submitted, pk = raw.rsplit('|', 1)
+        return datetime.datetime.fromisoformat(submitted), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(f'Invalid cursor "{cursor}".')
+
+
+def after_cursor(queryset, cursor):
+    """Reviews that come after ``cursor`` in newest-first (submission_date, id) order."""
+    submitted, pk = decode_cursor(cursor)
+    return queryset.filter(Q(submission_date__lt=submitted) | Q(submission_date=submitted, id__lt=pk))
+
+
+def review_page(cursor=None, limit=PAGE_SIZE):
+    """
+    Return (reviews, next_cursor) for the page after ``cursor``; next_cursor
+    is None on the last page. Raises InvalidCursor for a malformed cursor.
+    """
+    reviews = (
+        Review.objects.select_related('user').only(*CARD_FIELDS)
+        .order_by('-submission_date', '-id')
+    )
+    if cursor:
+        reviews = after_cursor(reviews, cursor)
+    # One extra row tells us whether another page follows without a COUNT.
+    page = list(reviews[:limit + 1])
+    if len(page) > limit:
+        return page[:limit], encode_cursor(page[limit - 1])
+    return page, None
+
+
+# --- Rendered review cache ---
+
+def cache_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock rather than 1, so a version lost to eviction can
+        # never come back and match keys cached before it was lost.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_cache_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def render_cards(page, version=None):
+    """Return the card HTML for each review in ``page``, rendering only cache misses."""
+    version = cache_version() if version is None else version
+    keys = {review.pk: f'reviews:card:{version}:{review.pk}' for review in page}
+    cached = cache.get_many(keys.values())
+    missing = {}
+    cards = []
+    for review in page:
+        card = cached.get(keys[review.pk])
+        if card is None:
+            card = missing[keys[review.pk]] = render_to_string(CARD_TEMPLATE, {'review': review})
+        cards.append(mark_safe(card))
+    if missing:
+        cache.set_many(missing, settings.REVIEW_CACHE_TIMEOUT)
+    return cards
+
+
+def render_feed(cursor=None):
+    """
+    HTML for the stats card, one page of review cards and the "load more"
+    sentinel. The first page, which nearly every visit asks for, is cached
+    whole. Raises InvalidCursor for a malformed cursor.
+    """
+    version = cache_version()
+    key = f'reviews:first-page:{version}'
+    if not cursor:
+        feed = cache.get(key)
+        if feed is not None:
+            return mark_safe(feed)
+    page, next_cursor = review_page(cursor)
+    stats = review_stats()
+    feed = render_to_string(FEED_TEMPLATE, {
+        'cards': render_cards(page, version),
+        'next_cursor': next_cursor,
+        'total_reviews': stats.review_count,
+        'average_rating': stats.average_rating,
+        'rating_histogram': sorted(stats.histogram.items(), reverse=True),
+    })
+    if not cursor:
+        cache.set(key, feed, settings.REVIEW_CACHE_TIMEOUT)
+    return mark_safe(feed)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_rendered_reviews(sender, **kwargs):
+    # After commit, or a request could re-cache the old rows under the new version.
+    transaction.on_commit(bump_cache_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_authors(sender, update_fields=None, **kwargs):
+    # Cards show the author's username; a login only saves last_login and changes no card.
+    if update_fields is None or 'username' in update_fields:
+        transaction.on_commit(bump_cache_version)
+
+
+# --- Review statistics ---
+
+def review_stats():
+    stats = ReviewStats.objects.filter(pk=1).first()
+    return stats if stats is not None else rebuild_stats()
+
+
+def rebuild_stats():
+    """Recount the stats row from the Review table (one aggregate query)."""
+    totals = Review.objects.aggregate(
+        review_count=Count('id'),
+        rating_sum=Sum('rating', default=0),
+        **{f'rating_{rating}': Count('id', filter=Q(rating=rating)) for rating in RATINGS},
+    )
+    stats, _ = ReviewStats.objects.update_or_create(pk=1, defaults={**totals, 'rebuilt_at': timezone.now()})
+    return stats
+
+
+def adjust_stats(rating, delta):
+    updated = ReviewStats.objects.filter(pk=1).update(
+        review_count=F('review_count') + delta,
+        rating_sum=F('rating_sum') + delta * rating,
+        **{f'rating_{rating}': F(f'rating_{rating}') + delta},
+    )
+    if not updated:
+        # No stats row yet: count everything, including the change that brought us here.
+        rebuild_stats()
+
+
+@receiver(pre_save, sender=Review)
+def remember_stored_rating(sender, instance, **kwargs):
+    # Edits (e.g. in the admin) move a review between histogram buckets.
+    if not instance._state.adding:
+        instance._stored_rating = Review.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, **kwargs):
+    rating = int(instance.rating)
+    if created:
+        adjust_stats(rating, 1)
+        return
+    stored = getattr(instance, '_stored_rating', None)
+    if stored is not None and stored != rating:
+        adjust_stats(stored, -1)
+        adjust_stats(rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    adjust_stats(int(instance.rating), -1)
@@ -0,0 +1,142 @@
+"""
+Diagnoses of earlier scans, found by perceptual hash so that a repeated or
+near-identical upload skips feature extraction and the model.
+
+The key is scanner.fingerprint, a 64-bit dHash of the downscaled image: a
+re-upload of the same photo, re-compressed or resized by the phone, lands
+within ``MAX_DISTANCE`` bits of the original. Lookups go through two tiers:
+
+- a bounded in-process LRU of the last ``SCAN_CACHE_SIZE`` diagnoses,
+  checked exactly and then by Hamming distance;
+- the ScanResult table, shared by every worker and kept across restarts.
+  Candidates come from the four 16-bit band indexes (any hash within 3 bits
+  matches one band exactly) and are then checked by distance.
+
+Both tiers are keyed by the engine's model version as well, so a retrained
+model never serves its predecessor's answers. ``stats()`` reports the hit
+rate per tier.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+from .models import ScanResult
+from .scanner import Diagnosis
+
+
+BANDS = 4
+BAND_BITS = 16
+
+# Bits two fingerprints may differ by and still be the same photo. Must stay below
+# BANDS so that a near-duplicate always shares a band with the stored hash.
+MAX_DISTANCE = BANDS - 1
+
+
+def bands(fingerprint):
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (BAND_BITS * band)) & mask for band in range(BANDS)]
+
+
+def distance(a, b):
+    return (a ^ b).bit_count()
+
+
+class ScanResultCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (model version, fingerprint) -> Diagnosis
+        self.hits = 0
+        self.near_hits = 0
+        self.stored_hits = 0
+        self.misses = 0
+
+    def lookup(self, version, fingerprint):
+        """A diagnosis made for this photo or one within MAX_DISTANCE bits of it, or None."""
+        with self._lock:
+            key = (version, fingerprint)
+            diagnosis = self._entries.get(key)
+            if diagnosis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return diagnosis
+            for (cached_version, cached), diagnosis in reversed(self._entries.items()):
+                if cached_version == version and distance(cached, fingerprint) <= MAX_DISTANCE:
+                    self._entries.move_to_end((cached_version, cached))
+                    self.near_hits += 1
+                    return diagnosis
+
+        diagnosis = self._lookup_stored(version, fingerprint)
+        with self._lock:
+            if diagnosis is None:
+                self.misses += 1
+                return None
+            self.stored_hits += 1
+            self._remember((version, fingerprint), diagnosis)
+        return diagnosis
+
+    def _lookup_stored(self, version, fingerprint):
+        candidates = Q()
+        for band, value in enumerate(bands(fingerprint)):
+            candidates |= Q(**{f'band_{band}': value})
+        rows = ScanResult.objects.filter(candidates, model_version=version).only(
+            'fingerprint', 'label', 'confidence', 'scores',
+        )
+        best = None
+        for row in rows:
+            bits = distance(int(row.fingerprint, 16), fingerprint)
+            if bits <= MAX_DISTANCE and (best is None or bits < best[0]):
+                best = (bits, row)
+        if best is None:
+            return None
+        row = best[1]
+        ScanResult.objects.filter(pk=row.pk).update(hits=F('hits') + 1)
+        return Diagnosis(label=row.label, confidence=row.confidence, scores=row.scores)
+
+    def store(self, version, fingerprint, diagnosis):
+        with self._lock:
+            self._remember((version, fingerprint), diagnosis)
+        try:
+            with transaction.atomic():
+                ScanResult.objects.create(
+                    model_version=version,
+                    fingerprint=f'{fingerprint:016x}',
+                    **{f'band_{band}': value for band, value in enumerate(bands(fingerprint))},
+                    label=diagnosis.label,
+                    confidence=diagnosis.confidence,
+                    scores=diagnosis.scores,
+                )
+        except IntegrityError:
+            # Another worker scanned the same photo at the same time; its row will do.
+            pass
+
+    def _remember(self, key, diagnosis):
+        # Caller holds the lock.
+        self._entries[key] = diagnosis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.stored_hits + self.misses
+            return {
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'stored_hits': self.stored_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': round((self.hits + self.near_hits + self.stored_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.near_hits = self.stored_hits = self.misses = 0
+
+
+result_cache = ScanResultCache(max_entries=settings.SCAN_CACHE_SIZE)
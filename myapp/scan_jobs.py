@@ -0,0 +1,187 @@
+"""
+Queue of plant disease scans in the ScanJob table, worked by
+``manage.py run_scan_workers``.
+
+/api/scan-image/ stores the upload as a queued job and answers straight
+away with its id. The phone then polls /api/scan-jobs/<id>/, so a scan that
+takes longer than a flaky connection stays up is not lost, and no web
+worker spends CPU on it.
+
+Workers claim the oldest queued job with SELECT ... FOR UPDATE SKIP LOCKED
+(MySQL 8, PostgreSQL). Concurrent workers step over rows another worker has
+locked instead of waiting on them, so more worker processes, on this host
+or any other with the database, mean more throughput without a broker. The
+claim itself is a conditional UPDATE from the state that was read, which
+keeps it exclusive on backends without row locks too (SQLite in
+development).
+
+A worker cuts a scan step off after ``SCAN_TIMEOUT`` seconds (SIGALRM). A
+job still marked running ``SCAN_JOB_LEASE`` seconds after it was claimed
+belongs to a worker that died, and is claimed again up to MAX_ATTEMPTS
+times before it is failed.
+"""
+
+import datetime
+import io
+import logging
+import signal
+import threading
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import scanner
+from .models import ScanJob
+from .scan_cache import result_cache
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+RETRY_AFTER_SECONDS = 5
+
+# Finished jobs are deleted by idle workers at most this often (seconds).
+PURGE_INTERVAL = 3600
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ScanTimeout(Exception):
+    pass
+
+
+# --- Web side ---
+
+def enqueue(data):
+    """Queue the upload's bytes for scanning; refused when SCAN_QUEUE_LIMIT jobs are already waiting."""
+    if ScanJob.objects.filter(status=ScanJob.QUEUED).count() >= settings.SCAN_QUEUE_LIMIT:
+        raise QueueFull('The scanner is busy.')
+    return ScanJob.objects.create(image=data)
+
+
+def job_status(job):
+    body = {'job_id': str(job.token), 'status': job.status}
+    if job.status == ScanJob.DONE:
+        body['result'] = job.result
+    elif job.status == ScanJob.FAILED:
+        body['error'] = job.error
+    return body
+
+
+# --- Worker side ---
+
+def claim(worker):
+    """Mark the next job as running by ``worker`` and return it, or None if there is nothing to do."""
+    while True:
+        now = timezone.now()
+        expired = now - datetime.timedelta(seconds=settings.SCAN_JOB_LEASE)
+        # Without row locks (SQLite) a transaction adds nothing but a read-to-write lock upgrade
+        # that fails at once under contention; the conditional UPDATE alone keeps the claim exclusive.
+        with transaction.atomic() if connection.features.has_select_for_update else nullcontext():
+            job = (
+                ScanJob.objects.select_for_update(skip_locked=True)
+                .filter(Q(status=ScanJob.QUEUED) | Q(status=ScanJob.RUNNING, started_at__lt=expired))
+                .order_by('id')
+                .first()
+            )
+            if job is None:
+                return None
+            claimable = ScanJob.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts)
+            if job.attempts >= MAX_ATTEMPTS:
+                claimable.update(status=ScanJob.FAILED, error='The scan could not be completed', image=b'', finished_at=now)
+                continue
+            if not claimable.update(status=ScanJob.RUNNING, started_at=now, attempts=F('attempts') + 1, worker=worker):
+                # Taken by another worker between our read and our write (backends without row locks).
+                continue
+        job.status, job.started_at, job.attempts, job.worker = ScanJob.RUNNING, now, job.attempts + 1, worker
+        return job
+
+
+def _timed_out(signum, frame):
+    raise ScanTimeout('The scan took too long.')
+
+
+def with_timeout(step, argument, timeout):
+    # Worker processes only: SIGALRM interrupts the main thread.
+    previous = signal.signal(signal.SIGALRM, _timed_out)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return step(argument)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run(job):
+    """Scan a claimed job and record the result. The model only runs if the result cache has no match."""
+    cached = False
+    try:
+        pixels = with_timeout(scanner.load_image, io.BytesIO(job.image), settings.SCAN_TIMEOUT)
+        fingerprint = scanner.fingerprint(pixels)
+        version = scanner.get_engine().version
+        diagnosis = result_cache.lookup(version, fingerprint)
+        cached = diagnosis is not None
+        if not cached:
+            diagnosis = with_timeout(scanner.classify, pixels, settings.SCAN_TIMEOUT)
+            result_cache.store(version, fingerprint, diagnosis)
+    except ScanTimeout:
+        return finish(job, ScanJob.FAILED, error='The image took too long to scan')
+    except scanner.InvalidImage:
+        return finish(job, ScanJob.FAILED, error='Could not read the uploaded image')
+    except Exception:
+        logger.exception('Scan job %s failed', job.token)
+        return finish(job, ScanJob.FAILED, error='The scan failed')
+    return finish(job, ScanJob.DONE, result=diagnosis.as_response(), cached=cached)
+
+
+def finish(job, status, result=None, error='', cached=False):
+    # Only if the job is still ours: after a lease expiry another worker may have reclaimed it.
+    ScanJob.objects.filter(pk=job.pk, status=ScanJob.RUNNING, attempts=job.attempts).update(
+        status=status, result=result, error=error, cached=cached, image=b'', finished_at=timezone.now(),
+    )
+    job.status, job.result, job.error, job.cached = status, result, error, cached
+    return job
+
+
+def purge_finished():
+    cutoff = timezone.now() - datetime.timedelta(days=settings.SCAN_JOB_RETENTION_DAYS)
+    deleted, _ = ScanJob.objects.filter(finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def work(worker, stop):
+    """Claim and run jobs until ``stop`` (a threading.Event) is set, polling while the queue is empty."""
+    scanner.get_engine()
+    last_purge = None
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            job = claim(worker)
+            if job is not None:
+                run(job)
+                continue
+        except DatabaseError:
+            # Lock timeout, deadlock or lost connection: reconnect and try again shortly.
+            logger.warning('Scan worker %s hit a database error', worker, exc_info=True)
+            connection.close()
+            stop.wait(settings.SCAN_WORKER_POLL)
+            continue
+        if last_purge is None or time.monotonic() - last_purge > PURGE_INTERVAL:
+            purge_finished()
+            last_purge = time.monotonic()
+        stop.wait(settings.SCAN_WORKER_POLL)
+
+
+def stop_on_signals():
+    """An Event set by SIGTERM or SIGINT, so the current scan finishes before the worker exits."""
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: stop.set())
+    return stop
@@ -0,0 +1,223 @@
+"""
+Plant disease scanner behind /api/scan-image/.
+
+An upload is decoded straight from the uploaded file object, at reduced
+scale where the format allows it (JPEG draft mode), and downscaled to at
+most ``SCAN_IMAGE_SIZE`` pixels a side. ``extract_features`` turns the RGB
+array into a short vector with whole-array NumPy operations only: colour
+fractions for healthy tissue and typical symptoms (brown lesions, white
+powdery growth, yellow halos, dark spots), HSV histograms and texture
+statistics (gradient energy, blockwise contrast). The engine named by
+``SCAN_ENGINE`` scores that vector; the default is a linear (softmax) model
+read from the JSON file at ``SCAN_MODEL_PATH`` once per process.
+Another engine is any class built from the model path that has a
+``version`` string and ``predict(features)`` returning a Diagnosis.
+
+``manage.py train_scan_model`` fits a replacement model from a folder of
+labelled leaf photos.
+"""
+
+import functools
+import hashlib
+import json
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+from PIL import Image, UnidentifiedImageError
+
+
+# Decompression-bomb guard: refuse anything beyond a large phone photo.
+Image.MAX_IMAGE_PIXELS = 50_000_000
+
+FEATURE_NAMES = (
+    ['green_fraction', 'brown_fraction', 'white_fraction', 'yellow_fraction', 'dark_fraction',
+     'gradient_mean', 'gradient_std', 'edge_fraction', 'block_contrast_mean', 'block_contrast_std']
+    + [f'hue_{i}' for i in range(12)]
+    + [f'saturation_{i}' for i in range(4)]
+    + [f'value_{i}' for i in range(4)]
+)
+
+BLOCK = 8
+
+# dHash grid: HASH_SIZE rows of HASH_SIZE + 1 cells give a 64-bit fingerprint.
+HASH_SIZE = 8
+
+DISEASES = {
+    'healthy': {'name': 'Healthy Leaf', 'description': 'No common disease symptoms were found on this leaf.', 'treatments': ['No treatment needed', 'Keep monitoring the crop weekly'], 'pesticides': [], 'prevention': ['Maintain balanced fertilization', 'Water at soil level', 'Keep the field free of weeds and crop debris']},
+    'leaf_blight': {'name': 'Leaf Blight', 'description': 'Fungal disease causing brown spots on leaves, leading to premature leaf death and reduced yield.', 'treatments': ['Remove affected leaves immediately', 'Improve air circulation around plants', 'Apply copper-based fungicide', 'Reduce overhead watering'], 'pesticides': [{'name': 'Mancozeb 75% WP', 'dosage': '2g per liter water', 'frequency': 'Every 10-15 days'}, {'name': 'Copper Oxychloride', 'dosage': '3g per liter water', 'frequency': 'Bi-weekly'}], 'prevention': ['Plant resistant varieties', 'Maintain proper plant spacing', 'Avoid overhead irrigation', 'Remove crop debris after harvest']},
+    'powdery_mildew': {'name': 'Powdery Mildew', 'description': 'White powdery fungal growth on leaves and stems, reducing photosynthesis and plant vigor.', 'treatments': ['Spray with baking soda solution', 'Apply sulfur-based fungicide', 'Increase air circulation', 'Remove infected plant parts'], 'pesticides': [{'name': 'Sulfur 80% WP', 'dosage': '2.5g per liter water', 'frequency': 'Weekly during infection'}, {'name': 'Propiconazole', 'dosage': '1ml per liter water', 'frequency': 'Every 15 days'}], 'prevention': ['Avoid overcrowding plants', 'Water at soil level', 'Choose resistant varieties', 'Maintain proper humidity levels']},
+    'bacterial_spot': {'name': 'Bacterial Spot', 'description': 'Bacterial infection causing dark spots with yellow halos on leaves and fruits.', 'treatments': ['Apply copper-based bactericide', 'Remove infected plant material', 'Improve drainage', 'Use drip irrigation'], 'pesticides': [{'name': 'Streptomycin', 'dosage': '0.5g per liter water', 'frequency': 'Every 7-10 days'}, {'name': 'Copper Hydroxide', 'dosage': '2g per liter water', 'frequency': 'Bi-weekly'}], 'prevention': ['Use certified disease-free seeds', 'Avoid working with wet plants', 'Rotate crops annually', 'Disinfect tools regularly']},
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+class ImageTooLarge(InvalidImage):
+    pass
+
+
+@dataclass(frozen=True)
+class Diagnosis:
+    label: str
+    confidence: float
+    scores: dict
+
+    def as_response(self):
+        disease = DISEASES[self.label]
+        return {
+            'success': True,
+            'disease_type': disease['name'],
+            'description': disease['description'],
+            'confidence': f"{round(self.confidence * 100)}%",
+            'treatments': disease['treatments'],
+            'pesticide_recommendations': disease['pesticides'],
+            'prevention_tips': disease['prevention'],
+        }
+
+
+# --- Image decoding and features ---
+
+def check_size(upload):
+    if getattr(upload, 'size', 0) > settings.SCAN_MAX_UPLOAD_BYTES:
+        raise ImageTooLarge(f'Uploads are limited to {settings.SCAN_MAX_UPLOAD_BYTES // (1024 * 1024)} MB.')
+
+
+def read_upload(upload):
+    """The uploaded file's bytes, for handing to a scan worker; refused before reading if too large."""
+    check_size(upload)
+    return b''.join(upload.chunks())
+
+
+def load_image(fileobj, size=None):
+    """Decode an image file object into a uint8 RGB array at most ``size`` pixels a side."""
+    size = size or settings.SCAN_IMAGE_SIZE
+    check_size(fileobj)
+    try:
+        with Image.open(fileobj) as image:
+            # JPEG: let the decoder skip detail we would throw away (decodes at 1/2..1/8 scale).
+            image.draft('RGB', (size, size))
+            image = image.convert('RGB')
+            image.thumbnail((size, size), Image.Resampling.BILINEAR)
+            return np.asarray(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise InvalidImage(f'Could not read the uploaded image: {exc}')
+
+
+def fingerprint(pixels):
+    """
+    64-bit difference hash (dHash): whether each cell of an 8x9 grayscale
+    thumbnail is brighter than its right-hand neighbour. Re-encoding, resizing
+    and small exposure changes flip few if any bits.
+    """
+    thumbnail = Image.fromarray(pixels).convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    cells = np.asarray(thumbnail, dtype=np.int16)
+    return int.from_bytes(np.packbits(cells[:, 1:] > cells[:, :-1]).tobytes(), 'big')
+
+
+def rgb_to_hsv(rgb):
+    """Vectorized RGB (floats in 0..1) -> HSV planes, hue in 0..1."""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    value = rgb.max(axis=-1)
+    delta = value - rgb.min(axis=-1)
+    saturation = np.divide(delta, value, out=np.zeros_like(value), where=value > 0)
+    safe_delta = np.where(delta > 0, delta, 1)
+    hue = np.select(
+        [value == r, value == g],
+        [(g - b) / safe_delta, 2 + (b - r) / safe_delta],
+        4 + (r - g) / safe_delta,
+    )
+    hue = np.where(delta > 0, (hue / 6) % 1.0, 0)
+    return hue, saturation, value
+
+
+def extract_features(pixels):
+    rgb = pixels.astype(np.float32) / 255
+    hue, saturation, value = rgb_to_hsv(rgb)
+    degrees = hue * 360
+    coloured = saturation > 0.2
+
+    green = coloured & (degrees >= 65) & (degrees < 170) & (value > 0.15)
+    brown = (saturation > 0.3) & (degrees >= 10) & (degrees < 40) & (value > 0.12) & (value < 0.7)
+    white = (saturation < 0.15) & (value > 0.75)
+    yellow = (saturation > 0.4) & (degrees >= 40) & (degrees < 65) & (value > 0.5)
+    dark = value < 0.18
+
+    gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    gx = np.abs(np.diff(gray, axis=1))[:-1, :]
+    gy = np.abs(np.diff(gray, axis=0))[:, :-1]
+    gradient = gx + gy
+
+    height, width = (gray.shape[0] // BLOCK) * BLOCK, (gray.shape[1] // BLOCK) * BLOCK
+    if height and width:
+        blocks = gray[:height, :width].reshape(height // BLOCK, BLOCK, width // BLOCK, BLOCK).std(axis=(1, 3))
+        block_mean, block_std = blocks.mean(), blocks.std()
+    else:
+        block_mean = block_std = 0.0
+
+    pixels_count = float(gray.size)
+    hue_hist = np.bincount(np.minimum((hue[coloured] * 12).astype(np.int32), 11), minlength=12) / pixels_count
+    sat_hist = np.bincount(np.minimum((saturation * 4).astype(np.int32), 3).ravel(), minlength=4) / pixels_count
+    val_hist = np.bincount(np.minimum((value * 4).astype(np.int32), 3).ravel(), minlength=4) / pixels_count
+
+    return np.concatenate([
+        [green.mean(), brown.mean(), white.mean(), yellow.mean(), dark.mean(),
+         gradient.mean() if gradient.size else 0.0, gradient.std() if gradient.size else 0.0,
+         (gradient > 0.15).mean() if gradient.size else 0.0, block_mean, block_std],
+        hue_hist, sat_hist, val_hist,
+    ]).astype(np.float32)
+
+
+# --- Engines ---
+
+class LinearModelEngine:
+    """
+    Softmax over a linear model of standardized features, read from a JSON
+    file holding ``classes``, ``features``, ``mean``, ``scale``, ``weights``
+    (one row per class) and ``bias``.
+    """
+
+    def __init__(self, model_path):
+        with open(model_path, 'rb') as model_file:
+            raw = model_file.read()
+        model = json.loads(raw)
+        # Cached diagnoses are only reused by the model that made them.
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        if model['features'] != FEATURE_NAMES:
+            raise ValueError(f'{model_path} was trained on different features; retrain it with train_scan_model.')
+        unknown = set(model['classes']) - set(DISEASES)
+        if unknown:
+            raise ValueError(f'{model_path} predicts unknown classes: {", ".join(sorted(unknown))}')
+        self.classes = model['classes']
+        self.mean = np.asarray(model['mean'], dtype=np.float32)
+        self.scale = np.asarray(model['scale'], dtype=np.float32)
+        self.weights = np.asarray(model['weights'], dtype=np.float32)
+        self.bias = np.asarray(model['bias'], dtype=np.float32)
+
+    def predict(self, features):
+        logits = self.weights @ ((features - self.mean) / self.scale) + self.bias
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return Diagnosis(
+            label=self.classes[best],
+            confidence=float(probabilities[best]),
+            scores={label: round(float(p), 4) for label, p in zip(self.classes, probabilities)},
+        )
+
+
+@functools.cache
+def get_engine():
+    # Loaded once per process (web worker or scan worker) and reused for every scan.
+    return import_string(settings.SCAN_ENGINE)(settings.SCAN_MODEL_PATH)
+
+
+def classify(pixels):
+    return get_engine().predict(extract_features(pixels))
+
+
+def diagnose(fileobj):
+    return classify(load_image(fileobj))
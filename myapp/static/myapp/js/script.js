@@ -207,8 +207,47 @@ async function updateMarketPrices() {
     if (!cerealPrices) return;
     try {
         const response = await fetch('/api/market-prices/');
-        const marketData = await response.json();
+        renderMarketPrices(await response.json());
+    } catch (error) {
+        console.error('Market API error:', error);
+    }
+}
+
+// Live updates: the server sends a full snapshot on connect, then only the commodities that changed.
+// The stream is only served under ASGI; when it is missing or closes, the page goes back to polling.
+let marketPriceData = null;
+
+function streamMarketPrices() {
+    if (!document.getElementById('cerealPrices') || !window.EventSource) return false;
+    const source = new EventSource('/api/market-prices/stream/');
+    source.onerror = () => {
+        // EventSource retries a dropped stream by itself; give up if it never connected or was closed for good.
+        if (marketPriceData && source.readyState !== EventSource.CLOSED) return;
+        source.close();
+        marketPriceData = null;
+        updateMarketPrices();
+    };
+    source.addEventListener('snapshot', event => {
+        marketPriceData = JSON.parse(event.data);
+        renderMarketPrices(marketPriceData);
+    });
+    source.addEventListener('prices', event => {
+        if (!marketPriceData) return;
+        const changes = JSON.parse(event.data);
+        Object.entries(changes).forEach(([section, items]) => {
+            const current = marketPriceData[section] || (marketPriceData[section] = []);
+            items.forEach(item => {
+                const index = current.findIndex(crop => crop.name === item.name);
+                if (index >= 0) current[index] = item; else current.push(item);
+            });
+        });
+        renderMarketPrices(marketPriceData);
+    });
+    return true;
+}
 
+function renderMarketPrices(marketData) {
+    try {
         updatePriceSection('cerealPrices', marketData.cereals);
         updatePriceSection('vegetablePrices', marketData.vegetables);
         updatePriceSection('pulsesPrices', marketData.pulses);
@@ -253,7 +292,7 @@ async function updateMarketPrices() {
         }
 
     } catch (error) {
-        console.error('Market API error:', error);
+        console.error('Market render error:', error);
     }
 }
 
@@ -284,6 +323,42 @@ if (refreshPrices) {
 }
 
 
+// --- Feedback Dashboard (Infinite Scroll) ---
+
+/**
+ * Appends the next page of review cards whenever the sentinel below the list
+ * scrolls into view. Pages are fetched by cursor from /api/reviews/.
+ */
+function loadReviewsOnScroll() {
+    const sentinel = document.getElementById('reviewsSentinel');
+    const cards = document.getElementById('reviewCards');
+    if (!sentinel || !cards || !window.IntersectionObserver) return;
+    let loading = false;
+    const observer = new IntersectionObserver(async entries => {
+        if (loading || !entries.some(entry => entry.isIntersecting)) return;
+        loading = true;
+        try {
+            const cursor = encodeURIComponent(sentinel.dataset.nextCursor);
+            const response = await fetch(`/api/reviews/?cursor=${cursor}`);
+            const page = await response.json();
+            cards.insertAdjacentHTML('beforeend', page.reviews.map(review => review.html).join(''));
+            if (page.next_cursor) {
+                sentinel.dataset.nextCursor = page.next_cursor;
+                sentinel.querySelector('a').href = `?cursor=${page.next_cursor}`;
+            } else {
+                observer.disconnect();
+                sentinel.remove();
+            }
+        } catch (error) {
+            console.error('Reviews API error:', error);
+        } finally {
+            loading = false;
+        }
+    }, { rootMargin: '400px' });
+    observer.observe(sentinel);
+}
+
+
 // --- Crops, Scanner, and Form Submission Logic (APIs) ---
 
 document.querySelectorAll('.crop-card').forEach(card => {
@@ -411,10 +486,13 @@ if (startScan && imageUpload) {
                 method: 'POST',
                 body: formData,
             });
-            const data = await response.json();
+            const queued = await response.json();
+            // The scan runs in the background; poll its job until it has finished.
+            const job = response.status === 202 ? await waitForScanJob(queued.status_url) : queued;
 
             if (scanLine) scanLine.classList.add('hidden');
-            if (data.success) {
+            if (job.status === 'done') {
+                const data = job.result;
                 document.getElementById('diseaseType').textContent = data.disease_type;
                 document.getElementById('diseaseDescription').textContent = data.description;
                 document.getElementById('confidence').textContent = data.confidence;
@@ -443,7 +521,7 @@ if (startScan && imageUpload) {
                     speakText(`Disease detected: ${data.disease_type} with ${data.confidence} confidence. Check the detailed treatment recommendations.`);
                 }
             } else {
-                alert(data.error);
+                alert(job.error);
             }
         } catch (error) {
             console.error('Scan API error:', error);
@@ -452,6 +530,26 @@ if (startScan && imageUpload) {
         }
     });
 }
+
+// Polls a scan job until it is done or failed. A failed poll (dropped connection) is
+// simply retried on the next tick, so a flaky network only delays the result.
+async function waitForScanJob(statusUrl, timeoutMs = 120000) {
+    const deadline = Date.now() + timeoutMs;
+    let delay = 500;
+    while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, delay));
+        delay = Math.min(delay * 1.5, 3000);
+        try {
+            const response = await fetch(statusUrl);
+            const job = await response.json();
+            if (response.status === 404) return { status: 'failed', error: job.error };
+            if (job.status === 'done' || job.status === 'failed') return job;
+        } catch (error) {
+            console.warn('Scan status poll failed, retrying:', error);
+        }
+    }
+    return { status: 'failed', error: 'The scan is taking longer than expected. Please try again.' };
+}
 const captureImage = document.getElementById('captureImage');
 if (captureImage) {
     captureImage.addEventListener('click', () => {
@@ -539,7 +637,9 @@ if (dbtForm) {
             });
             const data = await response.json();
 
-            if (data.success) {
+            if (data.success && data.account_matches === false) {
+                result.className = 'mt-6 p-4 rounded-lg bg-yellow-50';
+            } else if (data.success) {
                 result.className = 'mt-6 p-4 rounded-lg bg-green-50';
             } else {
                 result.className = 'mt-6 p-4 rounded-lg bg-red-50';
@@ -713,7 +813,7 @@ if (quickHelp) {
 
 // Initializers
 setInterval(updateWeather, 300000);
-setInterval(updateMarketPrices, 600000);
+setInterval(() => { if (!marketPriceData) updateMarketPrices(); }, 600000);
 
 
 // --- Organic Menu Logic ---
@@ -0,0 +1,27 @@
+"""
+Helpers shared by the streamed text responses (review export, bulk DBT
+check): a csv.writer target that returns each formatted line instead of
+writing it, and batching of lines into UTF-8 chunks so a response isn't
+handed to the server one line at a time.
+"""
+
+
+# Lines per chunk handed to the server.
+ROWS_PER_WRITE = 200
+
+
+class Echo:
+    # csv.writer target that hands each formatted line straight back.
+    def write(self, value):
+        return value
+
+
+def batched(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
@@ -0,0 +1,28 @@
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+
+from myapp.admin_changelist import DateProbe
+
+register = template.Library()
+
+
+class ProbedChangeList:
+    # The changelist as the stock date_hierarchy tag sees it, with DateProbe in place of its queryset.
+    def __init__(self, cl):
+        self._cl = cl
+        self.queryset = DateProbe(cl.queryset)
+
+    def __getattr__(self, name):
+        return getattr(self._cl, name)
+
+
+def probed_date_hierarchy(cl):
+    return date_hierarchy(ProbedChangeList(cl))
+
+
+@register.tag(name='probed_date_hierarchy')
+def probed_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser, token, func=probed_date_hierarchy, template_name='date_hierarchy.html', takes_context=False,
+    )
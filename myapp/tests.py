@@ -1,3 +1,1560 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import importlib
+import io
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import requests
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image, ImageDraw
+
+from . import auth_cache, crop_catalog, crop_search, dbt, dbt_bulk, market, page_cache, price_stream, registrations, review_export, review_search, reviews, scan_cache, scan_jobs, scanner, upstream, views, weather
+from .models import Commodity, DBTLinkage, FarmerRegistration, LatestPrice, Mandi, PriceObservation, Review, ReviewStats, ScanJob, ScanResult
+
+
+class CropDetailsTests(SimpleTestCase):
+    def test_details_are_served_from_the_catalog(self):
+        response = self.client.get('/api/crop-details/wheat/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(response.content)
+        self.assertEqual(list(data), list(crop_catalog.CROP_FIELDS))
+        self.assertEqual(data, dict(crop_catalog.CATALOG['wheat'].details))
+
+    def test_unknown_crop_returns_404(self):
+        response = self.client.get('/api/crop-details/quinoa/')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('"quinoa"', json.loads(response.content)['error'])
+
+    def test_entries_fill_missing_points_and_reject_unknown_ones(self):
+        entry = crop_catalog.build_entry('millet', {'varieties': 'HHB 67'})
+        self.assertEqual(entry.details['title'], 'Millet Details')
+        self.assertEqual(entry.details['soil_requirements'], crop_catalog.MISSING_VALUE)
+        self.assertEqual(json.loads(entry.json), dict(entry.details))
+        # The entry's own fields come first and a missing title last, as the API has always sent them.
+        self.assertEqual(list(json.loads(entry.json))[0], 'varieties')
+        self.assertEqual(list(json.loads(entry.json))[-1], 'title')
+        with self.assertRaisesMessage(ValueError, 'unknown fields: yield'):
+            crop_catalog.build_entry('millet', {'yield': 'high'})
+
+
+class PestGuideTests(SimpleTestCase):
+    def test_guide_is_projected_from_the_crop_details(self):
+        details = crop_catalog.CATALOG['wheat'].details
+        data = json.loads(self.client.get('/api/get-pest-details/wheat/').content)
+        self.assertEqual(list(data), [
+            'title', 'identification', 'mixtures', 'application_process', 'safety_precautions', 'recommendations',
+        ])
+        self.assertEqual(data['title'], details['title'])
+        self.assertEqual(data['identification'], details['pests_affecting'] + ' Symptoms: ' + details['identity_context'])
+        self.assertEqual(data['mixtures'], details['pest_control_measures'])
+        self.assertTrue(data['safety_precautions'].endswith(' Always follow PHI and PPE rules.'))
+
+    def test_guide_for_an_incomplete_entry(self):
+        entry = crop_catalog.build_entry('millet', {'pests_affecting': 'Shoot fly.'})
+        guide = json.loads(entry.pest_json)
+        self.assertEqual(guide['title'], 'Millet Management')
+        self.assertEqual(guide['identification'], 'Shoot fly. Symptoms: Not specified.')
+        self.assertEqual(guide['mixtures'], crop_catalog.MISSING_VALUE)
+
+    def test_unknown_crop_returns_404(self):
+        self.assertEqual(self.client.get('/api/get-pest-details/quinoa/').status_code, 404)
+
+
+class CropBatchTests(SimpleTestCase):
+    def get(self, **params):
+        response = self.client.get('/api/crop-details/', params)
+        return response, b''.join(response.streaming_content)
+
+    def test_json_projects_the_requested_fields_and_lists_missing_crops(self):
+        response, body = self.get(names='wheat,quinoa,rice,wheat', fields='title,varieties')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(body)
+        self.assertEqual(list(data['crops']), ['wheat', 'rice'])
+        rice = crop_catalog.CATALOG['rice'].details
+        self.assertEqual(data['crops']['rice'], {'title': rice['title'], 'varieties': rice['varieties']})
+        self.assertEqual(data['missing'], ['quinoa'])
+
+    def test_ndjson_has_a_line_per_crop_and_an_error_line_for_a_missing_one(self):
+        response, body = self.get(names='quinoa,wheat', format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(lines, [
+            {'crop': 'quinoa', 'error': 'not found'},
+            {'crop': 'wheat', 'details': dict(crop_catalog.CATALOG['wheat'].details)},
+        ])
+
+    def test_bad_requests_are_rejected(self):
+        for params in (
+            {},
+            {'names': 'wheat', 'fields': 'varieties,yield'},
+            {'names': 'wheat', 'format': 'csv'},
+            {'names': ','.join(f'crop{i}' for i in range(views.CROP_BATCH_LIMIT + 1))},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/crop-details/', params).status_code, 400)
+
+
+class CropSearchTests(SimpleTestCase):
+    def crops(self, query):
+        return [result['crop'] for result in crop_search.INDEX.search(query)]
+
+    def test_crops_matching_every_term_rank_first(self):
+        # Wheat only mentions "rusts"; barley has the exact "rust" but not "wheat".
+        self.assertEqual(self.crops('wheat rust')[:2], ['wheat', 'barley'])
+
+    def test_exact_hits_outweigh_prefix_expansions(self):
+        expansions = dict(crop_search.INDEX.expand('rust'))
+        self.assertEqual(expansions['rust'], 1.0)
+        self.assertEqual(expansions['rusts'], crop_search.PREFIX_SIMILARITY)
+        self.assertLess(crop_search.PREFIX_SIMILARITY, 1.0)
+
+    def test_misspelled_terms_find_the_closest_crop(self):
+        self.assertEqual(self.crops('tomto'), ['tomato'])
+        self.assertEqual(self.crops('qqq'), [])
+
+    def test_snippets_are_escaped_around_the_highlight(self):
+        index = crop_search.CropSearchIndex(crop_catalog.build_catalog({
+            'millet': {'title': 'Millet <b>&</b> aphids', 'varieties': '<script>alert(1)</script>'},
+        }))
+        [result] = index.search('aphid')
+        self.assertEqual(result['field'], 'title')
+        self.assertEqual(result['snippet'], 'Millet &lt;b&gt;&amp;&lt;/b&gt; <mark>aphids</mark>')
+        self.assertNotIn('<script>', index.search('alert')[0]['snippet'])
+
+    def test_api_returns_ranked_results(self):
+        data = json.loads(self.client.get('/api/crops/search/', {'q': 'wheat rust', 'limit': 2}).content)
+        self.assertEqual([result['crop'] for result in data['results']], ['wheat', 'barley'])
+        self.assertIn('<mark>', data['results'][0]['snippet'])
+        self.assertEqual(self.client.get('/api/crops/search/').status_code, 400)
+        for limit in ('0', '-3', 'ten'):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get('/api/crops/search/', {'q': 'wheat', 'limit': limit}).status_code, 400)
+
+
+FORECAST = {
+    'current': {'temp': 31.4, 'humidity': 62, 'weather': [{'description': 'scattered clouds'}], 'wind_speed': 3.2, 'uvi': 7.1},
+    'daily': [
+        {'dt': 1760000000 + day * 86400, 'weather': [{'description': 'light rain'}], 'temp': {'max': 33.2, 'min': 24.8}, 'pop': 0.4}
+        for day in range(8)
+    ],
+}
+
+
+class StubUpstream:
+    """
+    Local HTTP/1.1 server standing in for an external API. It records every
+    request it gets and the client port it came from, and replays ``script``,
+    a list of (status, delay) steps, before falling back to status/delay.
+    """
+
+    def __init__(self, body=FORECAST, status=200, delay=0.0, script=()):
+        self.body = body
+        self.status = status
+        self.delay = delay
+        self.script = list(script)
+        self.requests = []
+        self.client_ports = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub.requests.append(parse_qs(urlparse(self.path).query))
+                stub.client_ports.append(self.client_address[1])
+                status, delay = stub.script.pop(0) if stub.script else (stub.status, stub.delay)
+                time.sleep(delay)
+                payload = json.dumps(stub.body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (timeout test); nothing left to answer.
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/onecall'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class UpstreamClientTests(SimpleTestCase):
+    def make_client(self, **kwargs):
+        options = {'timeout': (0.5, 0.2), 'max_retries': 2, 'backoff': 0.01, 'breaker_threshold': 3, 'breaker_cooldown': 60}
+        options.update(kwargs)
+        client = upstream.UpstreamClient(**options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_connections_are_reused(self):
+        client = self.make_client()
+        with StubUpstream() as stub:
+            for _ in range(5):
+                self.assertEqual(client.get(stub.url).status_code, 200)
+        self.assertEqual(len(set(stub.client_ports)), 1)
+
+    def test_transient_failures_are_retried(self):
+        client = self.make_client()
+        with StubUpstream(script=[(503, 0), (502, 0)]) as stub:
+            response = client.get(stub.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(stub.requests), 3)
+
+    def test_slow_upstream_hits_read_timeout(self):
+        client = self.make_client(max_retries=1)
+        with StubUpstream(delay=0.5) as stub:
+            started = time.monotonic()
+            with self.assertRaises(requests.exceptions.Timeout):
+                client.get(stub.url)
+            elapsed = time.monotonic() - started
+        self.assertEqual(len(stub.requests), 2)
+        self.assertLess(elapsed, 1.0)
+
+    def test_client_errors_are_not_retried(self):
+        client = self.make_client()
+        with StubUpstream(status=404) as stub:
+            self.assertEqual(client.get(stub.url).status_code, 404)
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_breaker_opens_and_fails_fast(self):
+        client = self.make_client(max_retries=0)
+        with StubUpstream(status=503) as stub:
+            for _ in range(3):
+                self.assertEqual(client.get(stub.url).status_code, 503)
+            with self.assertRaises(upstream.UpstreamUnavailable):
+                client.get(stub.url)
+        self.assertEqual(len(stub.requests), 3)
+
+    def test_breaker_probes_after_cooldown(self):
+        client = self.make_client(max_retries=0, breaker_threshold=1, breaker_cooldown=0.2)
+        with StubUpstream(script=[(503, 0), (503, 0)]) as stub:
+            client.get(stub.url)
+            with self.assertRaises(upstream.UpstreamUnavailable):
+                client.get(stub.url)
+            time.sleep(0.25)
+            # The probe fails, so the breaker opens again straight away.
+            self.assertEqual(client.get(stub.url).status_code, 503)
+            with self.assertRaises(upstream.UpstreamUnavailable):
+                client.get(stub.url)
+            time.sleep(0.25)
+            self.assertEqual(client.get(stub.url).status_code, 200)
+            self.assertEqual(client.get(stub.url).status_code, 200)
+        self.assertEqual(len(stub.requests), 4)
+
+    def test_any_failed_probe_reopens_the_breaker(self):
+        client = self.make_client(max_retries=0, breaker_threshold=1, breaker_cooldown=0.2)
+        with StubUpstream(script=[(503, 0)]) as stub:
+            client.get(stub.url)
+            time.sleep(0.25)
+            with mock.patch.object(client.session, 'request', side_effect=requests.exceptions.ChunkedEncodingError):
+                with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                    client.get(stub.url)
+            self.assertEqual(client.breaker(stub.url).state, upstream.CircuitBreaker.OPEN)
+            with self.assertRaises(upstream.UpstreamUnavailable):
+                client.get(stub.url)
+            time.sleep(0.25)
+            self.assertEqual(client.get(stub.url).status_code, 200)
+
+
+@override_settings(WEATHER_PREFETCH_CELLS=0)
+class WeatherCacheTests(SimpleTestCase):
+    def setUp(self):
+        weather.forecast_cache.clear()
+        upstream.get_client.cache_clear()
+        self.factory = RequestFactory()
+
+    def get_weather(self, lat, lon):
+        return views.get_weather(self.factory.get('/api/weather/', {'lat': lat, 'lon': lon}))
+
+    def test_nearby_coordinates_share_one_upstream_call(self):
+        with StubUpstream() as stub, override_settings(OPENWEATHER_API_URL=stub.url):
+            first = self.get_weather('28.6139', '77.2090')
+            second = self.get_weather('28.6201', '77.1950')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(stub.requests[0]['lat'], ['28.6'])
+        self.assertEqual(stub.requests[0]['lon'], ['77.2'])
+        self.assertEqual(json.loads(first.content)['current']['condition'], 'Scattered Clouds')
+        stats = weather.forecast_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_concurrent_misses_are_coalesced(self):
+        responses = []
+        with StubUpstream(delay=0.3) as stub, override_settings(OPENWEATHER_API_URL=stub.url):
+            threads = [
+                threading.Thread(target=lambda: responses.append(self.get_weather('19.0760', '72.8777')))
+                for _ in range(200)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual({response.status_code for response in responses}, {200})
+        stats = weather.forecast_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'] + stats['coalesced'], 199)
+
+    def test_expired_cell_is_fetched_again(self):
+        with StubUpstream() as stub, override_settings(OPENWEATHER_API_URL=stub.url, WEATHER_CACHE_TTL=0, WEATHER_STALE_TTL=0):
+            self.get_weather('12.97', '77.59')
+            self.get_weather('12.97', '77.59')
+        self.assertEqual(len(stub.requests), 2)
+
+    def test_stale_forecast_is_served_while_refreshing(self):
+        with StubUpstream(script=[(200, 0), (200, 0.3)]) as stub, \
+                override_settings(OPENWEATHER_API_URL=stub.url, WEATHER_CACHE_TTL=0, WEATHER_STALE_TTL=60):
+            first = self.get_weather('26.85', '80.95')
+            started = time.monotonic()
+            second = self.get_weather('26.85', '80.95')
+            self.assertLess(time.monotonic() - started, 0.2)
+            time.sleep(0.5)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(len(stub.requests), 2)
+        stats = weather.forecast_cache.stats()
+        self.assertEqual((stats['misses'], stats['stale'], stats['refreshes']), (1, 1, 1))
+
+    def test_prefetcher_refreshes_hot_cells_before_expiry(self):
+        with StubUpstream() as stub, override_settings(OPENWEATHER_API_URL=stub.url, WEATHER_CACHE_TTL=30):
+            prefetcher = weather.Prefetcher(weather.forecast_cache, weather.refresh_cell, top_n=1, interval=60)
+            hot, cold = (30.9, 75.85), (31.63, 74.87)
+            for cell in (hot, hot, cold):
+                weather.get_forecast(*cell)
+                prefetcher.record(weather.grid_cell(*cell, 0.05))
+            prefetcher.run_once()
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(stub.requests[-1]['lat'], ['30.9'])
+        self.assertEqual(prefetcher.prefetched, 1)
+
+    def test_upstream_errors_are_not_cached(self):
+        with StubUpstream(status=500) as stub, override_settings(OPENWEATHER_API_URL=stub.url):
+            self.assertEqual(self.get_weather('22.57', '88.36').status_code, 500)
+            stub.status = 200
+            self.assertEqual(self.get_weather('22.57', '88.36').status_code, 200)
+        self.assertEqual(len(stub.requests), 2)
+
+    def test_invalid_coordinates_are_rejected(self):
+        self.assertEqual(self.get_weather('north', '77.2').status_code, 400)
+        self.assertEqual(self.get_weather('91', '77.2').status_code, 400)
+
+
+MANDI_DUMP = (
+    'State,District,Market Name,Commodity,Variety,Arrival_Date,Min_x0020_Price,Max_x0020_Price,Modal Price (Rs./Quintal)\n'
+    'Punjab,Ludhiana,Khanna,Wheat,Dara,25/09/2025,900,1100,1000\n'
+    'Punjab,Ludhiana,Khanna,Wheat,Dara,01/10/2025,2300,2500,2400\n'
+    'Punjab,Ludhiana,Jagraon,Wheat,Dara,01/10/2025,2200,2400,2300\n'
+    'Punjab,Ludhiana,Khanna,Wheat,Dara,02/10/2025,2400,2600,2500\n'
+    'Punjab,Ludhiana,Jagraon,Wheat,Dara,02/10/2025,2500,2700,2600\n'
+    'Maharashtra,Latur,Latur,Arhar (Tur/Red Gram)(Whole),Other,02/10/2025,6800,7200,7000\n'
+    'Kerala,Ernakulam,Aluva,Coconut,Other,02/10/2025,1500,1700,1600\n'
+    'Punjab,Ludhiana,Khanna,Wheat,Dara,31/02/2025,2400,2600,2500\n'
+    'Punjab,Ludhiana,Khanna,,Dara,02/10/2025,2400,2600,2500\n'
+    'Punjab,Ludhiana,Khanna,Wheat,Sharbati,02/10/2025,n/a,2600,2500\n'
+)
+
+
+class MandiPriceIngestTests(TestCase):
+    def ingest(self, text=MANDI_DUMP, *args):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'dump.csv'
+        path.write_text(text, encoding='utf-8')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('ingest_mandi_prices', str(path), *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_header_aliases_are_mapped(self):
+        self.ingest()
+        observation = PriceObservation.objects.get(mandi__name='Jagraon', date=datetime.date(2025, 10, 2))
+        self.assertEqual((observation.commodity.name, observation.variety), ('Wheat', 'Dara'))
+        self.assertEqual(
+            (observation.min_price, observation.max_price, observation.modal_price), (Decimal(2500), Decimal(2700), Decimal(2600)),
+        )
+        self.assertEqual((observation.mandi.district, observation.mandi.state), ('Ludhiana', 'Punjab'))
+
+    def test_bad_rows_are_skipped_and_reported(self):
+        stdout, stderr = self.ingest()
+        self.assertEqual(PriceObservation.objects.count(), 7)
+        self.assertIn('10 rows read, 7 written', stdout)
+        self.assertEqual(re.findall(r':(\d+): skipped', stderr), ['9', '10', '11'])
+        self.assertIn('unrecognised date "31/02/2025"', stderr)
+        self.assertIn('blank commodity or market', stderr)
+
+    def test_migration_seeds_the_snapshot_from_existing_observations(self):
+        self.ingest()
+        snapshot = list(LatestPrice.objects.order_by('pk').values())
+        LatestPrice.objects.all().delete()
+        migration = importlib.import_module('myapp.migrations.0016_latestprice')
+        migration.seed_latest_prices(django_apps, None)
+        self.assertEqual(list(LatestPrice.objects.order_by('pk').values()), snapshot)
+
+    def test_missing_columns_are_refused(self):
+        with self.assertRaisesMessage(CommandError, 'missing columns: modal_price'):
+            self.ingest('State,District,Market,Commodity,Arrival_Date,Min_Price,Max_Price\n')
+
+    def test_rerun_is_idempotent(self):
+        self.ingest()
+        snapshot = market.latest_prices()
+        self.ingest()
+        self.assertEqual(PriceObservation.objects.count(), 7)
+        self.assertEqual(LatestPrice.objects.count(), 3)
+        self.assertEqual(market.latest_prices(), snapshot)
+
+    def test_snapshot_uses_the_last_two_trading_days(self):
+        self.ingest()
+        self.assertEqual(
+            dict(Commodity.objects.values_list('name', 'category')),
+            {'Wheat': 'cereals', 'Arhar (Tur/Red Gram)(Whole)': 'pulses', 'Coconut': 'other'},
+        )
+        with self.assertNumQueries(1):
+            snapshot = market.latest_prices()
+        self.assertEqual(snapshot, {
+            'cereals': [{'name': 'Wheat', 'price': 2550, 'change': 9}],
+            'vegetables': [],
+            'pulses': [{'name': 'Arhar (Tur/Red Gram)(Whole)', 'price': 7000, 'change': 0}],
+        })
+        self.assertEqual(self.client.get('/api/market-prices/').json(), snapshot)
+
+    def test_admin_category_is_kept_and_refresh_all_rebuilds(self):
+        Commodity.objects.create(name='Coconut', category='vegetables')
+        self.ingest()
+        LatestPrice.objects.all().delete()
+        call_command('ingest_mandi_prices', '--refresh-all', stdout=io.StringIO())
+        self.assertEqual([item['name'] for item in market.latest_prices()['vegetables']], ['Coconut'])
+
+
+class MarketPriceHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.wheat = Commodity.objects.create(name='Wheat', category='cereals')
+        cls.khanna = Mandi.objects.create(name='Khanna', district='Ludhiana', state='Punjab')
+        cls.jagraon = Mandi.objects.create(name='Jagraon', district='Ludhiana', state='Punjab')
+        PriceObservation.objects.bulk_create(
+            PriceObservation(commodity=cls.wheat, mandi=mandi, date=datetime.date.fromisoformat(date), min_price=low, max_price=high, modal_price=modal)
+            for mandi, date, low, high, modal in [
+                (cls.khanna, '2025-09-29', 2000, 2300, 2200),
+                (cls.jagraon, '2025-09-29', 2100, 2500, 2400),
+                (cls.khanna, '2025-09-30', 2200, 2600, 2500),
+                (cls.khanna, '2025-10-06', 1900, 2200, 2100),
+            ]
+        )
+
+    def history(self, **params):
+        params = {'commodity': 'wheat', 'start': '2025-09-01', 'end': '2025-10-31', **params}
+        return self.client.get('/api/market-prices/history/', params)
+
+    def series(self, response, *columns):
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return [body[column] for column in ('t', *columns)]
+
+    def test_daily_ohlc_spans_the_reported_price_range(self):
+        self.assertEqual(self.series(self.history(interval='day', metric='ohlc'), 'o', 'h', 'l', 'c'), [
+            ['2025-09-29', '2025-09-30', '2025-10-06'],
+            [2300, 2500, 2100],
+            [2500, 2600, 2200],
+            [2000, 2200, 1900],
+            [2300, 2500, 2100],
+        ])
+
+    def test_weekly_and_monthly_ohlc(self):
+        self.assertEqual(self.series(self.history(interval='week', metric='ohlc'), 'o', 'h', 'l', 'c'), [
+            ['2025-09-29', '2025-10-06'], [2300, 2100], [2600, 2200], [2000, 1900], [2500, 2100],
+        ])
+        self.assertEqual(self.series(self.history(interval='month', metric='ohlc'), 'o', 'h', 'l', 'c'), [
+            ['2025-09-01', '2025-10-01'], [2300, 2100], [2600, 2200], [2000, 1900], [2500, 2100],
+        ])
+
+    def test_mean_series(self):
+        self.assertEqual(self.series(self.history(interval='day', metric='mean'), 'mean'), [
+            ['2025-09-29', '2025-09-30', '2025-10-06'], [2300, 2500, 2100],
+        ])
+        self.assertEqual(self.series(self.history(interval='week', metric='mean'), 'mean'), [
+            ['2025-09-29', '2025-10-06'], [2400, 2100],
+        ])
+        self.assertNotIn('o', self.history(metric='mean').json())
+
+    def test_one_mandi(self):
+        self.assertEqual(self.series(self.history(mandi=self.jagraon.pk), 'o', 'h', 'l', 'c'), [
+            ['2025-09-29'], [2400], [2500], [2100], [2400],
+        ])
+
+    def test_bad_parameters_are_refused(self):
+        self.assertEqual(self.history(interval='hour').status_code, 400)
+        self.assertEqual(self.history(metric='median').status_code, 400)
+        self.assertEqual(self.history(start='2025-11-01').status_code, 400)
+        self.assertEqual(self.history(commodity='saffron').status_code, 404)
+        self.assertEqual(self.history(mandi='999').status_code, 404)
+
+
+def price(name, value, change=0):
+    return {'name': name, 'price': value, 'change': change}
+
+
+class PriceBroadcasterTests(SimpleTestCase):
+    def make_broadcaster(self, snapshots, interval=3600):
+        snapshots = iter(snapshots)
+
+        async def load_snapshot():
+            return next(snapshots)
+
+        return price_stream.PriceBroadcaster(load_snapshot, interval=interval, heartbeat=3600)
+
+    def events(self, payload):
+        return [
+            (lines[1].removeprefix('event: '), json.loads(lines[2].removeprefix('data: ')))
+            for lines in (block.split('\n') for block in payload.decode().strip().split('\n\n'))
+        ]
+
+    def test_changes_are_sent_as_deltas(self):
+        wheat, rice = price('Wheat', 2400), price('Rice', 3100)
+        broadcaster = self.make_broadcaster([
+            {'cereals': [wheat, rice]},
+            {'cereals': [wheat, price('Rice', 3150, 2)]},
+            {'cereals': [wheat, price('Rice', 3150, 2)]},
+        ])
+
+        async def run():
+            await broadcaster.poll_once()
+            await broadcaster.poll_once()
+            seen = broadcaster.version
+            await broadcaster.poll_once()
+            return seen
+
+        seen = asyncio.run(run())
+        self.assertEqual(seen, 2)
+        # An unchanged poll publishes nothing.
+        self.assertEqual(broadcaster.version, 2)
+        self.assertEqual(self.events(broadcaster.events_since(1)), [('prices', {'cereals': [price('Rice', 3150, 2)]})])
+        self.assertEqual(
+            self.events(broadcaster.snapshot_event), [('snapshot', {'cereals': [wheat, price('Rice', 3150, 2)]})],
+        )
+
+    def test_subscriber_behind_the_ring_gets_a_snapshot(self):
+        snapshots = [{'cereals': [price('Wheat', 2000 + n)]} for n in range(price_stream.RING_SIZE + 2)]
+        broadcaster = self.make_broadcaster(snapshots)
+
+        async def run():
+            for _ in snapshots:
+                await broadcaster.poll_once()
+
+        asyncio.run(run())
+        self.assertEqual(len(broadcaster.ring), price_stream.RING_SIZE)
+        latest = broadcaster.version
+        self.assertEqual(
+            self.events(broadcaster.events_since(latest - 2)),
+            [('prices', {'cereals': [price('Wheat', 2000 + n)]}) for n in (len(snapshots) - 2, len(snapshots) - 1)],
+        )
+        self.assertEqual(self.events(broadcaster.events_since(1)), [('snapshot', snapshots[-1])])
+
+    def test_subscriber_starts_with_a_snapshot(self):
+        broadcaster = self.make_broadcaster([{'cereals': [price('Wheat', 2400)]}])
+
+        async def first_chunk():
+            stream = broadcaster.subscribe()
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+
+        chunk = asyncio.run(first_chunk())
+        self.assertTrue(chunk.startswith(b'retry: 5000\n\n'))
+        self.assertEqual(self.events(chunk.removeprefix(b'retry: 5000\n\n')), [('snapshot', {'cereals': [price('Wheat', 2400)]})])
+        self.assertEqual(broadcaster.subscribers, 0)
+
+    def test_subscriber_after_the_poller_stopped_waits_for_a_fresh_poll(self):
+        broadcaster = self.make_broadcaster([{'cereals': [price('Wheat', 2400)]}, {'cereals': [price('Wheat', 2500)]}], interval=0)
+
+        async def first_chunk():
+            stream = broadcaster.subscribe()
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+
+        async def run():
+            await first_chunk()
+            await broadcaster._poller
+            self.assertIsNone(broadcaster._poller)
+            return await first_chunk()
+
+        chunk = asyncio.run(run())
+        self.assertEqual(self.events(chunk.removeprefix(b'retry: 5000\n\n')), [('snapshot', {'cereals': [price('Wheat', 2500)]})])
+        self.assertEqual(broadcaster.polls, 2)
+
+
+class ReviewPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([User(username=f'farmer{i}') for i in range(45)])
+        # Several reviews share a timestamp so the id tie-breaker matters.
+        submitted = timezone.now()
+        Review.objects.bulk_create([
+            Review(user=user, rating=i % 5 + 1, review_text=f'review {i}')
+            for i, user in enumerate(users)
+        ])
+        for i, review in enumerate(Review.objects.order_by('id')):
+            Review.objects.filter(pk=review.pk).update(submission_date=submitted - datetime.timedelta(minutes=i // 4))
+
+    def test_pages_walk_every_review_once_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            page, cursor = reviews.review_page(cursor, limit=10)
+            seen.extend(page)
+            if cursor is None:
+                break
+        expected = list(Review.objects.order_by('-submission_date', '-id').values_list('id', flat=True))
+        self.assertEqual([review.pk for review in seen], expected)
+
+    def test_page_cost_does_not_depend_on_position(self):
+        _, cursor = reviews.review_page(limit=30)
+        with self.assertNumQueries(1):
+            page, _ = reviews.review_page(cursor, limit=10)
+            [review.user.username for review in page]
+
+    def test_json_variant_returns_cards_and_cursor(self):
+        response = self.client.get('/api/reviews/', {'limit': 40})
+        data = json.loads(response.content)
+        self.assertEqual(len(data['reviews']), 40)
+        self.assertIn('farmer', data['reviews'][0]['html'])
+        response = self.client.get('/api/reviews/', {'cursor': data['next_cursor']})
+        data = json.loads(response.content)
+        self.assertEqual(len(data['reviews']), 5)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_bad_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/reviews/', {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/reviews/', {'limit': 0}).status_code, 400)
+
+
+class ReviewStatsTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create(username=f'grower{i}') for i in range(4)]
+
+    def submit(self, user, rating):
+        self.client.force_login(user)
+        return self.client.post('/review/', {'rating': rating, 'review_text': 'Good advice'})
+
+    def assertStats(self, count, total, histogram):
+        stats = ReviewStats.objects.get(pk=1)
+        self.assertEqual((stats.review_count, stats.rating_sum, stats.histogram), (count, total, histogram))
+
+    def test_submit_edit_and_delete_keep_stats_current(self):
+        for user, rating in zip(self.users, '5531'):
+            self.submit(user, rating)
+        self.assertStats(4, 14, {1: 1, 2: 0, 3: 1, 4: 0, 5: 2})
+
+        review = Review.objects.get(user=self.users[3])
+        review.rating = 4
+        review.save()
+        self.assertStats(4, 17, {1: 0, 2: 0, 3: 1, 4: 1, 5: 2})
+
+        # The admin's bulk delete action goes through QuerySet.delete().
+        Review.objects.filter(rating=5).delete()
+        self.assertStats(2, 7, {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
+
+    def test_invalid_rating_is_not_stored(self):
+        self.submit(self.users[0], '9')
+        self.assertFalse(Review.objects.exists())
+        self.assertStats(0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+
+    def test_dashboard_reads_stats_without_scanning_reviews(self):
+        cache.clear()
+        self.submit(self.users[0], '4')
+        self.submit(self.users[1], '3')
+        self.client.logout()
+        with self.assertNumQueries(2):  # first page + stats row
+            response = self.client.get('/reviews/all/')
+        self.assertContains(response, '3.5/5')
+        self.assertContains(response, '>2</p>')
+
+    def test_rebuild_command_repairs_drift(self):
+        Review.objects.bulk_create([Review(user=user, rating=2) for user in self.users])
+        self.assertStats(0, 0, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0})
+        call_command('rebuild_review_stats', stdout=io.StringIO())
+        self.assertStats(4, 8, {1: 0, 2: 4, 3: 0, 4: 0, 5: 0})
+
+
+class ReviewRenderCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = User.objects.bulk_create([User(username=f'planter{i}') for i in range(25)])
+        Review.objects.bulk_create([Review(user=user, rating=4, review_text=f'note {i}') for i, user in enumerate(cls.users)])
+        reviews.rebuild_stats()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_first_page_is_served_from_cache(self):
+        first = self.client.get('/reviews/all/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/reviews/all/')
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, 'planter24')
+        self.assertNotContains(second, 'planter0<')
+
+    def test_cards_are_rendered_once(self):
+        page, _ = reviews.review_page()
+        cards = reviews.render_cards(page)
+        with mock.patch('myapp.reviews.render_to_string') as render:
+            self.assertEqual(reviews.render_cards(page), cards)
+        render.assert_not_called()
+
+    def test_saving_or_deleting_a_review_invalidates_the_page(self):
+        self.client.get('/reviews/all/')
+        review = Review.objects.get(user=self.users[24])
+        review.review_text = 'Changed my mind'
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+        self.assertContains(self.client.get('/reviews/all/'), 'Changed my mind')
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+        response = self.client.get('/reviews/all/')
+        self.assertNotContains(response, 'Changed my mind')
+        self.assertContains(response, '>24</p>')
+
+    def test_renaming_an_author_invalidates_the_page(self):
+        self.client.get('/reviews/all/')
+        user = self.users[24]
+        with self.captureOnCommitCallbacks(execute=True):
+            user.last_login = timezone.now()
+            user.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            self.client.get('/reviews/all/')
+        user.username = 'grower24'
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        response = self.client.get('/reviews/all/')
+        self.assertContains(response, 'grower24')
+        self.assertNotContains(response, 'planter24')
+
+    def test_version_survives_eviction_without_reusing_old_keys(self):
+        version = reviews.cache_version()
+        cache.delete(reviews.VERSION_KEY)
+        self.assertGreater(reviews.cache_version(), version)
+
+
+class ReviewSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        texts = {
+            'ravi': 'Drip irrigation advice saved my tomato crop',
+            'meena': 'Irrigated wheat did well, the weather alerts helped',
+            'arjun': 'Tomato prices on the market page were out of date',
+            'kiran': 'Great app',
+        }
+        for username, text in texts.items():
+            Review.objects.create(user=User.objects.create(username=username), review_text=text, rating=4)
+        User.objects.create(username='support', is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        review_search.clear_fallback_index()
+        cache.clear()
+
+    def usernames(self, results):
+        return [review.user.username for review in results]
+
+    def test_terms_match_word_prefixes_and_all_must_appear(self):
+        self.assertEqual(sorted(self.usernames(review_search.search('irrigat'))), ['meena', 'ravi'])
+        self.assertEqual(self.usernames(review_search.search('tomato irrigation')), ['ravi'])
+        self.assertEqual(review_search.search('tomato rice'), [])
+        # Too short for the index, and boolean-mode operators are not passed through.
+        self.assertEqual(review_search.search('on +"*'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        review_search.search('tomato')
+        review = Review.objects.get(user__username='kiran')
+        review.review_text = 'Tomato blight alerts came in time'
+        review.save()
+        self.assertIn('kiran', self.usernames(review_search.search('blight')))
+        Review.objects.filter(user__username='arjun').delete()
+        self.assertEqual(sorted(self.usernames(review_search.search('tomato'))), ['kiran', 'ravi'])
+
+    def test_changes_from_other_processes_rebuild_the_index(self):
+        review_search.search('tomato')
+        index = review_search.fallback_index()
+        review = Review.objects.get(user__username='ravi')
+        review.review_text = 'Drip irrigation saved my okra'
+        with self.captureOnCommitCallbacks(execute=True):
+            review.save()
+        # This process's own change is already in its index.
+        self.assertIs(review_search.fallback_index(), index)
+        # Another worker's save: no signal here, only the version bump.
+        Review.objects.filter(user__username='kiran').update(review_text='Tomato blight alerts came in time')
+        self.assertEqual(self.usernames(review_search.search('blight')), [])
+        cache.incr(review_search.INDEX_VERSION_KEY)
+        self.assertEqual(self.usernames(review_search.search('blight')), ['kiran'])
+        self.assertEqual(self.usernames(review_search.search('okra')), ['ravi'])
+
+    def test_api_returns_ranked_cards(self):
+        response = self.client.get('/api/reviews/search/', {'q': 'weather'})
+        data = json.loads(response.content)
+        self.assertEqual([review['username'] for review in data['reviews']], ['meena'])
+        self.assertIn('weather alerts', data['reviews'][0]['html'])
+        self.assertEqual(self.client.get('/api/reviews/search/').status_code, 400)
+
+    def test_admin_search_matches_text_or_username_prefix(self):
+        self.client.force_login(User.objects.get(username='support'))
+        response = self.client.get('/admin/myapp/review/', {'q': 'tomato'})
+        self.assertEqual(sorted(str(review.user) for review in response.context['cl'].result_list), ['arjun', 'ravi'])
+        response = self.client.get('/admin/myapp/review/', {'q': 'kir'})
+        self.assertEqual([str(review.user) for review in response.context['cl'].result_list], ['kiran'])
+
+
+class ReviewAdminChangelistTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([User(username=f'member{i:03d}') for i in range(250)])
+        Review.objects.bulk_create([Review(user=user, rating=i % 5 + 1) for i, user in enumerate(users)])
+        start = datetime.datetime(2024, 11, 20, tzinfo=datetime.timezone.utc)
+        for i, review in enumerate(Review.objects.order_by('id')):
+            Review.objects.filter(pk=review.pk).update(submission_date=start + datetime.timedelta(days=i // 3))
+        cls.staff = User.objects.create(username='auditor', is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def changelist(self, url='/admin/myapp/review/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def test_newest_first_pages_follow_the_cursor(self):
+        cl = self.changelist()
+        self.assertTrue(cl.keyset)
+        seen = [review.pk for review in cl.result_list]
+        while cl.next_page_url:
+            cl = self.changelist('/admin/myapp/review/' + cl.next_page_url)
+            seen.extend(review.pk for review in cl.result_list)
+        self.assertEqual(seen, list(Review.objects.order_by('-submission_date', '-id').values_list('id', flat=True)))
+        self.assertEqual(cl.result_count, 250)
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        second = self.changelist('/admin/myapp/review/' + self.changelist().next_page_url)
+        with CaptureQueriesContext(connection) as first_queries:
+            self.changelist()
+        with CaptureQueriesContext(connection) as deep_queries:
+            self.changelist('/admin/myapp/review/' + second.next_page_url)
+        self.assertEqual(len(first_queries), len(deep_queries))
+        self.assertFalse(any('OFFSET' in query['sql'] for query in deep_queries))
+
+    def test_date_hierarchy_is_probed_by_period(self):
+        response = self.client.get('/admin/myapp/review/')
+        self.assertContains(response, 'submission_date__year=2024')
+        self.assertContains(response, 'submission_date__year=2025')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/myapp/review/', {'submission_date__year': 2024})
+        self.assertContains(response, 'submission_date__month=11')
+        self.assertContains(response, 'submission_date__month=12')
+        self.assertNotContains(response, 'submission_date__month=10')
+        self.assertFalse(any('DISTINCT' in query['sql'] for query in queries))
+
+    def test_filtered_and_resorted_lists_still_page(self):
+        cl = self.changelist(rating=5)
+        self.assertTrue(cl.keyset)
+        self.assertEqual(cl.result_count, 50)
+        self.assertEqual({review.rating for review in cl.result_list}, {5})
+        cl = self.changelist(o='2')
+        self.assertFalse(cl.keyset)
+        self.assertEqual(len(cl.result_list), 100)
+
+
+class ReviewExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([User(username=f'exporter{i:02d}') for i in range(30)])
+        Review.objects.bulk_create([
+            Review(user=user, rating=i % 5 + 1, review_text='=HYPERLINK("x")' if i == 0 else f'Comment {i}, with "quotes"')
+            for i, user in enumerate(users)
+        ])
+        for i, review in enumerate(Review.objects.order_by('id')):
+            Review.objects.filter(pk=review.pk).update(
+                submission_date=datetime.datetime(2025, 1, 1 + i, 12, tzinfo=datetime.timezone.utc),
+            )
+        cls.staff = User.objects.create(username='analyst', is_staff=True, is_superuser=True)
+
+    def export(self, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/reviews/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_is_filtered_and_streamed_in_batches(self):
+        with mock.patch.object(review_export, 'CHUNK_SIZE', 4), CaptureQueriesContext(connection) as queries:
+            body = self.export(rating='4,5', start='2025-01-05', end='2025-01-24')
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], list(review_export.EXPORT_COLUMNS))
+        self.assertEqual(len(rows) - 1, 8)
+        self.assertEqual({row[2] for row in rows[1:]}, {'4', '5'})
+        self.assertEqual((rows[1][1], rows[-1][1]), ('exporter04', 'exporter23'))
+        self.assertEqual(rows[1][3], 'Comment 4, with "quotes"')
+        self.assertEqual(sum('myapp_review' in query['sql'] for query in queries), 3)
+
+    def test_ndjson_export_and_formula_cells(self):
+        lines = [json.loads(line) for line in self.export(format='ndjson').splitlines()]
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(lines[0]['username'], 'exporter00')
+        self.assertEqual(lines[0]['review_text'], '=HYPERLINK("x")')
+        first_row = list(csv.reader(io.StringIO(self.export())))[1]
+        self.assertEqual(first_row[3], "'=HYPERLINK(\"x\")")
+
+    def test_export_is_staff_only_and_validates_filters(self):
+        self.assertEqual(self.client.get('/api/reviews/export/').status_code, 302)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get('/api/reviews/export/', {'rating': '6'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/reviews/export/', {'start': '01/02/2025'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/reviews/export/', {'format': 'xml'}).status_code, 400)
+
+    def test_admin_action_exports_selected_reviews(self):
+        self.client.force_login(self.staff)
+        selected = list(Review.objects.order_by('id').values_list('id', flat=True)[:3])
+        response = self.client.post('/admin/myapp/review/', {'action': 'export_ndjson', '_selected_action': selected})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], selected)
+
+
+def leaf_photo(spot=None, size=(900, 700), name='leaf.jpg'):
+    """A JPEG of a green leaf, with 30 round spots of ``spot`` colour."""
+    image = Image.new('RGB', size, (60, 140, 50))
+    if spot:
+        draw = ImageDraw.Draw(image)
+        for i in range(30):
+            x, y = (i * 137) % size[0], (i * 89) % size[1]
+            draw.ellipse((x, y, x + 40, y + 40), fill=spot)
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def run_queued_scans():
+    while (job := scan_jobs.claim('test-worker')) is not None:
+        scan_jobs.run(job)
+
+
+class ScanImageTests(TestCase):
+    def setUp(self):
+        scan_cache.result_cache.clear()
+
+    def scan(self, upload):
+        response = self.client.post('/api/scan-image/', {'image': upload})
+        self.assertEqual(response.status_code, 202)
+        queued = response.json()
+        self.assertEqual(queued['status'], 'queued')
+        run_queued_scans()
+        status = self.client.get(queued['status_url'])
+        self.assertEqual(status.status_code, 200)
+        return status.json()
+
+    def test_diagnosis_follows_the_image(self):
+        for spot, disease in [(None, 'Healthy Leaf'), ((120, 75, 30), 'Leaf Blight'), ((228, 230, 222), 'Powdery Mildew')]:
+            with self.subTest(disease=disease):
+                job = self.scan(leaf_photo(spot))
+                self.assertEqual(job['status'], 'done')
+                data = job['result']
+                self.assertTrue(data['success'])
+                self.assertEqual(data['disease_type'], disease)
+                self.assertRegex(data['confidence'], r'^\d+%$')
+                self.assertIn('pesticide_recommendations', data)
+        self.assertFalse(ScanJob.objects.exclude(image=b'').exists())
+
+    def test_upload_is_downscaled_before_feature_extraction(self):
+        pixels = scanner.load_image(leaf_photo(size=(3000, 2000)).open())
+        self.assertEqual(pixels.shape, (171, 256, 3))
+        self.assertEqual(len(scanner.extract_features(pixels)), len(scanner.FEATURE_NAMES))
+
+    def test_rejects_missing_unreadable_and_oversized_uploads(self):
+        self.assertEqual(self.client.post('/api/scan-image/').status_code, 400)
+        job = self.scan(SimpleUploadedFile('leaf.jpg', b'not an image'))
+        self.assertEqual((job['status'], job['error']), ('failed', 'Could not read the uploaded image'))
+        with override_settings(SCAN_MAX_UPLOAD_BYTES=100):
+            response = self.client.post('/api/scan-image/', {'image': leaf_photo()})
+            self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.client.get('/api/scan-jobs/00000000-0000-0000-0000-000000000000/').status_code, 404)
+
+
+class ScanJobQueueTests(TestCase):
+    def test_full_queue_answers_429(self):
+        with override_settings(SCAN_QUEUE_LIMIT=1):
+            self.assertEqual(self.client.post('/api/scan-image/', {'image': leaf_photo()}).status_code, 202)
+            response = self.client.post('/api/scan-image/', {'image': leaf_photo()})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], str(scan_jobs.RETRY_AFTER_SECONDS))
+
+    def test_jobs_are_claimed_once_in_order(self):
+        first, second = scan_jobs.enqueue(b'1'), scan_jobs.enqueue(b'2')
+        self.assertEqual(scan_jobs.claim('a').pk, first.pk)
+        self.assertEqual(scan_jobs.claim('b').pk, second.pk)
+        self.assertIsNone(scan_jobs.claim('c'))
+        self.assertEqual(ScanJob.objects.get(pk=first.pk).worker, 'a')
+
+    def test_job_of_a_dead_worker_is_retried_then_failed(self):
+        job = scan_jobs.enqueue(leaf_photo().read())
+        stale = timezone.now() - datetime.timedelta(seconds=settings.SCAN_JOB_LEASE + 1)
+        lost = scan_jobs.claim('dead')
+        for attempt in range(2, scan_jobs.MAX_ATTEMPTS + 1):
+            ScanJob.objects.filter(pk=job.pk).update(started_at=stale)
+            retried = scan_jobs.claim('alive')
+            self.assertEqual((retried.pk, retried.attempts), (job.pk, attempt))
+        # The first worker coming back late must not overwrite the retry's state.
+        scan_jobs.finish(lost, ScanJob.FAILED, error='late')
+        self.assertEqual(ScanJob.objects.get(pk=job.pk).status, ScanJob.RUNNING)
+
+        ScanJob.objects.filter(pk=job.pk).update(started_at=stale)
+        self.assertIsNone(scan_jobs.claim('alive'))
+        self.assertEqual(ScanJob.objects.get(pk=job.pk).status, ScanJob.FAILED)
+
+    def test_worker_stops_a_scan_at_the_timeout(self):
+        started = time.monotonic()
+        with self.assertRaises(scan_jobs.ScanTimeout):
+            scan_jobs.with_timeout(time.sleep, 5, 0.1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_finished_jobs_are_purged(self):
+        job = scan_jobs.enqueue(b'')
+        ScanJob.objects.filter(pk=job.pk).update(
+            status=ScanJob.DONE, finished_at=timezone.now() - datetime.timedelta(days=settings.SCAN_JOB_RETENTION_DAYS + 1),
+        )
+        scan_jobs.enqueue(b'')
+        self.assertEqual(scan_jobs.purge_finished(), 1)
+        self.assertEqual(ScanJob.objects.count(), 1)
+
+
+class ScanCacheTests(TestCase):
+    def setUp(self):
+        scan_cache.result_cache.clear()
+
+    def fingerprint(self, upload):
+        return scanner.fingerprint(scanner.load_image(upload.open()))
+
+    def test_fingerprint_survives_recompression_and_resizing(self):
+        original = self.fingerprint(leaf_photo((120, 75, 30), size=(1200, 900)))
+        buffer = io.BytesIO()
+        Image.open(leaf_photo((120, 75, 30), size=(1200, 900))).resize((800, 600)).save(buffer, 'JPEG', quality=60)
+        resaved = self.fingerprint(SimpleUploadedFile('leaf.jpg', buffer.getvalue()))
+        other = self.fingerprint(leaf_photo((228, 230, 222), size=(1200, 900)))
+        self.assertLessEqual(scan_cache.distance(original, resaved), scan_cache.MAX_DISTANCE)
+        self.assertGreater(scan_cache.distance(original, other), scan_cache.MAX_DISTANCE)
+
+    def test_repeated_upload_skips_the_model(self):
+        with mock.patch.object(scanner, 'classify', wraps=scanner.classify) as classify:
+            for _ in range(2):
+                self.client.post('/api/scan-image/', {'image': leaf_photo((120, 75, 30))})
+            run_queued_scans()
+        self.assertEqual(classify.call_count, 1)
+        first, again = ScanJob.objects.order_by('id')
+        self.assertEqual(first.result, again.result)
+        self.assertEqual((first.cached, again.cached), (False, True))
+        self.assertEqual(scan_cache.result_cache.stats()['hit_rate'], 0.5)
+
+        self.client.force_login(User.objects.create(username='agronomist', is_staff=True))
+        stats = self.client.get('/api/scan-image/cache-stats/').json()
+        self.assertEqual(stats['last_day'], {'scans': 2, 'cached': 1, 'hit_rate': 0.5})
+        self.assertEqual(stats['stored'], {'results': 1, 'hits': 0})
+
+    def test_stored_results_are_shared_and_scoped_to_the_model(self):
+        version = scanner.get_engine().version
+        diagnosis = scanner.Diagnosis('leaf_blight', 0.9, {'leaf_blight': 0.9})
+        scan_cache.result_cache.store(version, 0x0123456789ABCDEF, diagnosis)
+        scan_cache.result_cache.clear()
+
+        self.assertEqual(scan_cache.result_cache.lookup(version, 0x0123456789ABCDEF ^ 0b101), diagnosis)
+        self.assertIsNone(scan_cache.result_cache.lookup('retrained', 0x0123456789ABCDEF))
+        self.assertEqual(ScanResult.objects.get().hits, 1)
+        stats = scan_cache.result_cache.stats()
+        self.assertEqual((stats['stored_hits'], stats['misses']), (1, 1))
+        self.assertEqual(scan_cache.result_cache.lookup(version, 0x0123456789ABCDEF), diagnosis)
+        self.assertEqual(scan_cache.result_cache.stats()['near_hits'], 1)
+
+
+class FarmerRegistrationTests(TestCase):
+    def setUp(self):
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        self.spool_dir = Path(spool_dir.name)
+        self.buffer = self.new_buffer()
+        patcher = mock.patch.object(registrations, '_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def new_buffer(self, batch_size=100):
+        buffer = registrations.RegistrationBuffer(self.spool_dir, batch_size, flush_interval=None, fsync=False).start()
+        self.addCleanup(lambda: buffer._spool.closed or buffer._spool.close())
+        return buffer
+
+    def register(self, phone, email='farmer@example.com'):
+        return self.client.post('/api/register-farmer/', {'phoneNumber': phone, 'emailId': email})
+
+    def test_registrations_are_spooled_then_written_in_one_batch(self):
+        for phone in ['+91 98765 43210', '09876543211', '9876543212']:
+            response = self.register(phone)
+            self.assertEqual(response.json(), {'success': True, 'message': 'Registration successful!'})
+        self.assertFalse(FarmerRegistration.objects.exists())
+        spooled = list(self.spool_dir.glob('*.spool'))
+        self.assertEqual(len(spooled), 1)
+        self.assertEqual(len(spooled[0].read_bytes().splitlines()), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            sorted(FarmerRegistration.objects.values_list('phone_number', flat=True)),
+            ['9876543210', '9876543211', '9876543212'],
+        )
+        self.assertEqual([path.read_bytes() for path in self.spool_dir.glob('*.spool')], [b''])
+
+    def test_invalid_input_is_refused_before_spooling(self):
+        for phone, email in [('12345', 'farmer@example.com'), ('98765432101', 'farmer@example.com'), ('9876543210', 'not-an-email')]:
+            response = self.register(phone, email)
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['success'])
+        self.assertEqual(self.buffer.stats()['accepted'], 0)
+
+    def test_repeat_registrations_keep_one_row_with_the_latest_email(self):
+        self.register('9876543210', 'old@example.com')
+        self.register('9876543210', 'new@example.com')
+        self.assertEqual(self.buffer.flush(), 1)
+        first = FarmerRegistration.objects.get()
+        self.assertEqual(first.email, 'new@example.com')
+
+        self.register('+919876543210', 'newest@example.com')
+        self.buffer.flush()
+        again = FarmerRegistration.objects.get()
+        self.assertEqual((again.email, again.registered_at), ('newest@example.com', first.registered_at))
+        self.assertEqual(self.buffer.stats()['duplicates'], 1)
+
+    def test_full_batch_is_written_straight_away(self):
+        self.buffer = self.new_buffer(batch_size=2)
+        self.buffer.add('9876543210', 'a@example.com')
+        self.assertFalse(FarmerRegistration.objects.exists())
+        self.buffer.add('9876543211', 'b@example.com')
+        self.assertEqual(FarmerRegistration.objects.count(), 2)
+
+    def test_failed_write_keeps_registrations_pending_and_spooled(self):
+        self.buffer.add('9876543210', 'a@example.com')
+        with mock.patch.object(registrations, 'write', side_effect=DatabaseError('gone away')):
+            with self.assertRaises(DatabaseError), self.assertLogs('myapp.registrations', 'WARNING'):
+                self.buffer.flush()
+        self.buffer.add('9876543211', 'b@example.com')
+        self.assertEqual(self.buffer.stats()['pending'], 2)
+        self.assertEqual(len(Path(self.buffer._spool.name).read_bytes().splitlines()), 2)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(FarmerRegistration.objects.count(), 2)
+
+    def test_spool_of_a_dead_process_is_replayed_by_the_next_one(self):
+        self.buffer.add('9876543210', 'a@example.com')
+        self.buffer.add('9876543211', 'b@example.com')
+        self.buffer._spool.write(b'{"phone": "98765')  # torn by the crash
+        self.assertEqual(registrations.replay_orphans(self.spool_dir), 0)  # still locked by its live owner
+
+        self.buffer._spool.close()  # the process dies without flushing
+        with self.assertLogs('myapp.registrations', 'WARNING'):
+            self.new_buffer()
+        self.assertEqual(
+            sorted(FarmerRegistration.objects.values_list('phone_number', flat=True)),
+            ['9876543210', '9876543211'],
+        )
+        self.assertEqual(len(list(self.spool_dir.glob('*.spool'))), 1)
+
+
+def aadhaar_number(n):
+    digits = f'{2 + n % 8}{n:010d}'
+    return digits + dbt.check_digit(digits)
+
+
+class DBTRegistryTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.bloom_path = self.directory / 'linkage.bloom'
+        overrides = override_settings(DBT_BLOOM_PATH=self.bloom_path)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        patcher = mock.patch.object(dbt, 'registry', dbt.LinkageRegistry(self.bloom_path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def import_registry(self, rows, name='registry.csv'):
+        path = self.directory / name
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt', newline='', encoding='utf-8') as registry:
+            writer = csv.writer(registry)
+            writer.writerow(['Aadhaar', 'Bank', 'Account'])
+            writer.writerows(rows)
+        call_command('import_dbt_registry', str(path), stdout=io.StringIO(), stderr=io.StringIO())
+
+    def check(self, aadhaar, account='123456789012'):
+        return self.client.post('/api/check-dbt/', {'dbtAadhaar': aadhaar, 'bankAccount': account})
+
+    def test_imported_numbers_are_stored_hashed_and_found(self):
+        linked = [aadhaar_number(n) for n in range(3)]
+        mistyped = linked[2][:-1] + str((int(linked[2][-1]) + 1) % 10)
+        self.import_registry([
+            [linked[0], 'State Bank of India', '123456789012'],
+            [linked[1], 'Canara Bank', '5555 0000 4321'],
+            [mistyped, 'Indian Bank', '123456789012'],
+            [linked[2], 'Indian Bank', '998877665544'],
+        ])
+        self.assertEqual(DBTLinkage.objects.count(), 3)
+        stored = ' '.join(str(value) for row in DBTLinkage.objects.values_list() for value in row)
+        self.assertFalse(any(number in stored for number in linked))
+
+        response = self.check(linked[0]).json()
+        self.assertEqual((response['success'], response['account_matches']), (True, True))
+        self.assertIn(f'XXXX XXXX {linked[0][-4:]}', response['message'])
+        self.assertNotIn(linked[0], response['message'])
+
+        response = self.check(linked[1], account='111122223333').json()
+        self.assertEqual((response['success'], response['account_matches']), (True, False))
+        self.assertIn('not paid into the account ending 3333', response['message'])
+
+        response = self.check(aadhaar_number(99)).json()
+        self.assertEqual((response['success'], response['account_matches']), (False, None))
+
+    def test_public_check_does_not_reveal_the_account_on_record(self):
+        number = aadhaar_number(4)
+        self.import_registry([[number, 'State Bank of India', '123456789012']])
+        for account in ('123456789012', '111122223333'):
+            body = self.check(number, account).content.decode()
+            self.assertNotIn('State Bank of India', body)
+            self.assertNotIn('9012', body.replace(account, ''))
+
+    def test_unlinked_numbers_are_answered_by_the_filter(self):
+        self.import_registry([[aadhaar_number(n), 'State Bank of India', '123456789012'] for n in range(50)])
+        unlinked = [aadhaar_number(n) for n in range(1000, 1100)]
+        with CaptureQueriesContext(connection) as queries:
+            for number in unlinked:
+                self.assertFalse(self.check(number).json()['success'])
+        stats = dbt.registry.stats()
+        self.assertEqual(stats['filtered'] + stats['false_positives'], 100)
+        self.assertGreater(stats['filtered'], 90)
+        self.assertEqual(len(queries), stats['false_positives'])
+        self.assertEqual(stats['filter_entries'], 50)
+
+    def test_without_a_usable_filter_every_lookup_reads_the_table(self):
+        self.import_registry([[aadhaar_number(1), 'Canara Bank', '123456789012']])
+        with override_settings(DBT_AADHAAR_SALT='rotated'):
+            with self.assertLogs('myapp.dbt', 'WARNING'), self.assertNumQueries(1):
+                self.assertIsNone(dbt.registry.lookup(aadhaar_number(2)))
+        dbt.registry.clear()
+        os.remove(self.bloom_path)
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(dbt.registry.lookup(aadhaar_number(1)))
+
+    def test_reimport_updates_entries_and_reads_gzip(self):
+        self.import_registry([[aadhaar_number(7), 'Canara Bank', '123456789012']])
+        self.import_registry([[aadhaar_number(7), 'Indian Bank', '123456780000']], name='update.csv.gz')
+        linkage = DBTLinkage.objects.get()
+        self.assertEqual((linkage.bank_name, linkage.account_suffix), ('Indian Bank', '0000'))
+
+    def test_invalid_numbers_are_refused(self):
+        valid = aadhaar_number(3)
+        wrong_check_digit = valid[:-1] + str((int(valid[-1]) + 1) % 10)
+        for aadhaar, account in [(wrong_check_digit, '123456789012'), ('1234', '123456789012'), (valid, '12ab')]:
+            self.assertEqual(self.check(aadhaar, account).status_code, 400)
+        self.assertEqual(dbt.clean_aadhaar(f'{valid[:4]} {valid[4:8]} {valid[8:]}'), valid)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        rng = random.Random(7)
+        digests = [rng.randbytes(32) for _ in range(5000)]
+        bloom = dbt.BloomFilter.with_capacity(len(digests), 0.01, b'k' * 16)
+        bloom.add_many(digests)
+        bloom.save(self.bloom_path)
+        mapped = dbt.BloomFilter.open(self.bloom_path)
+        self.assertTrue(all(digest in mapped for digest in digests))
+        false_positives = sum(rng.randbytes(32) in mapped for _ in range(5000))
+        self.assertLess(false_positives, 100)
+        self.assertEqual((mapped.count, mapped.key_id), (5000, b'k' * 16))
+
+
+class BulkDBTCheckTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        bloom_path = Path(directory.name) / 'linkage.bloom'
+        registry = dbt.LinkageRegistry(bloom_path)
+        patcher = mock.patch.object(dbt, 'registry', registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        linked = [aadhaar_number(n) for n in range(20)]
+        DBTLinkage.objects.bulk_create(
+            DBTLinkage(aadhaar_hash=dbt.aadhaar_digest(number).hex(), bank_name='Canara Bank', account_suffix='1234', updated_at=timezone.now())
+            for number in linked
+        )
+        bloom = dbt.BloomFilter.with_capacity(len(linked), 0.01, dbt.key_id())
+        bloom.add_many([dbt.aadhaar_digest(number) for number in linked])
+        bloom.save(bloom_path)
+        self.linked = linked
+        self.client.force_login(User.objects.create(username='csc-operator', is_staff=True))
+
+    def upload(self, text):
+        return self.client.post('/api/check-dbt/bulk/', {'file': SimpleUploadedFile('farmers.csv', text.encode('utf-8'), 'text/csv')})
+
+    def results(self, response):
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        return list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+
+    def test_every_row_gets_a_status(self):
+        unlinked = aadhaar_number(500)
+        response = self.upload(
+            'Name,Aadhaar,Account\n'
+            f'Ravi,{self.linked[0]},111100001234\n'
+            f'Sita,{self.linked[1]},111100009999\n'
+            '\n'
+            f'Amar,{unlinked},111100001234\n'
+            'Gita,123412341234,111100001234\n'
+            f'Hari,{self.linked[2]},12ab\n'
+        )
+        results = self.results(response)
+        self.assertEqual(list(results[0]), list(dbt_bulk.COLUMNS))
+        rows = [(row['row'], row['status'], row['account_matches']) for row in results]
+        self.assertEqual(rows, [
+            ('1', 'linked', 'yes'),
+            ('2', 'linked', 'no'),
+            ('4', 'not_linked', ''),
+            ('5', 'invalid_aadhaar', ''),
+            ('6', 'invalid_account', ''),
+        ])
+
+    def test_rows_are_resolved_with_one_query_per_chunk(self):
+        numbers = self.linked + [aadhaar_number(n) for n in range(1000, 1080)]
+        text = 'aadhaar,account\n' + ''.join(f'{number},111100001234\n' for number in numbers)
+        with mock.patch.object(dbt_bulk, 'CHUNK_SIZE', 25), CaptureQueriesContext(connection) as queries:
+            results = self.results(self.upload(text))
+        self.assertEqual(len(results), 100)
+        self.assertEqual(sum(row['status'] == 'linked' for row in results), 20)
+        lookups = [query for query in queries if 'myapp_dbtlinkage' in query['sql']]
+        self.assertLessEqual(len(lookups), 4)
+        self.assertTrue(all(' IN (' in query['sql'] for query in lookups))
+
+    def test_unusable_uploads_are_refused(self):
+        self.assertEqual(self.upload('name,phone\nRavi,9876543210\n').status_code, 400)
+        self.assertEqual(self.client.post('/api/check-dbt/bulk/').status_code, 400)
+        self.client.force_login(User.objects.create(username='farmer'))
+        self.assertEqual(self.upload('aadhaar,account\n').status_code, 302)
+        self.client.logout()
+        self.assertEqual(self.upload('aadhaar,account\n').status_code, 302)
+
+
+STATIC_PAGES = [
+    'home', 'crops', 'market', 'scanner', 'dbt', 'pest', 'organic_main', 'videos', 'agri_news',
+    'connect_companies', 'jobs', 'benefits', 'organic_pest', 'about_organic',
+]
+
+# What settings switch on when REDIS_URL is set; one test process is safe with LocMem.
+# The test process's local-memory cache stands in for the shared one.
+AUTH_CACHE_SETTINGS = {'SHARED_CACHE': True, 'AUTH_CACHE_LOCAL_TTL': 300}
+
+
+@override_settings(**AUTH_CACHE_SETTINGS)
+class AuthCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        auth_cache.clear()
+        self.user = User.objects.create_user('farmer', password='first-password')
+        self.client.login(username='farmer', password='first-password')
+        self.session_key = self.client.session.session_key
+
+    def cached_user(self):
+        request = RequestFactory().get('/')
+        request.session = auth_cache.SessionStore(self.session_key)
+        return auth_cache.get_user(request)
+
+    def test_authenticated_static_pages_run_no_sql(self):
+        self.assertEqual(self.client.get(reverse('home')).status_code, 200)
+        for name in STATIC_PAGES:
+            with self.subTest(page=name), self.assertNumQueries(0):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.wsgi_request.user, self.user)
+        self.assertEqual(auth_cache.stats()['sessions']['hits'], len(STATIC_PAGES))
+
+    def test_other_processes_see_a_logout(self):
+        self.client.get(reverse('home'))
+        version = cache.get(auth_cache.session_version_key(self.session_key))
+        stale = auth_cache.sessions.peek(self.session_key)
+        self.client.get(reverse('logout'))
+        # Another process still holds the session as it was before the logout.
+        auth_cache.sessions.put(self.session_key, version, stale)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+        response = self.client.get(reverse('home'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('home')}", fetch_redirect_response=False)
+
+    def test_password_change_ends_other_sessions(self):
+        self.client.get(reverse('home'))
+        self.user.set_password('second-password')
+        self.user.save()
+        response = self.client.get(reverse('crops'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_saved_user_changes_are_picked_up(self):
+        self.client.get(reverse('home'))
+        User.objects.filter(pk=self.user.pk).update(first_name='Ravi')
+        self.assertEqual(self.cached_user().first_name, '')
+        self.user.first_name = 'Ravi'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cached_user().first_name, 'Ravi')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cached_user().first_name, 'Ravi')
+
+    def test_shared_cache_must_be_shared(self):
+        errors = auth_cache.check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ['myapp.E001'])
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379'}}
+        with override_settings(CACHES=redis):
+            self.assertEqual(auth_cache.check_shared_cache(None), [])
+        with override_settings(SHARED_CACHE=False):
+            self.assertEqual(auth_cache.check_shared_cache(None), [])
+
+
+@override_settings(SHARED_CACHE=False, AUTH_CACHE_LOCAL_TTL=5)
+class ProcessLocalAuthCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        auth_cache.clear()
+        self.user = User.objects.create_user('farmer', password='first-password')
+        self.client.login(username='farmer', password='first-password')
+        self.session_key = self.client.session.session_key
+
+    def test_authenticated_static_pages_run_no_sql(self):
+        self.client.get(reverse('home'))
+        for name in STATIC_PAGES:
+            with self.subTest(page=name), self.assertNumQueries(0):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_other_processes_see_a_logout_once_their_copy_expires(self):
+        self.client.get(reverse('home'))
+        stale = auth_cache.sessions.peek(self.session_key)
+        self.client.get(reverse('logout'))
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+        # Another process still holds the session as it was before the logout.
+        auth_cache.sessions.put(self.session_key, None, stale)
+        self.assertEqual(self.client.get(reverse('crops')).status_code, 200)
+        auth_cache.sessions.put(self.session_key, None, stale, ttl=0)
+        response = self.client.get(reverse('crops'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('crops')}", fetch_redirect_response=False)
+
+    def test_password_change_ends_sessions_in_this_process(self):
+        self.client.get(reverse('home'))
+        self.user.set_password('second-password')
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('crops')).status_code, 302)
+
+
+CACHED_PAGES = [name for name in STATIC_PAGES if name != 'home']
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+@override_settings(**AUTH_CACHE_SETTINGS)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        auth_cache.clear()
+        page_cache.clear()
+        self.user = User.objects.create_user('asha', password='farm-password')
+        self.client.login(username='asha', password='farm-password')
+
+    def test_cached_pages_render_no_templates(self):
+        for name in CACHED_PAGES:
+            with self.subTest(page=name):
+                first = self.client.get(reverse(name))
+                self.assertTrue(first.templates)
+                with self.assertNumQueries(0):
+                    response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.templates, [])
+                self.assertEqual(CSRF_INPUT.sub('', response.content.decode()), CSRF_INPUT.sub('', first.content.decode()))
+                self.assertNotContains(response, '[[page-hole')
+        self.assertEqual(page_cache.stats()['hits'], len(CACHED_PAGES))
+
+    def test_cached_pages_match_the_rendered_templates(self):
+        for name in CACHED_PAGES:
+            with self.subTest(page=name):
+                response = self.client.get(reverse(name))
+                request = RequestFactory().get(reverse(name))
+                request.user = self.user
+                rendered = render_to_string(response.templates[0].name, request=request)
+                self.assertEqual(CSRF_INPUT.sub('', response.content.decode()), CSRF_INPUT.sub('', rendered))
+
+    def test_csrf_token_is_filled_in_per_request(self):
+        # The bulk DBT check is for staff accounts; posting to it exercises the token.
+        self.user.is_staff = True
+        self.user.save()
+        client = Client(enforce_csrf_checks=True)
+        client.login(username='asha', password='farm-password')
+        client.get(reverse('dbt'))
+        response = client.get(reverse('dbt'))
+        self.assertEqual(response.templates, [])
+        tokens = CSRF_INPUT.findall(response.content.decode())
+        self.assertEqual(len(tokens), 2)
+        upload = SimpleUploadedFile('check.csv', b'aadhaar,account\n', content_type='text/csv')
+        posted = client.post(reverse('check_dbt_bulk'), {'file': upload, 'csrfmiddlewaretoken': tokens[1]})
+        self.assertEqual(posted.status_code, 200)
+
+    def test_new_deployment_renders_again(self):
+        self.client.get(reverse('crops'))
+        with override_settings(PAGE_CACHE_VERSION='next-release', PAGE_CACHE_CHECK_SECONDS=0):
+            self.assertTrue(self.client.get(reverse('crops')).templates)
+            self.assertEqual(self.client.get(reverse('crops')).templates, [])
+
+    def test_template_files_are_only_checked_with_debug(self):
+        with mock.patch.object(page_cache, 'template_fingerprint', wraps=page_cache.template_fingerprint) as fingerprint:
+            self.client.get(reverse('crops'))
+            self.client.get(reverse('crops'))
+            fingerprint.assert_not_called()
+            with override_settings(DEBUG=True, PAGE_CACHE_CHECK_SECONDS=60):
+                self.client.get(reverse('crops'))
+                self.client.get(reverse('crops'))
+        self.assertEqual(fingerprint.call_count, 1)
+
+    def test_template_change_renders_again_with_debug(self):
+        path = Path(__file__).parent / 'templates' / 'myapp' / 'pages' / 'crops_page.html'
+        stat = path.stat()
+        try:
+            with override_settings(DEBUG=True, PAGE_CACHE_CHECK_SECONDS=0):
+                self.client.get(reverse('crops'))
+                self.assertEqual(self.client.get(reverse('crops')).templates, [])
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                self.assertTrue(self.client.get(reverse('crops')).templates)
+        finally:
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
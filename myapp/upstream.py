@@ -0,0 +1,128 @@
+"""
+Shared HTTP client for calls to external data feeds (weather, market, schemes).
+
+Every outbound call goes through one ``requests.Session`` per worker, so
+connections to each host are pooled and kept alive between requests. Calls
+are bounded by connect/read timeouts, idempotent requests are retried a few
+times with jittered exponential backoff, and a per-host circuit breaker fails
+fast while an upstream keeps failing instead of tying up workers on it.
+"""
+
+import functools
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+RETRY_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+RETRY_STATUSES = {502, 503, 504}
+
+
+class UpstreamUnavailable(requests.exceptions.RequestException):
+    """Raised without a network call while the host's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, threshold, cooldown, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        # While open, let a single probe through once the cooldown has passed.
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class UpstreamClient:
+    def __init__(self, timeout=None, max_retries=None, backoff=None,
+                 breaker_threshold=None, breaker_cooldown=None, pool_size=None):
+        self.timeout = timeout or settings.UPSTREAM_TIMEOUT
+        self.max_retries = settings.UPSTREAM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.UPSTREAM_BACKOFF if backoff is None else backoff
+        self.breaker_threshold = breaker_threshold or settings.UPSTREAM_BREAKER_THRESHOLD
+        self.breaker_cooldown = settings.UPSTREAM_BREAKER_COOLDOWN if breaker_cooldown is None else breaker_cooldown
+        pool_size = pool_size or settings.UPSTREAM_POOL_SIZE
+
+        self.session = requests.Session()
+        # Retries are handled below, with jitter and the breaker in the loop.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return self._breakers[host]
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        breaker = self.breaker(url)
+        attempts = 1 + (self.max_retries if method.upper() in RETRY_METHODS else 0)
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise UpstreamUnavailable(f'{urlsplit(url).netloc} is unavailable, not retrying until it recovers.')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                breaker.record_failure()
+                if attempt + 1 == attempts:
+                    raise
+            except Exception:
+                # Not worth retrying (bad response body, redirect loop, invalid URL...), but it still
+                # has to count: a half-open breaker otherwise keeps its probe slot and never lets another through.
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code < 500:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if response.status_code not in RETRY_STATUSES or attempt + 1 == attempts:
+                    return response
+                response.close()
+            # Full jitter: sleep anywhere up to the exponential backoff step.
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def close(self):
+        self.session.close()
+
+
+@functools.cache
+def get_client():
+    return UpstreamClient()
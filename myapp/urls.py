@@ -32,16 +32,26 @@ urlpatterns = [
 
     # API ENDPOINTS (Critical for dynamic data)
     path('api/weather/', views.get_weather, name='get_weather'),
+    path('api/reviews/', views.get_reviews, name='get_reviews'),
+    path('api/reviews/search/', views.search_reviews, name='search_reviews'),
+    path('api/reviews/export/', views.export_reviews, name='export_reviews'),
     path('api/market-prices/', views.get_market_prices, name='get_market_prices'),
+    path('api/market-prices/history/', views.get_market_price_history, name='get_market_price_history'),
     
     # 16-POINT CROP DETAILS (Used by /crops/)
+    path('api/crop-details/', views.get_crop_details_batch, name='get_crop_details_batch'),
     path('api/crop-details/<str:crop_name>/', views.get_crop_details, name='get_crop_details'),
     
+    path('api/crops/search/', views.search_crops, name='search_crops'),
+    
     # 5-POINT PEST MANAGEMENT DETAILS (Used by /pest/)
     path('api/get-pest-details/<str:crop_name>/', views.get_pest_management_details, name='get_pest_management_details'),
     
     path('api/scan-image/', views.scan_image, name='scan_image'),
+    path('api/scan-image/cache-stats/', views.scan_cache_stats, name='scan_cache_stats'),
+    path('api/scan-jobs/<uuid:job_id>/', views.scan_job_status, name='scan_job_status'),
     path('api/register-farmer/', views.register_farmer, name='register_farmer'),
     path('api/check-dbt/', views.check_dbt_status, name='check_dbt_status'),
+    path('api/check-dbt/bulk/', views.check_dbt_status_bulk, name='check_dbt_bulk'),
     path('api/connect-company/', views.connect_company, name='connect_company'),
 ]
\ No newline at end of file
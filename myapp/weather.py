@@ -0,0 +1,285 @@
+"""
+Weather forecasts for the home page, cached per map grid cell.
+
+Farmers in the same village send nearly the same coordinates, so requests are
+snapped to a grid (``WEATHER_GRID_DEGREES``, 0.05° by default) and the
+forecast for each cell is kept for ``WEATHER_CACHE_TTL`` seconds. Concurrent
+misses for one cell are coalesced: the first request fetches from OpenWeather
+and the others wait for its result instead of making their own call.
+
+Past its TTL a forecast is still served for ``WEATHER_STALE_TTL`` seconds
+while it is refreshed in the background, and a prefetcher keeps the
+``WEATHER_PREFETCH_CELLS`` busiest cells warm so they rarely expire at all.
+"""
+
+import datetime
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+
+from .upstream import get_client
+
+
+logger = logging.getLogger(__name__)
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+WEATHER_ICONS = {
+    'clear sky': '☀️', 'few clouds': '⛅', 'scattered clouds': '☁️',
+    'broken clouds': '☁️', 'shower rain': '🌧️', 'rain': '🌧️',
+    'thunderstorm': '⛈️', 'snow': '❄️', 'mist': '🌫️',
+    'light rain': '🌧️', 'overcast clouds': '☁️',
+}
+
+
+class SingleFlightCache:
+    """
+    Bounded in-process TTL cache that runs at most one loader per key at a time.
+
+    With a ``stale_ttl``, an expired value is still returned for that many
+    seconds past its TTL while a background thread reloads it.
+    """
+
+    def __init__(self, max_entries=10000, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, stale_until, value)
+        self._in_flight = {}  # key -> _Flight
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale = 0
+        self.refreshes = 0
+
+    def get_or_load(self, key, ttl, loader, stale_ttl=0):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, stale_until, value = entry
+                now = self.clock()
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if stale_until > now:
+                    self._entries.move_to_end(key)
+                    self.stale += 1
+                    flight = self._start_flight(key)
+                    if flight is not None:
+                        threading.Thread(
+                            target=self._refresh_in_background, args=(key, flight, ttl, stale_ttl, loader), daemon=True,
+                        ).start()
+                    return value
+            waiting = self._in_flight.get(key)
+            if waiting is None:
+                flight = self._start_flight(key)
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if waiting is not None:
+            return waiting.wait()
+        return self._load(key, flight, ttl, stale_ttl, loader)
+
+    def refresh(self, key, ttl, loader, stale_ttl=0):
+        # Reload ahead of expiry (prefetcher); a load already running for the key is left to finish.
+        with self._lock:
+            flight = self._start_flight(key)
+            if flight is None:
+                return
+            self.refreshes += 1
+        self._load(key, flight, ttl, stale_ttl, loader)
+
+    def expires_within(self, key, seconds):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is None or entry[0] - self.clock() <= seconds
+
+    def _start_flight(self, key):
+        # Caller holds the lock. Returns None if a load for the key is already running.
+        if key in self._in_flight:
+            return None
+        flight = self._in_flight[key] = _Flight()
+        return flight
+
+    def _load(self, key, flight, ttl, stale_ttl, loader):
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                now = self.clock()
+                self._entries[key] = (now + ttl, now + ttl + stale_ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.event.set()
+
+    def _refresh_in_background(self, key, flight, ttl, stale_ttl, loader):
+        with self._lock:
+            self.refreshes += 1
+        try:
+            self._load(key, flight, ttl, stale_ttl, loader)
+        except Exception:
+            # Keep serving the stale value; the next request past the stale window retries.
+            logger.warning('Background refresh of %r failed', key, exc_info=True)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced + self.stale
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'stale': self.stale,
+                'refreshes': self.refreshes,
+                'entries': len(self._entries),
+                'hit_rate': round((self.hits + self.coalesced + self.stale) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.coalesced = self.stale = self.refreshes = 0
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class Prefetcher:
+    """
+    Background thread that reloads the most requested cells before they expire.
+
+    Every ``interval`` seconds the ``top_n`` busiest cells that expire within
+    the next two intervals are refreshed, one at a time. Request counts are
+    halved after each pass so the hot set follows the day's traffic.
+    """
+
+    def __init__(self, cache, refresh, top_n, interval):
+        self.cache = cache
+        self.refresh = refresh
+        self.top_n = top_n
+        self.interval = interval
+        self.prefetched = 0
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def hot_keys(self):
+        with self._lock:
+            hot = [key for key, _ in self._counts.most_common(self.top_n)]
+            self._counts = Counter({key: count // 2 for key, count in self._counts.items() if count > 1})
+        return hot
+
+    def run_once(self):
+        for key in self.hot_keys():
+            if self.cache.expires_within(key, 2 * self.interval):
+                try:
+                    self.refresh(key)
+                    self.prefetched += 1
+                except Exception:
+                    logger.warning('Prefetch of %r failed', key, exc_info=True)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='weather-prefetch', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+
+forecast_cache = SingleFlightCache()
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def prefetcher():
+    # Started by the first forecast request rather than at import, so management commands never spawn it.
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(
+                forecast_cache, refresh_cell, settings.WEATHER_PREFETCH_CELLS, settings.WEATHER_PREFETCH_INTERVAL,
+            )
+            if settings.WEATHER_PREFETCH_CELLS:
+                _prefetcher.start()
+        return _prefetcher
+
+
+def grid_cell(lat, lon, step):
+    # Snap to the centre of the grid cell; rounding keeps float noise out of the cache key.
+    return round(round(lat / step) * step, 6), round(round(lon / step) * step, 6)
+
+
+def get_forecast(lat, lon):
+    cell = grid_cell(lat, lon, settings.WEATHER_GRID_DEGREES)
+    prefetcher().record(cell)
+    return forecast_cache.get_or_load(
+        cell, settings.WEATHER_CACHE_TTL, lambda: fetch_forecast(*cell), stale_ttl=settings.WEATHER_STALE_TTL,
+    )
+
+
+def refresh_cell(cell):
+    forecast_cache.refresh(
+        cell, settings.WEATHER_CACHE_TTL, lambda: fetch_forecast(*cell), stale_ttl=settings.WEATHER_STALE_TTL,
+    )
+
+
+def fetch_forecast(lat, lon):
+    response = get_client().get(settings.OPENWEATHER_API_URL, params={
+        'lat': lat, 'lon': lon, 'appid': settings.OPENWEATHER_API_KEY,
+        'units': 'metric', 'exclude': 'minutely,hourly',
+    })
+    response.raise_for_status()
+    return parse_forecast(response.json())
+
+
+def parse_forecast(data):
+    current_weather = {
+        'temp': round(data['current']['temp']), 'humidity': data['current']['humidity'],
+        'condition': data['current']['weather'][0]['description'].title(),
+        'wind_speed': round(data['current']['wind_speed']),
+        'rainfall': round(data['current'].get('rain', {}).get('1h', 0)),
+        'uv_index': data['current']['uvi'], 'location': 'Your Current Location',
+    }
+    forecast_list = []
+    for i, day in enumerate(data['daily'][:10]):
+        forecast_list.append({
+            'day': 'Today' if i == 0 else DAYS[datetime.datetime.fromtimestamp(day['dt']).weekday()],
+            'icon': WEATHER_ICONS.get(day['weather'][0]['description'], '❓'),
+            'high': round(day['temp']['max']), 'low': round(day['temp']['min']),
+            'rain': round(day.get('pop', 0) * 100),
+        })
+    return {'current': current_weather, 'forecast': forecast_list}
@@ -3,6 +3,9 @@ ASGI config for myproject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Long-lived responses such as the market price stream need this entry point,
+e.g. ``gunicorn myproject.asgi:application -k uvicorn.workers.UvicornWorker``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +16,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up. The price stream is served straight from the
+# ASGI layer: thousands of idle subscribers should not each hold a Django request.
+from myapp import price_stream  # noqa: E402
+
+PRICE_STREAM_PATH = '/api/market-prices/stream/'
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == PRICE_STREAM_PATH:
+        return await price_stream.asgi_app(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -34,7 +34,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'myapp.auth_cache.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -72,6 +72,20 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker process. Cache invalidation across processes
+# (myapp.auth_cache, myapp.reviews) goes through versions kept in the default
+# cache, so production should set REDIS_URL (see .env.example). Without it each
+# process has its own local-memory cache and falls back to what stays correct there.
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+SHARED_CACHE = bool(REDIS_URL)
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -115,4 +129,99 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom variable for your API key
 # In a production environment, this should be set via an environment variable for security.
-OPENWEATHER_API_KEY = "YOUR_API_KEY"
\ No newline at end of file
+OPENWEATHER_API_KEY = "YOUR_API_KEY"
+OPENWEATHER_API_URL = "https://api.openweathermap.org/data/2.5/onecall"
+
+# Weather forecasts are cached per grid cell: coordinates are snapped to this
+# many degrees (0.05° is roughly 5.5 km) and each cell is kept for the TTL in seconds.
+WEATHER_GRID_DEGREES = 0.05
+WEATHER_CACHE_TTL = 600
+# Expired forecasts are still served this many seconds while they refresh in the background.
+WEATHER_STALE_TTL = 3600
+# The busiest cells are refreshed ahead of expiry every interval; 0 cells disables the prefetcher.
+WEATHER_PREFETCH_CELLS = 50
+WEATHER_PREFETCH_INTERVAL = 60
+
+# Outbound calls to external data feeds go through myapp.upstream: pooled
+# keep-alive connections, (connect, read) timeouts in seconds, bounded retries
+# with jittered backoff, and a per-host circuit breaker that opens after
+# UPSTREAM_BREAKER_THRESHOLD consecutive failures for UPSTREAM_BREAKER_COOLDOWN seconds.
+UPSTREAM_TIMEOUT = (3.05, 10)
+UPSTREAM_MAX_RETRIES = 2
+UPSTREAM_BACKOFF = 0.2
+UPSTREAM_BREAKER_THRESHOLD = 5
+UPSTREAM_BREAKER_COOLDOWN = 30
+UPSTREAM_POOL_SIZE = 10
+
+# Live market prices (/api/market-prices/stream/): the price store is polled once per
+# interval per worker and changes are pushed to every subscriber; idle streams get a
+# keep-alive comment every heartbeat seconds. The stream only exists when serving
+# through myproject.asgi; under WSGI the market page polls /api/market-prices/ instead.
+PRICE_STREAM_INTERVAL = 30
+PRICE_STREAM_HEARTBEAT = 20
+
+# Rendered review cards and the first feedback page are cached under a version
+# that is bumped whenever a review changes. With a shared cache every process sees
+# the bump at once and this only bounds memory use; with per-process caches the
+# other workers only catch up when their copies expire, so it is kept to seconds.
+REVIEW_CACHE_TIMEOUT = 60 * 60 * 24 if SHARED_CACHE else 10
+
+# Plant disease scanner (/api/scan-image/): uploads are downscaled to at most
+# SCAN_IMAGE_SIZE pixels a side before feature extraction, and SCAN_ENGINE is
+# loaded once per process with the model file at SCAN_MODEL_PATH.
+SCAN_ENGINE = 'myapp.scanner.LinearModelEngine'
+SCAN_MODEL_PATH = BASE_DIR / 'myapp' / 'data' / 'scan_model.json'
+SCAN_IMAGE_SIZE = 256
+SCAN_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# Scans are queued in the ScanJob table and run by `manage.py run_scan_workers`
+# (SCAN_WORKERS processes by default), which poll every SCAN_WORKER_POLL seconds when
+# idle. Uploads beyond SCAN_QUEUE_LIMIT waiting jobs get 429. A scan step is stopped
+# after SCAN_TIMEOUT seconds; a job running for SCAN_JOB_LEASE seconds is taken to
+# have lost its worker and is retried. Finished jobs are kept for SCAN_JOB_RETENTION_DAYS.
+SCAN_WORKERS = 2
+SCAN_WORKER_POLL = 0.5
+SCAN_QUEUE_LIMIT = 200
+SCAN_TIMEOUT = 10
+SCAN_JOB_LEASE = 120
+SCAN_JOB_RETENTION_DAYS = 7
+
+# Diagnoses kept per process by myapp.scan_cache (the ScanResult table keeps the rest).
+SCAN_CACHE_SIZE = 1024
+
+# /api/register-farmer/ answers once a registration is in the web process's spool
+# file under REGISTRATION_SPOOL_DIR (fsynced when REGISTRATION_SPOOL_FSYNC) and
+# writes registrations to the database in batches: as soon as REGISTRATION_BATCH_SIZE
+# are pending, and otherwise every REGISTRATION_FLUSH_INTERVAL seconds.
+REGISTRATION_SPOOL_DIR = BASE_DIR / 'spool' / 'registrations'
+REGISTRATION_BATCH_SIZE = 500
+REGISTRATION_FLUSH_INTERVAL = 2
+REGISTRATION_SPOOL_FSYNC = True
+
+# DBT linkage registry (myapp.dbt): Aadhaar numbers are stored as HMAC-SHA256 under
+# DBT_AADHAAR_SALT, which must be kept secret and stay the same between imports and
+# lookups (changing it means importing the registry again). The importer writes a
+# Bloom filter of the registry to DBT_BLOOM_PATH, sized for DBT_BLOOM_ERROR_RATE false
+# positives, that lets most unlinked numbers be answered without a query.
+DBT_AADHAAR_SALT = os.environ.get('DBT_AADHAAR_SALT', 'development-only-dbt-salt')
+DBT_BLOOM_PATH = BASE_DIR / 'var' / 'dbt_linkage.bloom'
+DBT_BLOOM_ERROR_RATE = 0.01
+
+# Sessions and request.user come from myapp.auth_cache (with its middleware in
+# MIDDLEWARE above): an in-process LRU of AUTH_CACHE_SIZE sessions and users, with
+# the database as the source of truth. With SHARED_CACHE the LRU sits in front of
+# the default cache and is invalidated at once through versions kept there, and an
+# entry is reused for up to AUTH_CACHE_LOCAL_TTL seconds. Without it each process
+# keeps its own copies for only a few seconds, which is how long a logout or
+# password change takes to reach the other workers.
+SESSION_ENGINE = 'myapp.auth_cache'
+AUTH_CACHE_SIZE = 10000
+AUTH_CACHE_LOCAL_TTL = 300 if SHARED_CACHE else 5
+
+# Static content pages (myapp.page_cache) are served from skeletons rendered once per
+# process, with the CSRF token filled in per request. Skeletons are rendered again
+# when PAGE_CACHE_VERSION changes (set DEPLOY_VERSION, e.g. to the release's git
+# revision, on each deployment). With DEBUG they also follow edits to the template
+# files, checked every PAGE_CACHE_CHECK_SECONDS.
+PAGE_CACHE_VERSION = os.environ.get('DEPLOY_VERSION', '')
+PAGE_CACHE_CHECK_SECONDS = 2